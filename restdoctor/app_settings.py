@@ -21,6 +21,36 @@ API_VERSIONS = {
 
 API_ENABLE_STRUCTLOG = getattr(settings, 'ENABLE_STRUCTLOG', False)
 API_BIND_STRUCTLOG_CONTEXTVARS = getattr(settings, 'BIND_STRUCTLOG_CONTEXTVARS', True)
+API_LOG_REQUEST_DATA_MAX_ITEMS = 100
+API_LOG_REQUEST_DATA_MAX_BYTES = 4 * 1024
+API_VIEW_INITIAL_LOG_SAMPLE_RATE = 1.0
+API_VIEW_INITIAL_LOG_RATE_LIMIT = None
+API_LOG_QUEUE_SIZE = None
+
+API_CANONICAL_VARY = False
+
+API_SERVER_TIMING = False
+API_SERVER_TIMING_HEADER = 'X-Server-Timing'
+API_SERVER_TIMING_TOKEN = None
+
+API_TRACER = None
+
+API_METRICS_REGISTRY = 'restdoctor.utils.metrics.MetricsRegistry'
+API_METRICS_MULTIPROCESS_DIR = None
+API_METRICS_MAX_LABEL_SETS = 1000
+
+API_SERIALIZER_PROFILE_SAMPLE_RATE = 0.0
+API_PROFILER = 'restdoctor.utils.profiling.CProfileProfiler'
+API_PROFILE_DIR = None
+API_PROFILE_HEADER = 'X-Profile'
+API_PROFILE_SIGNATURE_MAX_AGE = 5 * 60
+API_PROFILE_SAMPLE_RATE = 0.0
+API_PROFILE_INTERVAL = 0.005
+API_MEMORY_TRACKING_SAMPLE_RATE = 0.0
+API_MEMORY_TRACKING_FRAMES = 5
+API_MEMORY_TRACKING_TOP_LIMIT = 10
+API_MEMORY_TRACKING_DETAIL_THRESHOLD = 50 * 1024 * 1024
+API_MEMORY_SNAPSHOT_DIR = None
 
 API_STRICT_SCHEMA_VALIDATION = getattr(settings, 'API_STRICT_SCHEMA_VALIDATION', False)
 API_SCHEMA_PRIORITIZE_SERIALIZER_PARAMETERS = getattr(
@@ -36,6 +66,17 @@ API_VENDOR_STRING = 'Vendor'
 
 API_IGNORE_FILTER_PARAMS_FOR_DETAIL = False
 
+API_PRELOAD_RESOURCE_REGISTRY = False
+
+API_CACHE_ALIAS = 'default'
+
+API_CONCURRENT_QUERIES_MAX_WORKERS = 4
+
+API_PREFETCH_MAX_WORKERS = 2
+API_PREFETCH_MAX_PENDING = 32
+API_PREFETCH_CACHE_TTL = 30
+API_PREFETCH_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
 APPLICATION_FOLDERS = ['apps']
 USE_APP_PREFIX_FOR_SCHEMA_OPERATION_IDS = False
 USE_APP_PREFIX_FOR_SCHEMA_REFS = False
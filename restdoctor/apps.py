@@ -18,3 +18,8 @@ class AppConfig(BaseConfig):
         for setting in dir(app_settings):
             if setting.isupper() and not hasattr(settings, setting):
                 setattr(settings, setting, getattr(app_settings, setting))
+
+        if settings.API_PRELOAD_RESOURCE_REGISTRY:
+            from restdoctor.rest_framework.resources import resource_registry
+
+            resource_registry.preload(set(settings.API_VERSIONS.values()))
@@ -4,6 +4,11 @@ DEFAULT_PREFIX_FORMAT_VERSION = ':'
 
 DEFAULT_PAGE_SIZE = 20
 DEFAULT_MAX_PAGE_SIZE = 200
+DEFAULT_MAX_PAGE_BYTES = 1024 * 1024
+DEFAULT_PAGE_BOUNDARY_CACHE_TIMEOUT = 60 * 10
+DEFAULT_PAGE_BOUNDARY_LOOKBEHIND = 10
+
+DEFAULT_ERROR_RESPONSES_CACHE_SIZE = 64
 
 DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
 
@@ -1,16 +1,64 @@
 from __future__ import annotations
 
+import hmac
 import typing
 
 from django.conf import settings
+from django.utils.cache import cc_delim_re
 
 from restdoctor.utils.api_prefix import get_api_prefixes
-from restdoctor.utils.media_type import get_api_header, parse_accept_header
+from restdoctor.utils.log_queue import get_queued_logger
+from restdoctor.utils.media_type import (
+    get_api_header,
+    get_canonical_media_type,
+    get_media_type_header,
+    parse_accept_header,
+)
+from restdoctor.utils.structlog import get_logger
+from restdoctor.utils.tracing import (
+    bind_trace_attributes,
+    is_tracing_enabled,
+    reset_trace_attributes,
+)
+from restdoctor.utils.timing import (
+    RequestTimings,
+    get_server_timing_header,
+    stage_timer,
+    start_request_timing,
+    stop_request_timing,
+)
 
 if typing.TYPE_CHECKING:
     from django.http import HttpRequest, HttpResponse
 
     from restdoctor.django.custom_types import DjangoHandler
+    from restdoctor.utils.media_type import APIParams
+
+logger = get_logger(__name__)
+
+
+def get_header_meta_key(header: str) -> str:
+    return f'HTTP_{header.upper().replace("-", "_")}'
+
+
+def get_api_trace_attributes(
+    api_params: typing.Optional[APIParams], api_version: str,
+) -> typing.Dict[str, typing.Any]:
+    return {
+        'api.version': api_version,
+        'api.format': getattr(api_params, 'format', None),
+        'api.resource': getattr(api_params, 'resource_discriminator', None),
+    }
+
+
+def replace_vary_header(response: HttpResponse, header: str, replacement: str) -> None:
+    if not response.has_header('Vary'):
+        return
+    vary_headers = [
+        replacement if vary_header.lower() == header.lower() else vary_header
+        for vary_header in cc_delim_re.split(response['Vary'])
+    ]
+    response['Vary'] = ', '.join(dict.fromkeys(vary_headers))
 
 
 class ApiSelectorMiddleware:
@@ -23,6 +71,12 @@ class ApiSelectorMiddleware:
 
         self.api_vendor_string = getattr(settings, 'API_VENDOR_STRING', 'Vendor')
         self.api_vendor_accept = self.api_vendor_string.lower()
+        self.media_type_header = get_media_type_header(self.api_vendor_string)
+        self.media_type_meta_key = get_header_meta_key(self.media_type_header)
+        self.canonical_vary = settings.API_CANONICAL_VARY
+        self.server_timing = settings.API_SERVER_TIMING
+        self.server_timing_header = settings.API_SERVER_TIMING_HEADER
+        self.server_timing_token = settings.API_SERVER_TIMING_TOKEN
 
         self.get_response = get_response
         self.api_prefixes = get_api_prefixes(default=None)
@@ -37,24 +91,65 @@ class ApiSelectorMiddleware:
     def is_schema_call(self, request: HttpRequest) -> bool:
         return request.path_info.startswith(self.schema_prefixes)
 
+    def is_timing_enabled(self, request: HttpRequest) -> bool:
+        if self.server_timing:
+            return True
+        if not self.server_timing_token:
+            return False
+        return hmac.compare_digest(
+            request.headers.get(self.server_timing_header, '').encode(), self.server_timing_token.encode(),
+        )
+
     def __call__(self, request: HttpRequest) -> HttpResponse:
         if not self.is_api_call(request):
             return self.get_response(request)
+        if not self.is_timing_enabled(request):
+            return self.process_api_call(request)
 
-        if self.is_schema_call(request):
-            api_params = parse_accept_header(
-                f'application/vnd.{self.api_vendor_accept}', vendor=self.api_vendor_accept
-            )
-        else:
-            api_params = parse_accept_header(
-                request.headers.get('accept'), vendor=self.api_vendor_accept
-            )
-        request.api_params = api_params
-        api_version = (api_params and api_params.version) or self.api_fallback_version
-        request.urlconf = self.api_versions.get(api_version, self.fallback_urlconf)
+        timings, token = start_request_timing()
+        try:
+            response = self.process_api_call(request)
+        finally:
+            stop_request_timing(token)
+        self.finalize_timing(response, timings)
+        return response
 
-        response = self.get_response(request)
+    def process_api_call(self, request: HttpRequest) -> HttpResponse:
+        with stage_timer('accept'):
+            if self.is_schema_call(request):
+                api_params = parse_accept_header(
+                    f'application/vnd.{self.api_vendor_accept}', vendor=self.api_vendor_accept
+                )
+            else:
+                api_params = parse_accept_header(
+                    request.headers.get('accept'), vendor=self.api_vendor_accept
+                )
+            request.api_params = api_params
+            request.META[self.media_type_meta_key] = get_canonical_media_type(api_params)
+            api_version = (api_params and api_params.version) or self.api_fallback_version
+            request.urlconf = self.api_versions.get(api_version, self.fallback_urlconf)
+
+        if is_tracing_enabled():
+            trace_token = bind_trace_attributes(**get_api_trace_attributes(api_params, api_version))
+            try:
+                response = self.get_response(request)
+            finally:
+                reset_trace_attributes(trace_token)
+        else:
+            response = self.get_response(request)
         if api_params is not None:
-            response[f'X-{self.api_vendor_string}-Media-Type'] = get_api_header(api_params)
+            response[self.media_type_header] = get_api_header(api_params)
+        if self.canonical_vary:
+            replace_vary_header(response, 'Accept', self.media_type_header)
 
         return response
+
+    def finalize_timing(self, response: HttpResponse, timings: RequestTimings) -> None:
+        durations = timings.get_durations_ms()
+        response['Server-Timing'] = get_server_timing_header(durations)
+        if settings.API_ENABLE_STRUCTLOG:
+            get_queued_logger(logger).info(
+                'view_finalize',
+                status_code=response.status_code,
+                **{f'timing_{stage}_ms': duration for stage, duration in durations.items()},
+            )
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import typing
+
+from django.conf import settings
+from django.middleware.cache import FetchFromCacheMiddleware as BaseFetchFromCacheMiddleware
+from django.middleware.cache import UpdateCacheMiddleware as BaseUpdateCacheMiddleware
+from django.utils.cache import get_cache_key
+
+from restdoctor.django.middleware.api_selector import get_header_meta_key, replace_vary_header
+from restdoctor.utils.api_prefix import get_api_prefixes
+from restdoctor.utils.media_type import (
+    get_canonical_media_type,
+    get_media_type_header,
+    parse_accept_header,
+)
+
+if typing.TYPE_CHECKING:
+    from django.core.cache.backends.base import BaseCache
+    from django.http import HttpRequest, HttpResponse
+
+
+def is_api_request(request: HttpRequest) -> bool:
+    api_prefixes = get_api_prefixes(default=None)
+    return bool(api_prefixes) and request.path_info.startswith(api_prefixes)
+
+
+def set_canonical_media_type(request: HttpRequest) -> str:
+    media_type_header = get_media_type_header(settings.API_VENDOR_STRING)
+    meta_key = get_header_meta_key(media_type_header)
+    if meta_key not in request.META:
+        api_params = getattr(request, 'api_params', None) or parse_accept_header(
+            request.headers.get('accept'), vendor=settings.API_VENDOR_STRING.lower()
+        )
+        request.META[meta_key] = get_canonical_media_type(api_params)
+    return media_type_header
+
+
+def get_api_cache_key(
+    request: HttpRequest, key_prefix: str = None, method: str = 'GET', cache: BaseCache = None,
+) -> typing.Optional[str]:
+    set_canonical_media_type(request)
+    return get_cache_key(request, key_prefix=key_prefix, method=method, cache=cache)
+
+
+class UpdateCacheMiddleware(BaseUpdateCacheMiddleware):
+    def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        # Responses are stored under the canonical media type header instead of the raw Accept,
+        # so semantically equal Accept strings share one cache entry.
+        if is_api_request(request):
+            replace_vary_header(response, 'Accept', set_canonical_media_type(request))
+        return super().process_response(request, response)
+
+
+class FetchFromCacheMiddleware(BaseFetchFromCacheMiddleware):
+    def process_request(self, request: HttpRequest) -> typing.Optional[HttpResponse]:
+        if is_api_request(request):
+            set_canonical_media_type(request)
+        return super().process_request(request)
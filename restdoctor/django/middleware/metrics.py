@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import contextlib
+import time
+import typing
+
+from django.conf import settings
+from django.db import connections
+
+from restdoctor.utils.api_format import get_available_format
+from restdoctor.utils.api_prefix import get_api_prefixes
+from restdoctor.utils.metrics import get_metrics_registry
+
+if typing.TYPE_CHECKING:
+    from django.http import HttpRequest, HttpResponse
+
+    from restdoctor.django.custom_types import DjangoHandler
+    from restdoctor.utils.metrics import LabelValues
+
+UNKNOWN_LABEL_VALUE = 'unknown'
+OTHER_LABEL_VALUE = 'other'
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(
+        self, execute: typing.Callable, sql: str, params: typing.Any, many: bool, context: typing.Any,
+    ) -> typing.Any:
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def get_api_labels(request: HttpRequest) -> LabelValues:
+    # Only values known to restdoctor settings or resolved by restdoctor views get into labels,
+    # raw Accept values would make label cardinality unbounded.
+    api_params = getattr(request, 'api_params', None)
+    version: str = getattr(api_params, 'version', None) or UNKNOWN_LABEL_VALUE
+    if version not in settings.API_VERSIONS:
+        version = UNKNOWN_LABEL_VALUE
+    api_format: str = getattr(api_params, 'format', None) or settings.API_DEFAULT_FORMAT
+    if api_format != settings.API_DEFAULT_FORMAT and api_format not in get_available_format(settings.API_FORMATS):
+        api_format = OTHER_LABEL_VALUE
+    view_name, action = getattr(request, 'api_view', (UNKNOWN_LABEL_VALUE, UNKNOWN_LABEL_VALUE))
+    return (
+        version,
+        api_format,
+        getattr(request, 'api_resource', None) or '',
+        view_name,
+        action or UNKNOWN_LABEL_VALUE,
+    )
+
+
+class MetricsMiddleware:
+    # Should be placed after ApiSelectorMiddleware, which parses API params from Accept header.
+    def __init__(self, get_response: DjangoHandler):
+        self.get_response = get_response
+        self.api_prefixes = get_api_prefixes(default=None)
+        self.metrics_registry = get_metrics_registry()
+
+    def is_api_call(self, request: HttpRequest) -> bool:
+        return bool(self.api_prefixes) and request.path_info.startswith(self.api_prefixes)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not self.is_api_call(request):
+            return self.get_response(request)
+
+        query_counter = QueryCounter()
+        started_at = time.perf_counter()
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(query_counter))
+            response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - started_at, query_counter.count)
+        return response
+
+    def record(
+        self, request: HttpRequest, response: HttpResponse, duration: float, queries_count: int,
+    ) -> None:
+        labels = get_api_labels(request)
+        registry = self.metrics_registry
+        registry.inc('restdoctor_requests_total', (*labels, f'{response.status_code // 100}xx'))
+        if response.status_code >= 500:
+            registry.inc('restdoctor_errors_total', labels)
+        registry.observe('restdoctor_request_duration_seconds', labels, duration)
+        registry.observe('restdoctor_db_queries', labels, queries_count)
+        if not response.streaming:
+            registry.observe('restdoctor_response_size_bytes', labels, len(response.content))
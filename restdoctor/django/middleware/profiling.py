@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+import random
+import typing
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from restdoctor.django.middleware.metrics import get_api_labels
+from restdoctor.utils.api_prefix import get_api_prefixes
+from restdoctor.utils.log_queue import get_queued_logger
+from restdoctor.utils.profiling import check_profile_signature, get_profile_filename
+from restdoctor.utils.structlog import get_logger
+
+if typing.TYPE_CHECKING:
+    from django.http import HttpRequest, HttpResponse
+
+    from restdoctor.django.custom_types import DjangoHandler
+    from restdoctor.utils.profiling import BaseProfiler
+
+logger = get_logger(__name__)
+
+
+class ProfilingMiddleware:
+    # Should be placed after ApiSelectorMiddleware, which parses API params from Accept header.
+    def __init__(self, get_response: DjangoHandler):
+        self.get_response = get_response
+        self.api_prefixes = get_api_prefixes(default=None)
+        self.profile_dir = settings.API_PROFILE_DIR
+        self.profile_header = settings.API_PROFILE_HEADER
+        self.profile_signature_max_age = settings.API_PROFILE_SIGNATURE_MAX_AGE
+        self.sample_rate = settings.API_PROFILE_SAMPLE_RATE
+        self.interval = settings.API_PROFILE_INTERVAL
+        self.profiler_class = import_string(settings.API_PROFILER)
+
+    def is_api_call(self, request: HttpRequest) -> bool:
+        return bool(self.api_prefixes) and request.path_info.startswith(self.api_prefixes)
+
+    def should_profile(self, request: HttpRequest) -> bool:
+        if not self.profile_dir or not self.is_api_call(request):
+            return False
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return True
+        return check_profile_signature(
+            request.headers.get(self.profile_header), request.method or '', request.path,
+            self.profile_signature_max_age,
+        )
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        profiler = self.profiler_class(self.interval)
+        profiler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.stop()
+        self.write_profile(request, profiler)
+        return response
+
+    def write_profile(self, request: HttpRequest, profiler: BaseProfiler) -> None:
+        version, _, resource, view_name, action = get_api_labels(request)
+        filename = get_profile_filename([version, resource or 'default', view_name, action])
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            path = profiler.write(os.path.join(self.profile_dir, filename))
+        except OSError:
+            logger.warning('Request profile writing failed', exc_info=True)
+            return
+        get_queued_logger(logger).info(
+            'request_profile', path=path, api_version=version, api_view_name=view_name, api_view_action=action,
+        )
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import typing
+
+from django.http import HttpResponse
+
+from restdoctor.utils.metrics import get_metrics_registry
+
+if typing.TYPE_CHECKING:
+    from django.http import HttpRequest
+
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    return HttpResponse(get_metrics_registry().generate_latest(), content_type=METRICS_CONTENT_TYPE)
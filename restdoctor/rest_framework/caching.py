@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import functools
+import hashlib
+import threading
+import time
+import typing
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from restdoctor.utils.api_format import get_filter_formats
+
+if typing.TYPE_CHECKING:
+    from django.core.cache.backends.base import BaseCache
+    from django.db.models import Model, QuerySet
+    from rest_framework.request import Request
+    from rest_framework.views import APIView
+
+    ModelGenerations = typing.Tuple[str, ...]
+
+_watched_models: typing.Set[typing.Type[Model]] = set()
+
+VARY_BY_CHOICES = ('version', 'format', 'resource', 'query', 'user', 'scope')
+VARY_BY_AUDIENCE = ('user', 'scope')
+
+
+@dataclasses.dataclass(frozen=True)
+class CachePolicy:
+    timeout: int
+    vary_by: typing.Sequence[str] = ('version', 'format', 'resource', 'query', 'user')
+    models: typing.Sequence[typing.Type[Model]] = ()
+
+    def __post_init__(self) -> None:
+        unknown = set(self.vary_by) - set(VARY_BY_CHOICES)
+        if unknown:
+            raise ValueError(f'Unknown vary_by dimensions: {", ".join(sorted(unknown))}')
+        # Querysets are often filtered by the request user, a response shared by everyone has to be
+        # asked for explicitly with `scope`.
+        if not set(self.vary_by) & set(VARY_BY_AUDIENCE):
+            raise ValueError(f'vary_by should contain one of: {", ".join(VARY_BY_AUDIENCE)}')
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheControl:
+    max_age: typing.Optional[int] = None
+    s_maxage: typing.Optional[int] = None
+    stale_while_revalidate: typing.Optional[int] = None
+    stale_if_error: typing.Optional[int] = None
+    public: bool = False
+    private: bool = False
+    no_cache: bool = False
+    no_store: bool = False
+    must_revalidate: bool = False
+    immutable: bool = False
+    vary: typing.Sequence[str] = ()
+
+    def get_directives(self) -> typing.Dict[str, typing.Union[bool, int]]:
+        return {
+            field.name: value for field in dataclasses.fields(self)
+            if field.name != 'vary' and (value := getattr(self, field.name)) not in (None, False)
+        }
+
+    def get_header(self) -> str:
+        directives = []
+        for name, value in self.get_directives().items():
+            directive = name.replace('_', '-')
+            directives.append(directive if value is True else f'{directive}={value}')
+        return ', '.join(directives)
+
+    def patch_response(self, response: HttpResponse) -> None:
+        patch_cache_control(response, **self.get_directives())
+        if self.max_age is not None:
+            response['Expires'] = http_date(time.time() + self.max_age)
+        if self.vary:
+            patch_vary_headers(response, self.vary)
+
+
+class CacheStats:
+    def __init__(self) -> None:
+        self.stats = collections.Counter({'hits': 0, 'misses': 0, 'stored': 0})
+        self.lock = threading.Lock()
+
+    def record(self, name: str) -> None:
+        with self.lock:
+            self.stats[name] += 1
+
+    def get_stats(self) -> typing.Dict[str, typing.Any]:
+        with self.lock:
+            stats: typing.Dict[str, typing.Any] = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+object_cache_stats = CacheStats()
+response_cache_stats = CacheStats()
+
+
+def get_cache() -> BaseCache:
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def get_queryset_fingerprint(queryset: QuerySet) -> typing.Optional[str]:
+    try:
+        query_sql = str(queryset.query)
+    except EmptyResultSet:
+        return None
+    return hashlib.md5(query_sql.encode(), usedforsecurity=False).hexdigest()
+
+
+def get_model_generation_key(model: typing.Type[Model]) -> str:
+    return f'restdoctor:generation:{model._meta.label_lower}'
+
+
+def set_model_generation(model: typing.Type[Model]) -> None:
+    get_cache().set(get_model_generation_key(model), uuid.uuid4().hex, None)
+
+
+def bump_model_generation(sender: typing.Type[Model], **kwargs: typing.Any) -> None:
+    # Bumped after commit, otherwise a concurrent request could cache the old rows under the new
+    # generation. QuerySet.update() and bulk_* methods send no signals and bump nothing.
+    transaction.on_commit(functools.partial(set_model_generation, sender), using=kwargs.get('using'))
+
+
+def watch_model_generation(model: typing.Type[Model]) -> None:
+    if model in _watched_models:
+        return
+    _watched_models.add(model)
+    dispatch_uid = get_model_generation_key(model)
+    post_save.connect(bump_model_generation, sender=model, dispatch_uid=dispatch_uid)
+    post_delete.connect(bump_model_generation, sender=model, dispatch_uid=dispatch_uid)
+
+
+def get_model_generations(
+    models: typing.Sequence[typing.Type[Model]], cached: typing.Dict[str, typing.Any],
+) -> ModelGenerations:
+    # Generation is a random token replaced on every save/delete, missing tokens are created with
+    # `add`, so concurrent readers agree on the same one.
+    cache = get_cache()
+    generations = []
+    for model in models:
+        generation_key = get_model_generation_key(model)
+        generation = cached.get(generation_key)
+        if generation is None:
+            cache.add(generation_key, uuid.uuid4().hex, None)
+            generation = cache.get(generation_key)
+        generations.append(generation)
+    return tuple(generations)
+
+
+def get_object_cache_key(queryset: QuerySet, lookup: typing.Any, value: typing.Any) -> typing.Optional[str]:
+    fingerprint = get_queryset_fingerprint(queryset)
+    if fingerprint is None:
+        return None
+    object_key = hashlib.md5(
+        f'{queryset.model._meta.label_lower}:{lookup}:{value}'.encode(), usedforsecurity=False,
+    ).hexdigest()
+    return f'restdoctor:object:{object_key}:{fingerprint}'
+
+
+def get_cached_object(
+    queryset: QuerySet,
+    lookup: typing.Any,
+    value: typing.Any,
+    get_object: typing.Callable[[], Model],
+    timeout: int,
+    models: typing.Sequence[typing.Type[Model]] = (),
+) -> Model:
+    models = [queryset.model, *models]
+    for model in models:
+        watch_model_generation(model)
+    cache_key = get_object_cache_key(queryset, lookup, value)
+    if cache_key is None:
+        return get_object()
+
+    cache = get_cache()
+    cached = cache.get_many([cache_key, *(get_model_generation_key(model) for model in models)])
+    generations = get_model_generations(models, cached)
+    entry = cached.get(cache_key)
+    if entry is not None and entry[0] == generations:
+        object_cache_stats.record('hits')
+        return entry[1]
+
+    object_cache_stats.record('misses')
+    obj = get_object()
+    cache.set(cache_key, (generations, obj), timeout)
+    object_cache_stats.record('stored')
+    return obj
+
+
+def get_object_cache_stats() -> typing.Dict[str, typing.Any]:
+    return object_cache_stats.get_stats()
+
+
+def get_cache_policy_from_map(
+    action: str, cache_policy_map: typing.Dict[str, CachePolicy],
+) -> typing.Optional[CachePolicy]:
+    cache_policy = cache_policy_map.get('default')
+    return cache_policy_map.get(action, cache_policy)
+
+
+def get_cache_control_from_map(
+    action: str, cache_control_map: typing.Dict[str, CacheControl], api_format: str = None,
+) -> typing.Optional[CacheControl]:
+    formats = get_filter_formats(settings.API_FORMATS, api_format or settings.API_DEFAULT_FORMAT)
+    cache_control = cache_control_map.get('default')
+    for format_name in formats:
+        cache_control = cache_control_map.get(f'default.{format_name}', cache_control)
+    cache_control = cache_control_map.get(action, cache_control)
+    for format_name in formats:
+        cache_control = cache_control_map.get(f'{action}.{format_name}', cache_control)
+    return cache_control
+
+
+def get_cache_policy_models(
+    view: APIView, cache_policy: CachePolicy,
+) -> typing.Sequence[typing.Type[Model]]:
+    if cache_policy.models:
+        return cache_policy.models
+    queryset = getattr(view, 'queryset', None)
+    return [queryset.model] if queryset is not None else []
+
+
+def get_vary_by_value(view: APIView, request: Request, dimension: str) -> typing.Any:
+    api_params = getattr(request, 'api_params', None)
+    if dimension in {'version', 'format'}:
+        return getattr(api_params, dimension, None)
+    if dimension == 'resource':
+        return (
+            getattr(api_params, 'resource_discriminator', None),
+            request.query_params.get(settings.API_RESOURCE_DISCRIMINATIVE_PARAM),
+        )
+    if dimension == 'query':
+        return sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    if dimension == 'user':
+        return request.user.pk if request.user.is_authenticated else None
+    return view.get_cache_scope()
+
+
+def get_response_cache_key(view: APIView, request: Request, cache_policy: CachePolicy) -> str:
+    key_parts = [
+        f'{view.__class__.__module__}.{view.__class__.__qualname__}',
+        getattr(view, 'action', None),
+        request.accepted_media_type,
+        translation.get_language(),
+        *(get_vary_by_value(view, request, dimension) for dimension in cache_policy.vary_by),
+    ]
+    response_key = hashlib.md5(repr(key_parts).encode(), usedforsecurity=False).hexdigest()
+    return f'restdoctor:response:{response_key}'
+
+
+def get_cached_response(
+    cache_key: str, models: typing.Sequence[typing.Type[Model]],
+) -> typing.Tuple[typing.Optional[HttpResponse], ModelGenerations]:
+    for model in models:
+        watch_model_generation(model)
+    cached = get_cache().get_many([cache_key, *(get_model_generation_key(model) for model in models)])
+    generations = get_model_generations(models, cached)
+    entry = cached.get(cache_key)
+    if entry is None or entry[0] != generations:
+        response_cache_stats.record('misses')
+        return None, generations
+
+    response_cache_stats.record('hits')
+    _, content, status, headers = entry
+    response = HttpResponse(content, status=status)
+    for header, value in headers:
+        response[header] = value
+    return response, generations
+
+
+def set_cached_response(
+    cache_key: str, response: HttpResponse, generations: ModelGenerations, timeout: int,
+) -> None:
+    entry = (generations, response.content, response.status_code, tuple(response.items()))
+    get_cache().set(cache_key, entry, timeout)
+    response_cache_stats.record('stored')
+
+
+def get_response_cache_stats() -> typing.Dict[str, typing.Any]:
+    return response_cache_stats.get_stats()
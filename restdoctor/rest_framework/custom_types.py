@@ -13,6 +13,20 @@ Action = str
 
 ActionMap = t.Dict[Action, str]
 Handler = t.Callable[..., Response]
+
+
+class ViewFunctionWithAttrs(t.Protocol):
+    initkwargs: dict[str, t.Any]
+
+    def __call__(self, *args: t.Any, **kwargs: t.Any) -> t.Any:
+        ...
+
+
+class ViewSetFunction(ViewFunctionWithAttrs, t.Protocol):
+    cls: t.Type[t.Any]
+    actions: t.Optional[ActionMap]
+
+
 ResourceExtraAction = t.Tuple[str, str, Handler]
 
 RouteOrDynamicRoute = t.Union[Route, DynamicRoute]
@@ -29,16 +43,12 @@ ResourceMap = t.Dict[str, ResourceMapElement]
 
 ResourceViewsMap = ResourceMap[t.Type[ViewSet]]
 ResourceActionsMap = ResourceMap[t.Set[str]]
-ResourceHandlersMap = ResourceMap[Handler]
+FrozenResourceActionsMap = t.Mapping[str, t.FrozenSet[str]]
+ResourceHandlersMap = ResourceMap[ViewSetFunction]
 ResourceModelsMap = ResourceMap[t.Optional[models.Model]]
+ResourceDispatchTable = t.Dict[t.Tuple[str, str], ViewSetFunction]
+ErrorResponseKey = t.Tuple[t.Any, ...]
 
 GenericRepresentation = t.Dict[str, t.Any]
 
 ModelObject = t.TypeVar('ModelObject', bound=models.Model, covariant=True)
-
-
-class ViewFunctionWithAttrs(t.Protocol):
-    initkwargs: dict[str, t.Any]
-
-    def __call__(self, *args: t.Any, **kwargs: t.Any) -> t.Any:
-        ...
@@ -1,10 +1,11 @@
 from __future__ import annotations
 import datetime
-from typing import Optional, Union, Any
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Union
 
 from django.db import models
 from rest_framework import ISO_8601
 from rest_framework.fields import DateTimeField as BaseDateTimeField
+from rest_framework.fields import SerializerMethodField
 from rest_framework.relations import HyperlinkedIdentityField as BaseHyperlinkedIdentityField
 from rest_framework.request import Request
 from rest_framework.settings import api_settings
@@ -36,3 +37,35 @@ class HyperlinkedIdentityField(BaseHyperlinkedIdentityField):
     def get_url(self, obj: models.Model, view_name: str, request: Request, *args: Any, **kwargs: Any) -> str:
         url = super().get_url(obj, view_name, request, *args, **kwargs)
         return preserve_resource_params(url, request)
+
+
+class BatchMethodField(SerializerMethodField):
+    """SerializerMethodField, whose method gets all instances of a list at once.
+
+    The method returns a mapping from `key(instance)` to the field value, instances missing from
+    the mapping get `default`.
+    """
+
+    def __init__(
+        self,
+        method_name: str = None,
+        key: Callable[[Any], Any] = None,
+        default: Any = None,
+        **kwargs: Any,
+    ) -> None:
+        self.key = key or (lambda instance: instance.pk)
+        self.default_value = default
+        super().__init__(method_name=method_name, **kwargs)
+
+    def resolve(self, instances: Sequence[Any]) -> Dict[Any, Any]:
+        method = getattr(self.parent, self.method_name)
+        return dict(method(instances))
+
+    def get_batch_value(self, instance: Any, batch_values: Mapping[Any, Any]) -> Any:
+        return batch_values.get(self.key(instance), self.default_value)
+
+    def to_representation(self, value: Any) -> Any:
+        batch_values = getattr(self.parent, '_batch_values', {}).get(self.field_name)
+        if batch_values is None:
+            batch_values = self.resolve([value])
+        return self.get_batch_value(value, batch_values)
@@ -1,22 +1,42 @@
 from __future__ import annotations
 
 import contextlib
+import functools
+import operator
 import re
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Pattern, Sequence, Tuple, Type
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
 from django.core.exceptions import ValidationError as DjangoValidationError
-from django.db.models import Model, QuerySet
+from django.db.models import Case, IntegerField, Model, Q, QuerySet, Value, When
 from django.http import Http404
 from rest_framework.generics import GenericAPIView as BaseGenericAPIView
 from rest_framework.generics import get_object_or_404
 
+from restdoctor.rest_framework.caching import get_cached_object, watch_model_generation
 from restdoctor.rest_framework.mixins import NegotiatedMixin
 
 
+@functools.lru_cache(maxsize=None)
+def compile_lookup_fields(lookup_fields: Tuple[Tuple[str, str], ...]) -> Tuple[Tuple[str, Pattern], ...]:
+    return tuple((lookup_field, re.compile(lookup_regex)) for lookup_field, lookup_regex in lookup_fields)
+
+
 class GenericAPIView(NegotiatedMixin, BaseGenericAPIView):
     lookup_fields: Optional[Dict[str, str]] = None
+    object_cache_timeout: Optional[int] = None
+    object_cache_models: Sequence[Type[Model]] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Processes that only write models still have to invalidate the cache, so receivers are
+        # connected when the view is imported, not on the first request.
+        if cls.object_cache_timeout is not None:
+            if isinstance(cls.queryset, QuerySet):
+                watch_model_generation(cls.queryset.model)
+            for model in cls.object_cache_models:
+                watch_model_generation(model)
 
     def get_object(self) -> Model:
         if self.lookup_fields is None:
@@ -24,25 +44,68 @@ class GenericAPIView(NegotiatedMixin, BaseGenericAPIView):
 
         self._check_lookup_configuration()
         queryset = self._get_queryset_for_object()
-
-        obj = None
         filter_value = self.kwargs[self.lookup_url_kwarg]
-        for lookup_field, lookup_regex in self.lookup_fields.items():
-            if re.match(lookup_regex, filter_value):
-                filter_kwargs = {lookup_field: filter_value}
-                with contextlib.suppress(
-                    AttributeError, TypeError, ValueError, DjangoValidationError, ObjectDoesNotExist
-                ):
-                    obj = queryset.get(**filter_kwargs)
-                    break
+        obj = self._get_memoized_object(
+            queryset,
+            tuple(self.lookup_fields),
+            filter_value,
+            lambda: self._get_object_by_lookup_fields(queryset, filter_value),
+        )
 
-        if obj is None:
+        self.check_object_permissions(self.request, obj)
+
+        return obj
+
+    def _get_object_by_lookup_fields(self, queryset: QuerySet, filter_value: str) -> Model:
+        # All matching lookups go into one OR query, the first matching lookup in `lookup_fields` wins.
+        conditions = self._get_lookup_conditions(queryset, filter_value)
+        if not conditions:
             raise Http404
 
-        self.check_object_permissions(self.request, obj)
+        queryset = queryset.filter(functools.reduce(operator.or_, conditions))
+        if len(conditions) > 1:
+            queryset = queryset.annotate(
+                lookup_precedence=Case(
+                    *[When(condition, then=Value(idx)) for idx, condition in enumerate(conditions)],
+                    output_field=IntegerField(),
+                )
+            ).order_by('lookup_precedence')
 
+        obj = next(iter(queryset[:1]), None)
+        if obj is None:
+            raise Http404
         return obj
 
+    def _get_lookup_conditions(self, queryset: QuerySet, filter_value: str) -> List[Q]:
+        conditions = []
+        lookup_fields = compile_lookup_fields(tuple(self.lookup_fields.items()))  # type: ignore
+        for lookup_field, lookup_pattern in lookup_fields:
+            if lookup_pattern.match(filter_value):
+                condition = Q(**{lookup_field: filter_value})
+                # Values the field can't take (e.g. not an uuid) are skipped without a query.
+                with contextlib.suppress(
+                    AttributeError, TypeError, ValueError, DjangoValidationError, ObjectDoesNotExist
+                ):
+                    queryset.filter(condition)
+                    conditions.append(condition)
+        return conditions
+
+    def _get_memoized_object(
+        self, queryset: QuerySet, lookup: Any, value: Any, get_object: Callable[[], Model],
+    ) -> Model:
+        object_memo = self.__dict__.setdefault('_object_memo', {})
+        key = (lookup, value)
+        if key not in object_memo:
+            if self.object_cache_timeout is None:
+                object_memo[key] = get_object()
+            else:
+                object_memo[key] = get_cached_object(
+                    queryset, lookup, value, get_object,
+                    timeout=self.object_cache_timeout,
+                    models=self.object_cache_models,
+                )
+        return object_memo[key]
+
     def _simple_get_object(self) -> Model:
         # copy paste from `rest_framework.generics.GenericAPIView.get_object`, but other `queryset`
         queryset = self._get_queryset_for_object()  # <-changed
@@ -60,7 +123,12 @@ class GenericAPIView(NegotiatedMixin, BaseGenericAPIView):
             )
 
         filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
-        obj = get_object_or_404(queryset, **filter_kwargs)
+        obj = self._get_memoized_object(
+            queryset,
+            self.lookup_field,
+            self.kwargs[lookup_url_kwarg],
+            lambda: get_object_or_404(queryset, **filter_kwargs),
+        )
 
         # May raise a permission denied
         self.check_object_permissions(self.request, obj)
@@ -11,15 +11,29 @@ from rest_framework.mixins import UpdateModelMixin as BaseUpdateModelMixin
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from restdoctor.rest_framework.caching import (
+    CachePolicy,
+    get_cache_policy_from_map,
+    get_cache_policy_models,
+    get_cached_response,
+    get_response_cache_key,
+    set_cached_response,
+    watch_model_generation,
+)
 from restdoctor.rest_framework.negotiations import APIVersionContentNegotiation
 from restdoctor.rest_framework.pagination import PageNumberPagination
+from restdoctor.rest_framework.prefetch import get_prefetched_response, schedule_next_page_prefetch
 from restdoctor.rest_framework.response import ResponseWithMeta
 from restdoctor.rest_framework.serializers import EmptySerializer
+from restdoctor.utils.concurrency import run_concurrently
+from restdoctor.utils.timing import stage_timer
 
 if typing.TYPE_CHECKING:
     from django.db.models import QuerySet
+    from django.http import HttpResponse
     from rest_framework.pagination import BasePagination
     from rest_framework.serializers import BaseSerializer
+    from rest_framework.utils.serializer_helpers import ReturnList
 
     from restdoctor.rest_framework.custom_types import ModelObject
 
@@ -48,31 +62,95 @@ class CreateModelMixin(BaseCreateModelMixin):
 
 class ListModelMixin(BaseListModelMixin):
     pagination_class: typing.Optional[BasePagination] = PageNumberPagination
+    concurrent_queries = False
+    prefetch_next_page = False
+    cache_policy_map: typing.Dict[str, CachePolicy] = {}
+
+    def __init_subclass__(cls, **kwargs: typing.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for cache_policy in cls.cache_policy_map.values():
+            for model in get_cache_policy_models(cls, cache_policy):
+                watch_model_generation(model)
 
     def get_serializer(self, *args: typing.Any, **kwargs: typing.Any) -> BaseSerializer:
         return self.get_response_serializer(*args, **kwargs)
 
     def list(  # noqa: A003
         self, request: Request, *args: typing.Any, **kwargs: typing.Any
-    ) -> Response:
+    ) -> typing.Union[Response, HttpResponse]:
+        if self.prefetch_next_page:
+            prefetched_response = get_prefetched_response(self, request)
+            if prefetched_response is not None:
+                return prefetched_response
+
+        cache_policy = self.get_cache_policy()
+        if cache_policy is None:
+            return self.get_list_response(request)
+
+        cache_key = get_response_cache_key(self, request, cache_policy)
+        cached_response, generations = get_cached_response(
+            cache_key, get_cache_policy_models(self, cache_policy)
+        )
+        if cached_response is not None:
+            return cached_response
+
+        response = self.get_list_response(request)
+        if response.status_code == status.HTTP_200_OK:
+            self.render_list_response(request, response)
+            set_cached_response(cache_key, response, generations, cache_policy.timeout)
+        return response
+
+    def render_list_response(self, request: Request, response: typing.Union[Response, HttpResponse]) -> None:
+        # Rendered before finalize_response, so cached and fresh responses are finalized by dispatch
+        # exactly once and the cache keeps only the body and the headers set by the view.
+        if isinstance(response, Response):
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = self.get_renderer_context()
+            response.render()
+
+    def get_cache_policy(self) -> typing.Optional[CachePolicy]:
+        return get_cache_policy_from_map(getattr(self, 'action', None) or 'list', self.cache_policy_map)
+
+    def get_cache_scope(self) -> typing.Any:
+        user = self.request.user
+        return (
+            user.is_authenticated,
+            getattr(user, 'is_staff', False),
+            getattr(user, 'is_superuser', False),
+        )
+
+    def get_list_response(self, request: Request) -> typing.Union[Response, HttpResponse]:
         request_serializer = self.get_request_serializer(
             data=request.query_params, use_default=False
         )
         request_serializer.is_valid(raise_exception=True)
-        queryset = self.get_collection(request_serializer)
-        meta = self.get_meta_serializer_data()
-        page = self.paginate_queryset(queryset)
+        with stage_timer('collection'):
+            queryset = self.get_collection(request_serializer)
+        meta, page = run_concurrently(
+            self.get_meta_serializer_job(),
+            lambda: self.paginate_queryset(queryset),
+            enabled=self.concurrent_queries,
+        )
         if page is not None:
             prepare_page = self.perform_list(page, request_data=request_serializer.validated_data)
             serializer = self.get_serializer(prepare_page, many=True)
-            response = self.get_paginated_response(serializer.data)
+            with stage_timer('serialization') as span, self.profile_serialization():
+                page_data = self.get_page_data(serializer)
+                span.set_attribute('api.items', len(page_data))
+            response = self.get_paginated_response(page_data)
             response.meta.update(meta)
+            if self.prefetch_next_page:
+                schedule_next_page_prefetch(self, request)
             return response
 
         prepare_data = self.perform_list(queryset, request_data=request_serializer.validated_data)
 
         serializer = self.get_serializer(prepare_data, many=True)
-        return ResponseWithMeta(data=serializer.data, meta=meta)
+        with stage_timer('serialization') as span, self.profile_serialization():
+            data = serializer.data
+            span.set_attribute('api.items', len(data))
+        return ResponseWithMeta(data=data, meta=meta)
 
     def get_collection(
         self, request_serializer: BaseSerializer
@@ -84,14 +162,25 @@ class ListModelMixin(BaseListModelMixin):
     ) -> typing.Union[typing.List, QuerySet]:
         return data
 
+    def get_page_data(self, serializer: BaseSerializer) -> ReturnList:
+        get_serializer_data = getattr(self.paginator, 'get_serializer_data', None)
+        if get_serializer_data is None:
+            return serializer.data
+        return get_serializer_data(serializer)
+
     def get_meta_data(self) -> typing.Dict[str, typing.Any]:
         return {}
 
     def get_meta_serializer_data(self) -> typing.Dict[str, typing.Any]:
+        return self.get_meta_serializer_job()()
+
+    def get_meta_serializer_job(self) -> typing.Callable[[], typing.Dict[str, typing.Any]]:
+        # With concurrent_queries the job runs in a worker thread, where the view and DRF request
+        # must not be used: meta data and serializer context are prepared in the request thread.
         if issubclass(self.get_meta_serializer_class(), EmptySerializer):
-            return {}
+            return dict
         serializer = self.get_meta_serializer(self.get_meta_data())
-        return serializer.data
+        return lambda: serializer.data
 
 
 class RetrieveModelMixin(BaseRetrieveModelMixin):
@@ -101,11 +190,14 @@ class RetrieveModelMixin(BaseRetrieveModelMixin):
         )
         request_serializer.is_valid(raise_exception=True)
 
-        item = self.get_item(request_serializer)
+        with stage_timer('query'):
+            item = self.get_item(request_serializer)
         item = self.perform_retrieve(item)
 
         serializer = self.get_serializer(item)
-        return Response(serializer.data)
+        with stage_timer('serialization'), self.profile_serialization():
+            data = serializer.data
+        return Response(data)
 
     def get_item(
         self, request_serializer: BaseSerializer
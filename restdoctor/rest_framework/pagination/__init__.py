@@ -2,5 +2,6 @@ from restdoctor.rest_framework.pagination.page_number import (  # noqa: F401
     PageNumberPagination, PageNumberUncountedPagination,
 )
 from restdoctor.rest_framework.pagination.cursor_uuid import (  # noqa: F401
-    CursorUUIDPagination, CursorUUIDUncountedPagination, get_order,
+    CursorUUIDBudgetPagination, CursorUUIDPagination, CursorUUIDUncountedBudgetPagination,
+    CursorUUIDUncountedPagination, get_order,
 )
@@ -5,20 +5,28 @@ import typing
 
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework.pagination import BasePagination
-from rest_framework.utils.urls import remove_query_param, replace_query_param
-
-from restdoctor.constants import DEFAULT_MAX_PAGE_SIZE, DEFAULT_PAGE_SIZE
-from restdoctor.rest_framework.pagination.mixins import SerializerClassPaginationMixin
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnList
+
+from restdoctor.constants import DEFAULT_MAX_PAGE_BYTES, DEFAULT_MAX_PAGE_SIZE, DEFAULT_PAGE_SIZE
+from restdoctor.rest_framework.pagination.links import PageLinkTemplate
+from restdoctor.rest_framework.pagination.mixins import (
+    SerializerClassPaginationMixin,
+    is_concurrent_pagination,
+)
 from restdoctor.rest_framework.pagination.serializers import (
     CursorUUIDRequestSerializer,
     CursorUUIDResponseSerializer,
     CursorUUIDUncountedResponseSerializer,
 )
 from restdoctor.rest_framework.response import ResponseWithMeta
+from restdoctor.utils.concurrency import run_concurrently
+from restdoctor.utils.timing import stage_timer, timed
 
 if typing.TYPE_CHECKING:
     from django.db.models import QuerySet
     from rest_framework.request import Request
+    from rest_framework.serializers import ListSerializer
     from rest_framework.views import APIView
 
     from restdoctor.rest_framework.pagination.custom_types import OptionalList, OptionalLookup
@@ -101,8 +109,10 @@ class CursorUUIDPagination(SerializerClassPaginationMixin, BasePagination):
         order_keyword = f'{order_sign}{self.order_by_field}'
         queryset = queryset.order_by(order_keyword)
 
-        base_url = request.build_absolute_uri()
-        self.base_url = replace_query_param(base_url, self.page_size_query_param, self.per_page)
+        self.link_template = PageLinkTemplate(
+            request.build_absolute_uri(), **{self.page_size_query_param: self.per_page}
+        )
+        self.base_url = self.link_template.url
         self.request = request
         self.has_next = False
 
@@ -110,9 +120,14 @@ class CursorUUIDPagination(SerializerClassPaginationMixin, BasePagination):
         stop_offset = start_offset + self.per_page + 1
 
         if self.use_count:
-            self.total = queryset.count()
-
-        paginated = list(queryset[:stop_offset])
+            self.total, paginated = run_concurrently(
+                timed('pagination_count', queryset.count),
+                timed('pagination_page', lambda: list(queryset[:stop_offset])),
+                enabled=is_concurrent_pagination(queryset, view),
+            )
+        else:
+            with stage_timer('pagination_page'):
+                paginated = list(queryset[:stop_offset])
 
         if len(paginated) > self.per_page:
             self.has_next = True
@@ -128,19 +143,24 @@ class CursorUUIDPagination(SerializerClassPaginationMixin, BasePagination):
         return paginated
 
     def get_page_link_tmpl(self) -> str:
-        url_tmpl = self.request.build_absolute_uri()
-        url_tmpl = replace_query_param(url_tmpl, self.page_size_query_param, self.per_page)
-        return url_tmpl
+        return self.link_template.url
 
     def get_page_link(
         self, after: typing.Any = None, before: typing.Any = None
     ) -> typing.Optional[str]:
         if after is not None:
-            base_url = remove_query_param(self.base_url, self.before_query_param)
-            return replace_query_param(base_url, self.after_query_param, after)
+            return self.link_template.get_link(
+                self.after_query_param, after, remove_params=[self.before_query_param]
+            )
         if before is not None:
-            base_url = remove_query_param(self.base_url, self.after_query_param)
-            return replace_query_param(base_url, self.before_query_param, before)
+            return self.link_template.get_link(
+                self.before_query_param, before, remove_params=[self.after_query_param]
+            )
+
+    def get_next_page_link(self) -> typing.Optional[str]:
+        if not self.has_next:
+            return None
+        return self.get_page_link(**{self.order: self.page_boundaries[1] or ''})
 
     def get_paginated_response(self, data: typing.Sequence[typing.Any]) -> ResponseWithMeta:
         meta = {self.page_size_query_param: self.per_page, 'has_next': self.has_next}
@@ -174,3 +194,43 @@ class CursorUUIDUncountedPagination(CursorUUIDPagination):
         'default': CursorUUIDRequestSerializer,
         'pagination': {'response': CursorUUIDUncountedResponseSerializer},
     }
+
+
+class CursorUUIDBudgetPagination(CursorUUIDPagination):
+    max_page_bytes = DEFAULT_MAX_PAGE_BYTES
+    budget_chunk_size = 10
+
+    def get_serializer_data(self, serializer: ListSerializer) -> ReturnList:
+        # Items are serialized in chunks through the list serializer, so batch fields are resolved
+        # once per chunk, and each chunk is rendered once to measure it. Only the chunk, which
+        # exceeds the budget, is measured item by item to find the cut.
+        renderer = JSONRenderer()
+        instances = list(serializer.instance)
+        data: typing.List[typing.Any] = []
+        page_bytes = 0
+        for chunk_start in range(0, len(instances), self.budget_chunk_size):
+            chunk_instances = instances[chunk_start:chunk_start + self.budget_chunk_size]
+            chunk_data = serializer.to_representation(chunk_instances)
+            chunk_bytes = len(renderer.render(chunk_data))
+            if page_bytes + chunk_bytes <= self.max_page_bytes:
+                data.extend(chunk_data)
+                page_bytes += chunk_bytes
+                continue
+
+            for representation in chunk_data:
+                page_bytes += len(renderer.render(representation))
+                if data and page_bytes > self.max_page_bytes:
+                    self.has_next = True
+                    self.page_boundaries = (self.page_boundaries[0], instances[len(data) - 1].uuid)
+                    return ReturnList(data, serializer=serializer)
+                data.append(representation)
+        return ReturnList(data, serializer=serializer)
+
+
+class CursorUUIDUncountedBudgetPagination(CursorUUIDBudgetPagination):
+    use_count = False
+
+    serializer_class_map = {
+        'default': CursorUUIDRequestSerializer,
+        'pagination': {'response': CursorUUIDUncountedResponseSerializer},
+    }
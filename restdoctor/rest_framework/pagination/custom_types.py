@@ -5,3 +5,4 @@ import typing as t
 OptionalList = t.Optional[t.List[t.Any]]
 Lookup = t.Dict[str, t.Any]
 OptionalLookup = t.Optional[Lookup]
+SeekKey = t.Tuple[str, bool]
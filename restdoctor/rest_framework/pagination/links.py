@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import typing
+from urllib import parse
+
+from django.utils.encoding import force_str
+
+
+class PageLinkTemplate:
+    """Same links as `replace_query_param`/`remove_query_param`, but the URL is parsed once."""
+
+    def __init__(self, url: str, **replace_params: typing.Any) -> None:
+        scheme, netloc, path, query, fragment = parse.urlsplit(force_str(url))
+        self.location = parse.urlunsplit((scheme, netloc, path, '', ''))
+        self.fragment = f'#{fragment}' if fragment else ''
+        self.query_dict = parse.parse_qs(query, keep_blank_values=True)
+        for key, value in replace_params.items():
+            self.query_dict[force_str(key)] = [force_str(value)]
+        self._slots: typing.Dict[typing.Tuple[str, typing.FrozenSet[str]], typing.Tuple[str, str]] = {}
+
+    @property
+    def url(self) -> str:
+        return self._build(parse.urlencode(sorted(self.query_dict.items()), doseq=True))
+
+    def get_link(
+        self, key: str, value: typing.Any, remove_params: typing.Iterable[str] = (),
+    ) -> str:
+        key = force_str(key)
+        before, after = self._get_slot(key, frozenset(remove_params))
+        param = parse.urlencode({key: force_str(value)})
+        return self._build(f'{before}{param}{after}')
+
+    def _get_slot(self, key: str, remove_params: typing.FrozenSet[str]) -> typing.Tuple[str, str]:
+        slot = self._slots.get((key, remove_params))
+        if slot is None:
+            items = sorted(
+                (param, values) for param, values in self.query_dict.items()
+                if param != key and param not in remove_params
+            )
+            before = parse.urlencode([item for item in items if item[0] < key], doseq=True)
+            after = parse.urlencode([item for item in items if item[0] > key], doseq=True)
+            slot = (f'{before}&' if before else '', f'&{after}' if after else '')
+            self._slots[(key, remove_params)] = slot
+        return slot
+
+    def _build(self, query: str) -> str:
+        if query:
+            return f'{self.location}?{query}{self.fragment}'
+        return f'{self.location}{self.fragment}'
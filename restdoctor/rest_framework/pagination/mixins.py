@@ -5,10 +5,19 @@ import typing
 from restdoctor.utils.serializers import get_serializer_class_from_map
 
 if typing.TYPE_CHECKING:
+    from django.db.models import QuerySet
+    from rest_framework.views import APIView
+
     from restdoctor.rest_framework.schema.custom_types import OpenAPISchema, ViewSchemaBase
     from restdoctor.utils.serializers import SerializerClassMap, SerializerType
 
 
+def is_concurrent_pagination(
+    queryset: typing.Union[QuerySet, typing.List], view: typing.Optional[APIView],
+) -> bool:
+    return not isinstance(queryset, list) and getattr(view, 'concurrent_queries', False)
+
+
 class SerializerClassPaginationMixin:
     view_schema: typing.Optional[ViewSchemaBase]
     serializer_class: SerializerType
@@ -2,26 +2,58 @@ from __future__ import annotations
 
 import typing
 
+from django.core.cache import caches
+from django.core.exceptions import FieldDoesNotExist
 from django.utils.translation import gettext_lazy as _
 from rest_framework.pagination import BasePagination
-from rest_framework.utils.urls import replace_query_param
 from rest_framework.exceptions import NotFound
 
-from restdoctor.constants import DEFAULT_MAX_PAGE_SIZE, DEFAULT_PAGE_SIZE
-from restdoctor.rest_framework.pagination.mixins import SerializerClassPaginationMixin
+from restdoctor.constants import (
+    DEFAULT_MAX_PAGE_SIZE,
+    DEFAULT_PAGE_BOUNDARY_CACHE_TIMEOUT,
+    DEFAULT_PAGE_BOUNDARY_LOOKBEHIND,
+    DEFAULT_PAGE_SIZE,
+)
+from restdoctor.rest_framework.caching import get_queryset_fingerprint
+from restdoctor.rest_framework.pagination.links import PageLinkTemplate
+from restdoctor.rest_framework.pagination.mixins import (
+    SerializerClassPaginationMixin,
+    is_concurrent_pagination,
+)
 from restdoctor.rest_framework.pagination.serializers import (
     PageNumberRequestSerializer,
     PageNumberResponseSerializer,
     PageNumberUncountedResponseSerializer,
 )
 from restdoctor.rest_framework.response import ResponseWithMeta
+from restdoctor.utils.concurrency import run_concurrently
+from restdoctor.utils.timing import stage_timer, timed
 
 if typing.TYPE_CHECKING:
     from django.db.models import QuerySet
     from rest_framework.request import Request
     from rest_framework.views import APIView
 
-    from restdoctor.rest_framework.pagination.custom_types import OptionalList
+    from restdoctor.rest_framework.pagination.custom_types import OptionalList, SeekKey
+
+
+def get_queryset_seek_key(queryset: QuerySet) -> typing.Optional[SeekKey]:
+    query = queryset.query
+    ordering = query.order_by or (query.default_ordering and queryset.model._meta.ordering)
+    if not ordering or len(ordering) != 1 or not isinstance(ordering[0], str):
+        return None
+
+    order_field = ordering[0]
+    descending = order_field.startswith('-')
+    field_name = order_field.lstrip('-')
+    opts = queryset.model._meta
+    try:
+        field = opts.pk if field_name == 'pk' else opts.get_field(field_name)
+    except FieldDoesNotExist:
+        return None
+    if not field.unique or field.null:
+        return None
+    return field.attname, descending
 
 
 class PageNumberPagination(SerializerClassPaginationMixin, BasePagination):
@@ -38,7 +70,14 @@ class PageNumberPagination(SerializerClassPaginationMixin, BasePagination):
     max_page_size = DEFAULT_MAX_PAGE_SIZE
     default_page_size = DEFAULT_PAGE_SIZE
 
+    max_offset: typing.Optional[int] = None
+    seek_offset_threshold: typing.Optional[int] = None
+    page_boundary_cache_alias = 'default'
+    page_boundary_cache_timeout = DEFAULT_PAGE_BOUNDARY_CACHE_TIMEOUT
+    page_boundary_lookbehind = DEFAULT_PAGE_BOUNDARY_LOOKBEHIND
+
     invalid_page_message = _('Invalid page.')
+    deep_page_message = _('Page {page_number} is too deep, narrow the result with filters.')
 
     def paginate_queryset(
         self, queryset: QuerySet, request: Request, view: APIView = None,
@@ -53,26 +92,33 @@ class PageNumberPagination(SerializerClassPaginationMixin, BasePagination):
         self.has_next = False
         self.has_prev = (self.page > 1)
 
-        base_url = request.build_absolute_uri()
-        self.base_url = replace_query_param(base_url, self.page_size_query_param, self.per_page)
+        self.link_template = PageLinkTemplate(
+            request.build_absolute_uri(), **{self.page_size_query_param: self.per_page}
+        )
+        self.base_url = self.link_template.url
         self.request = request
 
         start_offset = (self.page - 1) * self.per_page
         stop_offset = start_offset + self.per_page + 1
 
-        if self.use_count:
-            self.total = len(queryset) if isinstance(queryset, list) else queryset.count()
-            if self.total and self.per_page:
-                self.pages, rem = divmod(self.total, self.per_page)
-                if rem:
-                    self.pages += 1
-            else:
-                self.pages = 1
-            if self.page > self.pages:
-                msg = self.invalid_page_message.format(page_number=self.page)
-                raise NotFound(msg)
-
-        paginated = list(queryset[start_offset:stop_offset])
+        paginated = None
+        if self.use_count and is_concurrent_pagination(queryset, view):
+            self.total, paginated = run_concurrently(
+                timed('pagination_count', queryset.count),
+                timed(
+                    'pagination_page',
+                    lambda: self.get_page_items(queryset, start_offset, stop_offset),
+                ),
+            )
+            self.check_page()
+        elif self.use_count:
+            with stage_timer('pagination_count'):
+                self.total = len(queryset) if isinstance(queryset, list) else queryset.count()
+            self.check_page()
+
+        if paginated is None:
+            with stage_timer('pagination_page'):
+                paginated = self.get_page_items(queryset, start_offset, stop_offset)
 
         if len(paginated) > self.per_page:
             self.has_next = True
@@ -80,14 +126,104 @@ class PageNumberPagination(SerializerClassPaginationMixin, BasePagination):
 
         return paginated
 
+    def check_page(self) -> None:
+        if self.total and self.per_page:
+            self.pages, rem = divmod(self.total, self.per_page)
+            if rem:
+                self.pages += 1
+        else:
+            self.pages = 1
+        if self.page > self.pages:
+            msg = self.invalid_page_message.format(page_number=self.page)
+            raise NotFound(msg)
+
+    def get_page_items(
+        self, queryset: typing.Union[QuerySet, typing.List], start_offset: int, stop_offset: int,
+    ) -> typing.List[typing.Any]:
+        if isinstance(queryset, list):
+            return queryset[start_offset:stop_offset]
+
+        seek_offset_threshold = self.seek_offset_threshold
+        if seek_offset_threshold is None or (seek_key := get_queryset_seek_key(queryset)) is None:
+            self.check_offset(start_offset)
+            return list(queryset[start_offset:stop_offset])
+
+        # SQL of the queryset is compiled and hashed once for all page boundary keys.
+        fingerprint = get_queryset_fingerprint(queryset)
+        if fingerprint is None or start_offset < seek_offset_threshold:
+            self.check_offset(start_offset)
+            paginated = list(queryset[start_offset:stop_offset])
+        else:
+            paginated = self.seek_page_items(
+                queryset, seek_key, fingerprint, start_offset, stop_offset
+            )
+
+        if fingerprint is not None and start_offset + self.per_page >= seek_offset_threshold:
+            self.set_page_boundary(fingerprint, seek_key, paginated)
+        return paginated
+
+    def seek_page_items(
+        self,
+        queryset: QuerySet,
+        seek_key: SeekKey,
+        fingerprint: str,
+        start_offset: int,
+        stop_offset: int,
+    ) -> typing.List[typing.Any]:
+        boundary = self.get_nearest_page_boundary(fingerprint)
+        if boundary is None:
+            self.check_offset(start_offset)
+            return list(queryset[start_offset:stop_offset])
+
+        boundary_page, boundary_value = boundary
+        field_name, descending = seek_key
+        lookup_operator = 'lt' if descending else 'gt'
+        queryset = queryset.filter(**{f'{field_name}__{lookup_operator}': boundary_value})
+        seek_offset = start_offset - boundary_page * self.per_page
+        self.check_offset(seek_offset)
+        return list(queryset[seek_offset:seek_offset + stop_offset - start_offset])
+
+    def check_offset(self, offset: int) -> None:
+        if self.max_offset is not None and offset > self.max_offset:
+            msg = self.deep_page_message.format(page_number=self.page)
+            raise NotFound(msg)
+
+    def get_page_boundary_cache_key(self, fingerprint: str, page: int) -> str:
+        return f'restdoctor:page_boundary:{fingerprint}:{self.per_page}:{page}'
+
+    def get_nearest_page_boundary(
+        self, fingerprint: str,
+    ) -> typing.Optional[typing.Tuple[int, typing.Any]]:
+        pages_keys = {
+            page: self.get_page_boundary_cache_key(fingerprint, page)
+            for page in range(self.page - 1, max(self.page - 1 - self.page_boundary_lookbehind, 0), -1)
+        }
+
+        cached = caches[self.page_boundary_cache_alias].get_many(list(pages_keys.values()))
+        for page, cache_key in pages_keys.items():
+            if cache_key in cached:
+                return page, cached[cache_key]
+        return None
+
+    def set_page_boundary(
+        self, fingerprint: str, seek_key: SeekKey, paginated: typing.List[typing.Any],
+    ) -> None:
+        if len(paginated) < self.per_page or not self.per_page:
+            return
+        field_name, _descending = seek_key
+        boundary_value = getattr(paginated[self.per_page - 1], field_name)
+        caches[self.page_boundary_cache_alias].set(
+            self.get_page_boundary_cache_key(fingerprint, self.page),
+            boundary_value,
+            self.page_boundary_cache_timeout,
+        )
+
     def get_page_link_tmpl(self) -> str:
-        url_tmpl = self.request.build_absolute_uri()
-        url_tmpl = replace_query_param(url_tmpl, self.page_size_query_param, self.per_page)
-        return url_tmpl
+        return self.link_template.url
 
     def get_page_link(self, page: typing.Any = 1) -> typing.Optional[str]:
         if page:
-            return replace_query_param(self.base_url, self.page_query_param, page)
+            return self.link_template.get_link(self.page_query_param, page)
 
     def get_paginated_response(self, data: typing.Sequence[typing.Any]) -> ResponseWithMeta:
         meta = {
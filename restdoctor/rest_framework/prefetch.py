@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import collections
+import copy
+import dataclasses
+import functools
+import logging
+import threading
+import time
+import typing
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib import parse
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse, QueryDict
+from django.utils.functional import SimpleLazyObject
+
+from restdoctor.rest_framework.pagination.links import PageLinkTemplate
+from restdoctor.utils.concurrency import in_atomic_block, run_in_worker
+
+if typing.TYPE_CHECKING:
+    from rest_framework.request import Request
+    from rest_framework.views import APIView
+
+    from django.contrib.auth.models import AbstractBaseUser
+
+    PrefetchKey = typing.Tuple[typing.Any, ...]
+
+logger = logging.getLogger(__name__)
+
+# Per-user headers like Set-Cookie are not replayed, cache and Vary headers are set again by
+# finalize_response when the prefetched response is served.
+PREFETCH_RESPONSE_HEADERS = ('Content-Type', 'Content-Language')
+
+_executor: typing.Optional[ThreadPoolExecutor] = None
+_pending_slots: typing.Optional[threading.BoundedSemaphore] = None
+_prefetch_cache: typing.Optional[PrefetchCache] = None
+_lock = threading.Lock()
+
+
+@dataclasses.dataclass(frozen=True)
+class PrefetchedResponse:
+    content: bytes
+    status: int
+    headers: typing.Tuple[typing.Tuple[str, str], ...]
+    next_url: typing.Optional[str]
+    expires_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+
+class PrefetchCache:
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.entries: typing.OrderedDict[PrefetchKey, PrefetchedResponse] = collections.OrderedDict()
+        self.stats = collections.Counter({'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0, 'errors': 0, 'skipped': 0})
+        self.lock = threading.Lock()
+
+    def get(self, key: PrefetchKey) -> typing.Optional[PrefetchedResponse]:
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry.size
+            if entry is None or entry.expires_at < time.monotonic():
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            return entry
+
+    def set(self, key: PrefetchKey, entry: PrefetchedResponse) -> None:  # noqa: A003
+        if entry.size > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous.size
+            while self.entries and self.size + entry.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= evicted.size
+                self.stats['evicted'] += 1
+            self.entries[key] = entry
+            self.size += entry.size
+            self.stats['stored'] += 1
+
+    def record_error(self) -> None:
+        with self.lock:
+            self.stats['errors'] += 1
+
+    def record_skipped(self) -> None:
+        with self.lock:
+            self.stats['skipped'] += 1
+
+    def get_stats(self) -> typing.Dict[str, typing.Any]:
+        with self.lock:
+            stats: typing.Dict[str, typing.Any] = dict(self.stats)
+            stats['entries'] = len(self.entries)
+            stats['size'] = self.size
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+def get_prefetch_cache() -> PrefetchCache:
+    global _prefetch_cache
+
+    if _prefetch_cache is None:
+        with _lock:
+            if _prefetch_cache is None:
+                _prefetch_cache = PrefetchCache(
+                    max_bytes=settings.API_PREFETCH_CACHE_MAX_BYTES,
+                    ttl=settings.API_PREFETCH_CACHE_TTL,
+                )
+    return _prefetch_cache
+
+
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.API_PREFETCH_MAX_WORKERS,
+                    thread_name_prefix='restdoctor-prefetch',
+                )
+    return _executor
+
+
+def get_prefetch_pending_slots() -> threading.BoundedSemaphore:
+    # Executor queue is unbounded, queued jobs hold built requests, so pending jobs are limited.
+    global _pending_slots
+
+    if _pending_slots is None:
+        with _lock:
+            if _pending_slots is None:
+                _pending_slots = threading.BoundedSemaphore(settings.API_PREFETCH_MAX_PENDING)
+    return _pending_slots
+
+
+def get_prefetch_stats() -> typing.Dict[str, typing.Any]:
+    return get_prefetch_cache().get_stats()
+
+
+def get_prefetch_key(request: Request, url: str) -> PrefetchKey:
+    user = getattr(request, 'user', None)
+    user_key = user.pk if user is not None and user.is_authenticated else None
+    api_params = getattr(request, 'api_params', None)
+    return (
+        user_key,
+        PageLinkTemplate(url).url,
+        getattr(api_params, 'format', None),
+        getattr(api_params, 'version', None),
+    )
+
+
+def get_prefetched_response(view: APIView, request: Request) -> typing.Optional[HttpResponse]:
+    entry = get_prefetch_cache().get(get_prefetch_key(request, request.build_absolute_uri()))
+    if entry is None:
+        return None
+
+    if entry.next_url:
+        schedule_prefetch(view, request, entry.next_url)
+    response = HttpResponse(entry.content, status=entry.status)
+    for header, value in entry.headers:
+        response[header] = value
+    return response
+
+
+def schedule_next_page_prefetch(view: APIView, request: Request) -> typing.Optional[Future]:
+    get_next_page_link = getattr(view.paginator, 'get_next_page_link', None)
+    next_url = get_next_page_link() if get_next_page_link else None
+    if next_url is None:
+        return None
+    return schedule_prefetch(view, request, next_url)
+
+
+def is_prefetch_request(request: typing.Union[HttpRequest, Request]) -> bool:
+    return getattr(request, 'is_prefetch', False)
+
+
+def schedule_prefetch(view: APIView, request: Request, url: str) -> typing.Optional[Future]:
+    # Prefetch workers use their own DB connections and would not see uncommitted data.
+    if in_atomic_block():
+        return None
+    pending_slots = get_prefetch_pending_slots()
+    if not pending_slots.acquire(blocking=False):
+        get_prefetch_cache().record_skipped()
+        return None
+
+    # The worker gets a new view and request built from immutable inputs of the live request only,
+    # the user is loaded again by its primary key.
+    prefetch_key = get_prefetch_key(request, url)
+    prefetch_request = build_prefetch_request(request, url)
+    view_class, view_initkwargs = view.__class__, getattr(view, 'view_initkwargs', {})
+    action_map = dict(getattr(view, 'action_map', None) or {})
+    view_args, view_kwargs = tuple(view.args), dict(view.kwargs)
+    prefetch_job = functools.partial(
+        prefetch,
+        functools.partial(build_prefetch_view, view_class, view_initkwargs, action_map),
+        prefetch_request,
+        prefetch_key,
+        view_args,
+        view_kwargs,
+    )
+    try:
+        future = get_prefetch_executor().submit(lambda: run_in_worker(prefetch_job))
+    except RuntimeError:
+        pending_slots.release()
+        raise
+    future.add_done_callback(lambda _: pending_slots.release())
+    return future
+
+
+def get_prefetch_user(user_pk: typing.Any) -> typing.Union[AbstractBaseUser, AnonymousUser]:
+    if user_pk is None:
+        return AnonymousUser()
+    user_model = get_user_model()
+    try:
+        return user_model._default_manager.get(pk=user_pk)
+    except user_model.DoesNotExist:
+        return AnonymousUser()
+
+
+def build_prefetch_request(request: Request, url: str) -> HttpRequest:
+    source_request = request._request
+    query = parse.urlsplit(url).query
+    prefetch_request = HttpRequest()
+    prefetch_request.method = 'GET'
+    prefetch_request.path = source_request.path
+    prefetch_request.path_info = source_request.path_info
+    prefetch_request.META = {
+        key: value for key, value in source_request.META.items() if isinstance(value, str)
+    }
+    prefetch_request.META['REQUEST_METHOD'] = 'GET'
+    prefetch_request.META['QUERY_STRING'] = query
+    prefetch_request.GET = QueryDict(query)
+    # Views skip logging, profiling and memory tracking for pages, which no client asked for yet.
+    prefetch_request.is_prefetch = True
+    for attribute in ('urlconf', 'api_params'):
+        if hasattr(source_request, attribute):
+            setattr(prefetch_request, attribute, copy.copy(getattr(source_request, attribute)))
+    user = getattr(request, 'user', None)
+    user_pk = user.pk if user is not None and user.is_authenticated else None
+    prefetch_request.user = SimpleLazyObject(functools.partial(get_prefetch_user, user_pk))
+    return prefetch_request
+
+
+def build_prefetch_view(
+    view_class: typing.Type[APIView],
+    view_initkwargs: typing.Dict[str, typing.Any],
+    action_map: typing.Dict[str, str],
+) -> APIView:
+    prefetch_view = view_class(**view_initkwargs)
+    prefetch_view.prefetch_next_page = False
+    if action_map:
+        prefetch_view.action_map = action_map
+        for method, action in action_map.items():
+            setattr(prefetch_view, method, getattr(prefetch_view, action))
+    return prefetch_view
+
+
+def prefetch(
+    get_view: typing.Callable[[], APIView],
+    request: HttpRequest,
+    prefetch_key: PrefetchKey,
+    view_args: typing.Tuple[typing.Any, ...],
+    view_kwargs: typing.Dict[str, typing.Any],
+) -> None:
+    cache = get_prefetch_cache()
+    try:
+        view = get_view()
+        view.args, view.kwargs = view_args, view_kwargs
+        response = view.dispatch(request, *view_args, **view_kwargs)
+        response.render()
+    except Exception:
+        cache.record_error()
+        logger.warning('Next page prefetch failed', exc_info=True)
+        return
+
+    if response.status_code != 200:
+        return
+    get_next_page_link = getattr(view.paginator, 'get_next_page_link', None)
+    entry = PrefetchedResponse(
+        content=response.content,
+        status=response.status_code,
+        headers=tuple(
+            (header, response[header]) for header in PREFETCH_RESPONSE_HEADERS if response.has_header(header)
+        ),
+        next_url=get_next_page_link() if get_next_page_link else None,
+        expires_at=time.monotonic() + cache.ttl,
+    )
+    cache.set(prefetch_key, entry)
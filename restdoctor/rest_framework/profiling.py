@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import contextvars
+import time
+import typing
+
+from django.db import connections
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+if typing.TYPE_CHECKING:
+    from rest_framework.fields import Field
+    from rest_framework.serializers import Serializer
+
+_serializer_profile: contextvars.ContextVar[typing.Optional[SerializerProfile]] = contextvars.ContextVar(
+    'restdoctor_serializer_profile', default=None
+)
+
+
+class SerializerProfile:
+    """Time and DB queries of serializer fields, aggregated by field path over all represented
+    instances. Field time includes time of its nested fields."""
+
+    def __init__(self) -> None:
+        self.stats: typing.DefaultDict[str, typing.List[float]] = collections.defaultdict(
+            lambda: [0, 0.0, 0]
+        )
+        self.path: typing.List[str] = []
+        self.queries = 0
+        self.instances = 0
+
+    def __call__(
+        self, execute: typing.Callable, sql: str, params: typing.Any, many: bool, context: typing.Any,
+    ) -> typing.Any:
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def to_representation(self, serializer: Serializer, instance: typing.Any) -> typing.Dict[str, typing.Any]:
+        # Same as DRF Serializer.to_representation with each field measured.
+        if not self.path:
+            self.instances += 1
+        ret = collections.OrderedDict()
+        for field in serializer._readable_fields:
+            self.path.append(field.field_name)
+            started_at, queries = time.perf_counter(), self.queries
+            try:
+                ret[field.field_name] = self.represent_field(field, instance)
+            except SkipField:
+                continue
+            finally:
+                field_stats = self.stats['.'.join(self.path)]
+                field_stats[0] += 1
+                field_stats[1] += time.perf_counter() - started_at
+                field_stats[2] += self.queries - queries
+                self.path.pop()
+        return ret
+
+    def represent_field(self, field: Field, instance: typing.Any) -> typing.Any:
+        attribute = field.get_attribute(instance)
+        check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+        if check_for_none is None:
+            return None
+        return field.to_representation(attribute)
+
+    def get_fields(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        return [
+            {
+                'field': path,
+                'calls': calls,
+                'time_ms': round(duration * 1000, 3),
+                'queries': queries,
+            }
+            for path, (calls, duration, queries) in sorted(
+                self.stats.items(), key=lambda item: item[1][1], reverse=True,
+            )
+        ]
+
+
+def get_serializer_profile() -> typing.Optional[SerializerProfile]:
+    return _serializer_profile.get()
+
+
+@contextlib.contextmanager
+def profile_serializers() -> typing.Iterator[SerializerProfile]:
+    profile = SerializerProfile()
+    token = _serializer_profile.set(profile)
+    try:
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            yield profile
+    finally:
+        _serializer_profile.reset(token)
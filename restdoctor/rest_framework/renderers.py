@@ -3,6 +3,8 @@ import typing
 
 from rest_framework.renderers import JSONRenderer
 
+from restdoctor.utils.timing import stage_timer
+
 if typing.TYPE_CHECKING:
     from restdoctor.utils.custom_types import GenericContext
     from restdoctor.utils.media_type import APIParams
@@ -35,4 +37,5 @@ class RestDoctorRenderer(JSONRenderer):
                 **renderer_context.get('kwargs', {}),
             }
 
-        return super().render(result, accepted_media_type, renderer_context)
+        with stage_timer('render'):
+            return super().render(result, accepted_media_type, renderer_context)
@@ -1,39 +1,61 @@
 from __future__ import annotations
 
 import collections
+import copy
+import dataclasses
 import functools
+import importlib
 import inspect
+import itertools
 import logging
+import threading
+import types
 import typing
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.db.models import Manager, QuerySet
-from django.http import Http404
-from rest_framework.exceptions import MethodNotAllowed, NotFound
-
+from django.http import Http404, HttpResponse
+from django.utils import translation
+from rest_framework.exceptions import APIException, MethodNotAllowed, NotFound
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.status import HTTP_404_NOT_FOUND, HTTP_405_METHOD_NOT_ALLOWED
+
+from restdoctor.constants import DEFAULT_ERROR_RESPONSES_CACHE_SIZE
 from restdoctor.rest_framework.generics import GenericAPIView
 from restdoctor.rest_framework.pagination import PageNumberPagination
+from restdoctor.rest_framework.response import ResponseWithMeta
 from restdoctor.rest_framework.schema import ResourceSchema
 from restdoctor.rest_framework.viewsets import GenericViewSet
+from restdoctor.utils.tracing import trace_span
 
 if typing.TYPE_CHECKING:
     from django.core.handlers.wsgi import WSGIRequest
     from rest_framework.pagination import BasePagination
-    from rest_framework.response import Response
+    from rest_framework.request import Request
+    from rest_framework.serializers import BaseSerializer
 
     from restdoctor.rest_framework.custom_types import (
         ActionMap,
+        ErrorResponseKey,
+        FrozenResourceActionsMap,
         Handler,
         ResourceActionsMap,
+        ResourceDispatchTable,
         ResourceExtraAction,
         ResourceHandlersMap,
         ResourceModelsMap,
         ResourceViewsMap,
+        ViewSetFunction,
     )
 
 logger = logging.getLogger(__name__)
 
+MULTI_RESOURCE_SEPARATOR = ','
+# Only headers set by negotiation are replayed, headers of the first request may be specific to it.
+ERROR_RESPONSE_HEADERS = ('Content-Type', 'Vary', 'Allow', 'Content-Language')
+
 
 def _is_extra_action(attr: typing.Any) -> bool:
     return hasattr(attr, 'mapping')
@@ -60,10 +82,155 @@ def merge_actions(handlers_actions: typing.Sequence[typing.Optional[ActionMap]])
     return actions
 
 
-def filter_actions_by_handlers(action_map: ActionMap, handlers: typing.Set[str]) -> ActionMap:
+def filter_actions_by_handlers(action_map: ActionMap, handlers: typing.AbstractSet[str]) -> ActionMap:
     return {action: handler for action, handler in action_map.items() if handler in handlers}
 
 
+def get_select_related_lookups(
+    select_related: typing.Dict[str, typing.Any], prefix: str = '',
+) -> typing.Iterator[str]:
+    for field, nested in select_related.items():
+        lookup = f'{prefix}{field}'
+        if nested:
+            yield from get_select_related_lookups(nested, prefix=f'{lookup}__')
+        else:
+            yield lookup
+
+
+def get_resource_filters(view: GenericAPIView) -> typing.Tuple[typing.Any, ...]:
+    # Resources requested together are served from the first resource queryset, so every resource
+    # view has to select the same rows: same filtered WHERE clause and same object lookup.
+    return (
+        view.filter_queryset(view.get_queryset()).query.where,
+        view.lookup_field,
+        view.lookup_url_kwarg,
+        view.lookup_fields,
+    )
+
+
+def merge_related_lookups(queryset: QuerySet, querysets: typing.Iterable[QuerySet]) -> QuerySet:
+    for other in querysets:
+        lookups = [
+            lookup for lookup in other._prefetch_related_lookups
+            if lookup not in queryset._prefetch_related_lookups
+        ]
+        if lookups:
+            queryset = queryset.prefetch_related(*lookups)
+        if queryset.query.select_related is True:
+            continue
+        if other.query.select_related is True:
+            queryset = queryset.select_related()
+        elif other.query.select_related:
+            queryset = queryset.select_related(
+                *get_select_related_lookups(other.query.select_related)
+            )
+    return queryset
+
+
+def freeze_actions_map(resource_actions_map: ResourceActionsMap) -> FrozenResourceActionsMap:
+    return types.MappingProxyType(
+        {resource: frozenset(actions) for resource, actions in resource_actions_map.items()}
+    )
+
+
+def iter_subclasses(cls: type) -> typing.Iterator[type]:
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from iter_subclasses(subclass)
+
+
+def get_error_response_key(
+    request: WSGIRequest, status_code: int, kwargs: typing.Dict[str, typing.Any],
+) -> ErrorResponseKey:
+    api_params = getattr(request, 'api_params', None)
+    format_override = api_settings.URL_FORMAT_OVERRIDE
+    return (
+        status_code,
+        request.method,
+        request.META.get('HTTP_ACCEPT'),
+        request.GET.get(format_override) if format_override else None,
+        kwargs.get(api_settings.FORMAT_SUFFIX_KWARG),
+        getattr(api_params, 'version', None),
+        getattr(api_params, 'format', None),
+        translation.get_language(),
+    )
+
+
+class ErrorResponseCache:
+    """Rendered 404/405 bodies of a resource view, keyed by everything negotiation depends on.
+
+    Keeps at most `max_size` least recently used responses.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_ERROR_RESPONSES_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.responses: typing.OrderedDict[
+            ErrorResponseKey, typing.Tuple[bytes, typing.Tuple[typing.Tuple[str, str], ...]]
+        ] = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_response(
+        self, key: ErrorResponseKey, get_response: typing.Callable[[], Response],
+    ) -> typing.Union[Response, HttpResponse]:
+        status_code = key[0]
+        with self.lock:
+            cached = self.responses.get(key)
+            if cached is not None:
+                self.responses.move_to_end(key)
+        if cached is None:
+            response = get_response()
+            response.render()
+            if response.status_code == status_code and self.max_size > 0:
+                with self.lock:
+                    self.responses[key] = (
+                        response.content,
+                        tuple(
+                            (header, response[header])
+                            for header in ERROR_RESPONSE_HEADERS
+                            if response.has_header(header)
+                        ),
+                    )
+                    while len(self.responses) > self.max_size:
+                        self.responses.popitem(last=False)
+            return response
+
+        content, headers = cached
+        response = HttpResponse(content, status=status_code)
+        for header, value in headers:
+            response[header] = value
+        return response
+
+
+@dataclasses.dataclass(frozen=True)
+class ResourceRegistryEntry:
+    actions_map: FrozenResourceActionsMap
+    action_methods: typing.Tuple[str, ...] = ()
+    resources_actions: typing.Tuple[ResourceExtraAction, ...] = ()
+    resources_extra_actions: typing.Tuple[ResourceExtraAction, ...] = ()
+
+
+class ResourceRegistry:
+    def __init__(self) -> None:
+        self.entries: typing.Dict[type, ResourceRegistryEntry] = {}
+        self.lock = threading.Lock()
+
+    def get(self, resource_class: typing.Type[ResourceBase]) -> ResourceRegistryEntry:
+        entry = self.entries.get(resource_class)
+        if entry is None:
+            with self.lock:
+                entry = self.entries.get(resource_class)
+                if entry is None:
+                    entry = resource_class.build_registry_entry()
+                    self.entries[resource_class] = entry
+        return entry
+
+    def preload(self, urlconfs: typing.Iterable[str] = ()) -> None:
+        for urlconf in urlconfs:
+            importlib.import_module(urlconf)
+        for resource_class in iter_subclasses(ResourceBase):
+            self.get(resource_class)
+
+
 class ResourceBase:
     schema_class = ResourceSchema
 
@@ -88,7 +255,11 @@ class ResourceBase:
         }
 
     @classmethod
-    def get_resource_actions(cls) -> ResourceActionsMap:
+    def get_resource_actions(cls) -> FrozenResourceActionsMap:
+        return resource_registry.get(cls).actions_map
+
+    @classmethod
+    def collect_resource_actions(cls) -> ResourceActionsMap:
         if not cls.resource_actions_map:
             return {
                 resource: set(view.action_map.values())
@@ -98,6 +269,11 @@ class ResourceBase:
 
         return cls.resource_actions_map
 
+    @classmethod
+    def build_registry_entry(cls) -> ResourceRegistryEntry:
+        cls.validate_queryset_models()
+        return ResourceRegistryEntry(actions_map=freeze_actions_map(cls.collect_resource_actions()))
+
     @classmethod
     def as_view(cls, **initkwargs: typing.Any) -> typing.Any:
         cls.check_queryset_models()
@@ -106,8 +282,12 @@ class ResourceBase:
         return view
 
     @classmethod
-    @functools.lru_cache
     def check_queryset_models(cls) -> bool:
+        resource_registry.get(cls)
+        return True
+
+    @classmethod
+    def validate_queryset_models(cls) -> None:
         warnings: typing.List[str] = []
         errors: typing.List[str] = []
         models_map = get_queryset_model_map(cls.resource_views_map)
@@ -128,7 +308,6 @@ class ResourceBase:
             logger.warning(warning)
         if errors:
             raise ImproperlyConfigured(','.join(errors))
-        return True
 
     def get_discriminant(self, request: WSGIRequest) -> str:
         try:
@@ -155,16 +334,21 @@ class ResourceBase:
 
         resource_dispatch = self.resource_handlers_map.get(discriminant)
         if resource_dispatch:
-            return resource_dispatch(request, *args, **kwargs)
+            request.api_resource = discriminant
+            with trace_span('restdoctor.resource_dispatch', **{'api.resource': discriminant}):
+                return resource_dispatch(request, *args, **kwargs)
         raise Http404()
 
 
 class ResourceViewSet(ResourceBase, GenericViewSet):
     pagination_class: typing.Optional[BasePagination] = PageNumberPagination
+    cache_error_responses = True
+    authenticate_error_responses = False
+    multi_resource_actions: typing.Sequence[str] = ('list', 'retrieve')
 
     def __init__(
         self,
-        resource_handlers_map: typing.Dict[str, Handler] = None,
+        resource_handlers_map: ResourceHandlersMap = None,
         *args: typing.Any,
         **kwargs: typing.Any,
     ) -> None:
@@ -183,7 +367,7 @@ class ResourceViewSet(ResourceBase, GenericViewSet):
         resource_handlers = {}
         for resource, viewset in cls.resource_views_map.items():
             resource_actions = filter_actions_by_handlers(
-                actions, resource_actions_map.get(resource, set())
+                actions, resource_actions_map.get(resource, frozenset())
             )
             if resource_actions:
                 resource_handlers[resource] = viewset.as_view(
@@ -194,27 +378,95 @@ class ResourceViewSet(ResourceBase, GenericViewSet):
     @classmethod
     def as_view(cls, actions: ActionMap = None, **initkwargs: typing.Any) -> typing.Any:
         initkwargs['actions'] = actions
-        return super().as_view(**initkwargs)
+        view = super().as_view(**initkwargs)
+        if cls.dispatch is not ResourceViewSet.dispatch:
+            return view
+        return cls.get_resource_dispatcher(view)
 
     @classmethod
-    def get_resource_actions_map(cls) -> ResourceActionsMap:
-        if not cls.resource_actions_map:
-            resource_actions_map = collections.defaultdict(set)
+    def get_dispatch_table(
+        cls, actions: ActionMap, resource_handlers_map: ResourceHandlersMap,
+    ) -> ResourceDispatchTable:
+        actions = dict(actions)
+        if 'get' in actions and 'head' not in actions:
+            actions['head'] = actions['get']
 
-            for actions_list_func in cls.resources_actions, cls.resources_extra_actions:
-                for resource, name, _ in actions_list_func():
-                    resource_actions_map[resource].add(name)
+        resource_actions_map = cls.get_resource_actions_map()
+        dispatch_table = {}
+        for resource, handler in resource_handlers_map.items():
+            resource_actions = resource_actions_map.get(resource, frozenset())
+            for method, action in actions.items():
+                if action in resource_actions:
+                    dispatch_table[(resource, method)] = handler
+        return dispatch_table
 
-            cls.resource_actions_map = resource_actions_map
-        return cls.resource_actions_map
+    @classmethod
+    def get_resource_dispatcher(cls, view: ViewSetFunction) -> Handler:
+        # Successful requests go straight to the resource viewset without instantiating this class,
+        # unknown discriminants and methods fall back to the full view to render 404/405.
+        # get_discriminant is called on a shallow copy of the prepared instance, so state it sets
+        # on the view is never shared between requests.
+        dispatch_table = cls.get_dispatch_table(
+            view.actions or {}, view.initkwargs['resource_handlers_map']
+        )
+        discriminator = cls(**view.initkwargs)
+        resource_actions_map = cls.get_resource_actions_map()
+        error_responses = None
+        if cls.cache_error_responses and not cls.authenticate_error_responses:
+            error_responses = ErrorResponseCache()
+
+        @functools.wraps(view)
+        def resource_view(request: WSGIRequest, *args: typing.Any, **kwargs: typing.Any) -> Response:
+            discriminant = copy.copy(discriminator).get_discriminant(request)
+            handler = dispatch_table.get((discriminant, request.method.lower()))
+            if handler is not None:
+                request.api_resource = discriminant
+                with trace_span('restdoctor.resource_dispatch', **{'api.resource': discriminant}):
+                    return handler(request, *args, **kwargs)
+            if error_responses is None or MULTI_RESOURCE_SEPARATOR in discriminant:
+                return view(request, *args, **kwargs)
+
+            if discriminant in resource_actions_map:
+                status_code = HTTP_405_METHOD_NOT_ALLOWED
+            else:
+                status_code = HTTP_404_NOT_FOUND
+            return error_responses.get_response(
+                get_error_response_key(request, status_code, kwargs),
+                lambda: view(request, *args, **kwargs),
+            )
+
+        return resource_view
 
     @classmethod
-    def get_action_methods(cls) -> typing.List[str]:
-        available_methods_set = set()
-        for action_map in cls.get_resource_actions_map().values():
-            available_methods_set.update(action_map)
+    def get_resource_actions_map(cls) -> FrozenResourceActionsMap:
+        return resource_registry.get(cls).actions_map
 
-        return list(available_methods_set)
+    @classmethod
+    def collect_resource_actions(cls) -> ResourceActionsMap:
+        if cls.resource_actions_map:
+            return cls.resource_actions_map
+
+        resource_actions_map = collections.defaultdict(set)
+        for resource, name, _ in itertools.chain(
+            cls.gen_resources_actions(), cls.gen_resources_extra_actions()
+        ):
+            resource_actions_map[resource].add(name)
+        return resource_actions_map
+
+    @classmethod
+    def build_registry_entry(cls) -> ResourceRegistryEntry:
+        entry = super().build_registry_entry()
+        action_methods = set(itertools.chain.from_iterable(entry.actions_map.values()))
+        return dataclasses.replace(
+            entry,
+            action_methods=tuple(sorted(action_methods)),
+            resources_actions=tuple(cls.gen_resources_actions()),
+            resources_extra_actions=tuple(cls.gen_resources_extra_actions()),
+        )
+
+    @classmethod
+    def get_action_methods(cls) -> typing.List[str]:
+        return list(resource_registry.get(cls).action_methods)
 
     @classmethod
     def gen_resources_actions(cls) -> typing.Iterator[ResourceExtraAction]:
@@ -226,9 +478,8 @@ class ResourceViewSet(ResourceBase, GenericViewSet):
                     yield resource, name, handler
 
     @classmethod
-    @functools.lru_cache
-    def resources_actions(cls) -> typing.List[ResourceExtraAction]:
-        return list(cls.gen_resources_actions())
+    def resources_actions(cls) -> typing.Tuple[ResourceExtraAction, ...]:
+        return resource_registry.get(cls).resources_actions
 
     @classmethod
     def gen_resources_extra_actions(cls) -> typing.Iterator[ResourceExtraAction]:
@@ -237,9 +488,8 @@ class ResourceViewSet(ResourceBase, GenericViewSet):
                 yield resource, name, handler
 
     @classmethod
-    @functools.lru_cache
-    def resources_extra_actions(cls) -> typing.List[ResourceExtraAction]:
-        return list(cls.gen_resources_extra_actions())
+    def resources_extra_actions(cls) -> typing.Tuple[ResourceExtraAction, ...]:
+        return resource_registry.get(cls).resources_extra_actions
 
     @classmethod
     def get_extra_actions(cls) -> typing.List[Handler]:
@@ -250,7 +500,11 @@ class ResourceViewSet(ResourceBase, GenericViewSet):
 
         method = request.method.lower()
         action = self.action_map.get(method)
-        actions = self.resource_actions_map.get(discriminator)
+        resources = self.get_multi_resources(discriminator, action)
+        if resources and action:
+            return self.multi_resource_dispatch(resources, action, request, *args, **kwargs)
+
+        actions = self.get_resource_actions_map().get(discriminator)
         if actions is None:
             exc = NotFound()
         elif action in actions:
@@ -259,11 +513,123 @@ class ResourceViewSet(ResourceBase, GenericViewSet):
             exc = MethodNotAllowed(request.method)
         return self.exception_response(exc, request, *args, **kwargs)
 
+    def get_multi_resources(
+        self, discriminator: str, action: typing.Optional[str],
+    ) -> typing.Optional[typing.List[str]]:
+        if action not in self.multi_resource_actions or MULTI_RESOURCE_SEPARATOR not in discriminator:
+            return None
+
+        resources = list(dict.fromkeys(discriminator.split(MULTI_RESOURCE_SEPARATOR)))
+        resource_actions_map = self.get_resource_actions_map()
+        if all(
+            action in resource_actions_map.get(resource, ()) and resource in self.resource_handlers_map
+            for resource in resources
+        ):
+            return resources
+        return None
+
+    def get_resource_view(
+        self, resource: str, action: str, request: WSGIRequest, *args: typing.Any, **kwargs: typing.Any,
+    ) -> GenericAPIView:
+        handler = self.resource_handlers_map[resource]
+        view = handler.cls(**handler.initkwargs)
+        view.action_map = handler.actions
+        view.action = action
+        view.request = request
+        view.args = args
+        view.kwargs = kwargs
+        return view
+
+    def multi_resource_dispatch(
+        self, resources: typing.List[str], action: str, request: WSGIRequest,
+        *args: typing.Any, **kwargs: typing.Any,
+    ) -> Response:
+        # The first resource view authenticates, negotiates and paginates, the page is evaluated
+        # once and serialized by every requested resource into a response keyed by resource.
+        views = {
+            resource: self.get_resource_view(resource, action, request, *args, **kwargs)
+            for resource in resources
+        }
+        primary = views[resources[0]]
+        request = primary.initialize_request(request, *args, **kwargs)
+        primary.request = request
+        primary.headers = primary.default_response_headers
+        try:
+            primary.initial(request, *args, **kwargs)
+            for view in views.values():
+                view.request = request
+                view.format_kwarg = primary.format_kwarg
+                view.check_permissions(request)
+            if action == 'list':
+                response = self.list_resources(views, request)
+            else:
+                response = self.retrieve_resources(views, request)
+        except Exception as exc:
+            response = primary.handle_exception(exc)
+        primary.response = primary.finalize_response(request, response, *args, **kwargs)
+        return primary.response
+
+    def prepare_resource_views(
+        self, views: typing.Dict[str, GenericAPIView], request: Request,
+    ) -> typing.Tuple[GenericAPIView, BaseSerializer]:
+        primary, *others = views.values()
+        primary_filters = get_resource_filters(primary)
+        if any(get_resource_filters(view) != primary_filters for view in others):
+            raise NotFound()
+        queryset = merge_related_lookups(
+            primary.get_queryset(), [view.get_queryset() for view in others]
+        )
+        primary.get_queryset = queryset.all
+
+        request_serializer = primary.get_request_serializer(
+            data=request.query_params, use_default=False
+        )
+        request_serializer.is_valid(raise_exception=True)
+        return primary, request_serializer
+
+    def list_resources(
+        self, views: typing.Dict[str, GenericAPIView], request: Request,
+    ) -> ResponseWithMeta:
+        primary, request_serializer = self.prepare_resource_views(views, request)
+        collection = primary.get_collection(request_serializer)
+        meta = primary.get_meta_serializer_data()
+        page = primary.paginate_queryset(collection)
+        items = list(collection if page is None else page)
+
+        data = {}
+        for resource, view in views.items():
+            prepare_items = view.perform_list(items, request_data=request_serializer.validated_data)
+            data[resource] = view.get_serializer(prepare_items, many=True).data
+
+        if page is None:
+            return ResponseWithMeta(data=data, meta=meta)
+        response = primary.get_paginated_response(data)
+        response.meta.update(meta)
+        return response
+
+    def retrieve_resources(
+        self, views: typing.Dict[str, GenericAPIView], request: Request,
+    ) -> Response:
+        primary, request_serializer = self.prepare_resource_views(views, request)
+        item = primary.get_item(request_serializer)
+
+        data = {}
+        for resource, view in views.items():
+            if view is not primary:
+                view.check_object_permissions(request, item)
+            data[resource] = view.get_serializer(view.perform_retrieve(item)).data
+        return Response(data)
+
     def exception_response(
         self, exc: Exception, request: WSGIRequest, *args: typing.Any, **kwargs: typing.Any
     ) -> Response:
         request = self.initialize_request(request, *args, **kwargs)
         self.headers = self.default_response_headers
+        if self.authenticate_error_responses:
+            try:
+                self.perform_authentication(request)
+            except APIException as auth_exc:
+                exc = auth_exc
         response = self.handle_exception(exc)
         return self.finalize_response(request, response, *args, **kwargs)
 
@@ -279,3 +645,6 @@ class ResourceView(ResourceBase, GenericAPIView):
         if actions:
             view.actions = actions
         return view
+
+
+resource_registry = ResourceRegistry()
@@ -40,6 +40,7 @@ from rest_framework.serializers import BaseSerializer, ListSerializer, ModelSeri
 from rest_framework.settings import api_settings
 from semver import VersionInfo
 
+from restdoctor.rest_framework.fields import BatchMethodField
 from restdoctor.rest_framework.schema.custom_types import (
     FieldSchemaBase,
     FieldSchemaProtocol,
@@ -97,11 +98,14 @@ class FieldSchema(FieldSchemaBase):
         serializer_name = field_wrapper.parent.__class__.__name__
         try:
             return_annotation = typing.get_type_hints(
-                getattr(field_wrapper.parent, f'get_{field_name}')
+                getattr(field_wrapper.parent, field_wrapper.method_name)
             )['return']
         except NameError:
             # We don't see types included with TYPE_CHECKING == True
             return
+        if isinstance(field_wrapper, BatchMethodField):
+            # Batch method returns mapping, field value type is the mapping value type
+            return_annotation = typing.get_args(return_annotation)[-1]
         field_allow_null = getattr(field, 'allow_null', True)
         if field_allow_null ^ is_optional_type(return_annotation):
             raise ImproperlyConfigured(
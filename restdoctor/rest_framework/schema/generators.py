@@ -16,6 +16,7 @@ from restdoctor.rest_framework.schema.openapi import RestDoctorSchema
 from restdoctor.rest_framework.schema.refs_registry import LocalRefsRegistry
 from restdoctor.utils.api_format import get_available_format
 from restdoctor.utils.media_type import parse_accept
+from restdoctor.utils.tracing import trace_span
 from restdoctor.utils.yaml_utils import enum_representer
 
 if typing.TYPE_CHECKING:
@@ -160,7 +161,12 @@ class RefsSchemaGenerator(SchemaGenerator):
             self.get_error_schema(description='Ресурс не найден.'),
         )
 
-        paths = self.get_paths(None if public else request)
+        with trace_span(
+            'restdoctor.schema_generation',
+            **{'api.version': self.api_version, 'openapi.version': str(self.openapi_version)},
+        ) as span:
+            paths = self.get_paths(None if public else request)
+            span.set_attribute('api.paths', len(paths or {}))
         if not paths:
             return None
 
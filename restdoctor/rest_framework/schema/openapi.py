@@ -445,8 +445,44 @@ class RestDoctorSchema(ViewSchemaBase, AutoSchema):
                 if '$ref' not in action_schema or self.generator:
                     schema[code] = self.get_content_schema(action_schema, description=description)
 
+        response_headers = self.get_response_headers(path, method)
+        if response_headers:
+            for code, response_schema in schema.items():
+                if code < '400' and '$ref' not in response_schema:
+                    response_schema['headers'] = response_headers
+
         return schema
 
+    def get_response_headers(self, path: str, method: str) -> OpenAPISchema:
+        get_cache_control = getattr(self.view, 'get_cache_control', None)
+        if method.upper() not in {'GET', 'HEAD'} or get_cache_control is None:
+            return {}
+        cache_control = get_cache_control(
+            action=get_action(path, method, self.view), api_format=settings.API_DEFAULT_FORMAT
+        )
+        if cache_control is None:
+            return {}
+
+        headers = {
+            'Cache-Control': {
+                'description': 'Политика кеширования ответа.',
+                'schema': {'type': 'string'},
+                'example': cache_control.get_header(),
+            },
+        }
+        if cache_control.max_age is not None:
+            headers['Expires'] = {
+                'description': f'Время устаревания ответа: текущее время + {cache_control.max_age} с.',
+                'schema': {'type': 'string'},
+            }
+        if cache_control.vary:
+            headers['Vary'] = {
+                'description': 'Заголовки запроса, от которых зависит ответ.',
+                'schema': {'type': 'string'},
+                'example': ', '.join(cache_control.vary),
+            }
+        return headers
+
     def get_tags(self, path: str, method: str) -> typing.List[str]:
         view = self.view
 
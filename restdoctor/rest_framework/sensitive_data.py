@@ -3,9 +3,12 @@ from __future__ import annotations
 import contextlib
 import copy
 import inspect
+import itertools
+import threading
 import typing
+import warnings
+import weakref
 
-from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.db.models import Model
 from rest_framework.fields import SerializerMethodField
 from rest_framework.serializers import Serializer, ListSerializer
@@ -17,6 +20,34 @@ if typing.TYPE_CHECKING:
     SensitiveDataConfig = typing.Dict[str, typing.Any]
     SensitiveDataConfigValue = typing.Union[bool, SensitiveDataConfig]
     SerializerData = typing.Union[typing.Dict[str, typing.Any], typing.List[typing.Dict[str, typing.Any]]]
+    # Pairs of field name and True or nested plan, mypy does not support recursive aliases.
+    SensitiveDataPlan = typing.Tuple[typing.Tuple[str, typing.Any], ...]
+    MaskChild = typing.Tuple[typing.Any, typing.Any, typing.Any]
+
+
+class SensitiveDataPlanCache:
+    # Keys are weak, so a redefined serializer class gets its own plan and the old one is dropped
+    # together with the old class.
+    def __init__(self) -> None:
+        self.plans: weakref.WeakKeyDictionary[
+            typing.Type[Serializer], SensitiveDataPlan
+        ] = weakref.WeakKeyDictionary()
+        self.lock = threading.Lock()
+
+    def get(self, serializer_class: typing.Type[Serializer]) -> SensitiveDataPlan:
+        plan = self.plans.get(serializer_class)
+        if plan is None:
+            plan = compile_sensitive_data_plan(get_serializer_sensitive_data_config(serializer_class))
+            with self.lock:
+                self.plans[serializer_class] = plan
+        return plan
+
+    def clear(self) -> None:
+        with self.lock:
+            self.plans.clear()
+
+
+sensitive_data_plans = SensitiveDataPlanCache()
 
 
 def get_serializer_sensitive_fields(
@@ -97,7 +128,173 @@ def get_field_sensitive_data_config(
     return result
 
 
+def compile_sensitive_data_plan(sensitive_data_config: SensitiveDataConfig) -> SensitiveDataPlan:
+    return tuple(
+        (
+            field_name,
+            compile_sensitive_data_plan(field_config) if isinstance(field_config, dict) else True,
+        )
+        for field_name, field_config in sensitive_data_config.items()
+    )
+
+
+def get_sensitive_data_plan(serializer: SerializerClassOrInstance) -> SensitiveDataPlan:
+    if inspect.isclass(serializer):
+        return sensitive_data_plans.get(serializer)
+    return compile_sensitive_data_plan(get_serializer_sensitive_data_config(serializer))
+
+
+class _MaskFrame:
+    """Container being masked: children are visited one by one, the container is copied only if
+    some child changed or it is truncated."""
+
+    def __init__(
+        self,
+        value: typing.Union[dict, list],
+        plan: SensitiveDataPlan,
+        max_items: typing.Optional[int],
+        key: typing.Any = None,
+    ) -> None:
+        self.value = value
+        self.key = key
+        self.changes: typing.Dict[typing.Any, typing.Any] = {}
+        self.size = len(value)
+        self.count = 0
+        limit = self.size if max_items is None else min(self.size, max_items)
+        self.children: typing.Iterator[MaskChild]
+        if isinstance(value, dict):
+            plan_map = dict(plan)
+            self.children = (
+                (child_key, child_value, plan_map.get(child_key, ()))
+                for child_key, child_value in itertools.islice(value.items(), limit)
+            )
+        else:
+            self.children = (
+                (index, child_value, plan)
+                for index, child_value in enumerate(itertools.islice(value, limit))
+            )
+
+    def next_child(self, budget: _BytesBudget) -> typing.Optional[MaskChild]:
+        child = None if budget.exceeded else next(self.children, None)
+        if child is not None:
+            self.count += 1
+            if isinstance(self.value, dict):
+                budget.spend(child[0])
+        return child
+
+    def set_child(self, key: typing.Any, value: typing.Any, original: typing.Any) -> None:
+        if value is not original:
+            self.changes[key] = value
+
+    def build(self) -> typing.Union[dict, list]:
+        truncated = self.size - self.count
+        if isinstance(self.value, dict):
+            if not self.changes and not truncated and type(self.value) is dict:
+                return self.value
+            result = dict(itertools.islice(self.value.items(), self.count))
+            result.update(self.changes)
+            if truncated:
+                result['[Truncated]'] = truncated
+            return result
+
+        if not self.changes and not truncated:
+            return self.value
+        result_list = self.value[:self.count]
+        for index, child_value in self.changes.items():
+            result_list[index] = child_value
+        if truncated:
+            result_list.append(f'[Truncated {truncated} items]')
+        return result_list
+
+
+def truncate_value(value: typing.Any, max_bytes: typing.Optional[int]) -> typing.Any:
+    if max_bytes is None:
+        return value
+    if isinstance(value, bytes) and len(value) > max_bytes:
+        return value[:max_bytes] + b'[Truncated]'
+    # utf-8 takes at most 4 bytes per character, so short strings are not encoded at all
+    if isinstance(value, str) and len(value) * 4 > max_bytes:
+        encoded_value = value.encode()
+        if len(encoded_value) > max_bytes:
+            return encoded_value[:max_bytes].decode(errors='ignore') + '[Truncated]'
+    return value
+
+
+def get_value_size(value: typing.Any) -> int:
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode())
+    return len(str(value))
+
+
+class _BytesBudget:
+    """Bytes left for keys and values of masked data, None for no limit."""
+
+    def __init__(self, max_bytes: typing.Optional[int]) -> None:
+        self.remaining = max_bytes
+
+    @property
+    def exceeded(self) -> bool:
+        return self.remaining is not None and self.remaining <= 0
+
+    def spend(self, value: typing.Any) -> None:
+        if self.remaining is not None:
+            self.remaining -= get_value_size(value)
+
+    def truncate(self, value: typing.Any) -> typing.Any:
+        if self.remaining is None:
+            return value
+        return truncate_value(value, max(self.remaining, 0))
+
+
+def mask_sensitive_data(
+    data: typing.Any,
+    plan: SensitiveDataPlan = (),
+    max_items: int = None,
+    max_bytes: int = None,
+) -> typing.Any:
+    # Copy-on-write: only containers with masked or truncated values are copied, everything else
+    # is shared with the original data. Without limits subtrees without sensitive fields are not
+    # visited at all. Explicit stack is used instead of recursion, so deep data is not a problem.
+    # `max_bytes` limits all keys and values together: the value, which exceeds it, is cut and
+    # the rest of items are dropped with `[Truncated]` mark.
+    if not isinstance(data, (dict, list)):
+        return truncate_value(data, max_bytes)
+
+    with_limits = max_items is not None or max_bytes is not None
+    budget = _BytesBudget(max_bytes)
+    root = _MaskFrame(data, plan, max_items)
+    stack = [root]
+    while stack:
+        frame = stack[-1]
+        child = frame.next_child(budget)
+        if child is None:
+            stack.pop()
+            if stack:
+                stack[-1].set_child(frame.key, frame.build(), frame.value)
+            continue
+
+        child_key, child_value, child_plan = child
+        if child_plan is True:
+            frame.set_child(child_key, '[Cleaned]', child_value)
+            budget.spend('[Cleaned]')
+        elif isinstance(child_value, (dict, list)):
+            if child_plan or with_limits:
+                stack.append(_MaskFrame(child_value, child_plan, max_items, key=child_key))
+        else:
+            frame.set_child(child_key, budget.truncate(child_value), child_value)
+            budget.spend(child_value)
+    return root.build()
+
+
 def smart_copy(data: SerializerData, no_copy_classes: typing.List) -> SerializerData:
+    # Kept for backward compatibility, clear_sensitive_data does not copy data anymore.
+    warnings.warn(
+        'smart_copy is deprecated, use mask_sensitive_data, which copies only changed containers',
+        DeprecationWarning,
+        stacklevel=2,
+    )
     if isinstance(data, dict):
         dict_data = {}
         for field_name, field_value in data.items():
@@ -113,26 +310,23 @@ def smart_copy(data: SerializerData, no_copy_classes: typing.List) -> Serializer
 def clear_sensitive_data(
     data: SerializerData,
     serializer: SerializerClassOrInstance,
+    max_items: int = None,
+    max_bytes: int = None,
 ) -> SerializerData:
-    data = smart_copy(data, [TemporaryUploadedFile])
-
     try:
-        sensitive_data_config = get_serializer_sensitive_data_config(serializer)
+        sensitive_data_plan = get_sensitive_data_plan(serializer)
     except AttributeError:
-        return data
-
-    if not sensitive_data_config:
-        return data
-
-    for field_name, field_value in sensitive_data_config.items():
-        clear_sensitive_field(field_name, field_value, data)
+        sensitive_data_plan = ()
 
-    return data
+    return mask_sensitive_data(
+        data, sensitive_data_plan, max_items=max_items, max_bytes=max_bytes,
+    )
 
 
 def clear_sensitive_field(
     field_name: str, field_value: typing.Any, data: SerializerData,
 ) -> None:
+    # Kept for backward compatibility, cleans data in place. clear_sensitive_data does not use it.
     if isinstance(data, list):
         for data_item in data:
             clear_sensitive_field(field_name, field_value, data_item)
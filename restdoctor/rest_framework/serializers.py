@@ -10,17 +10,21 @@ if typing.TYPE_CHECKING:
     from restdoctor.rest_framework.custom_types import ModelObject, GenericRepresentation
 
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Manager
 from django.db.models import Model as DjangoModel
 from pydantic import BaseModel
 from pydantic import ValidationError as PydanticValidationError
 from rest_framework.exceptions import ValidationError
 from rest_framework.fields import empty
 from rest_framework.serializers import BaseSerializer as BaseDRFSerializer
+from rest_framework.serializers import ListSerializer as BaseListSerializer
 from rest_framework.serializers import ModelSerializer as BaseModelSerializer
 from rest_framework.serializers import Serializer as BaseSerializer
 from rest_framework.serializers import SerializerMetaclass as BaseSerializerMetaclass
 from rest_framework.utils import model_meta
 
+from restdoctor.rest_framework.fields import BatchMethodField
+from restdoctor.rest_framework.profiling import get_serializer_profile
 from restdoctor.utils.pydantic import convert_pydantic_errors_to_drf_errors
 
 TPydanticModel = typing.TypeVar('TPydanticModel', bound=BaseModel)
@@ -48,6 +52,22 @@ def extend_meta_fields(*args: Serializer | str | None) -> _DeferredMetaFields:
     return _DeferredMetaFields(args)
 
 
+class ListSerializer(BaseListSerializer):
+    def to_representation(self, data: typing.Any) -> typing.List[typing.Any]:
+        iterable = data.all() if isinstance(data, Manager) else data
+        items = list(iterable)
+        resolve_batch_fields = getattr(self.child, 'resolve_batch_fields', None)
+        if resolve_batch_fields is None:
+            return [self.child.to_representation(item) for item in items]
+
+        # Batch fields are resolved once for the whole list before items are represented.
+        self.child._batch_values = resolve_batch_fields(items)
+        try:
+            return [self.child.to_representation(item) for item in items]
+        finally:
+            del self.child._batch_values
+
+
 class SerializerMetaclass(BaseSerializerMetaclass):
     def __new__(cls, name: str, bases: tuple, attrs: dict[str, typing.Any]) -> SerializerMetaclass:
         meta = attrs.get('Meta')
@@ -55,7 +75,24 @@ class SerializerMetaclass(BaseSerializerMetaclass):
             fields = getattr(meta, 'fields', None)
             if isinstance(fields, _DeferredMetaFields):
                 meta.fields = cls._extend_meta_fields(fields, bases)
-        return super().__new__(cls, name, bases, attrs)
+        serializer_cls = super().__new__(cls, name, bases, attrs)
+        cls._set_batch_list_serializer(serializer_cls)
+        return serializer_cls
+
+    @classmethod
+    def _set_batch_list_serializer(cls, serializer_cls: typing.Type[BaseSerializer]) -> None:
+        # Batch method fields need the whole list, so such serializers get restdoctor ListSerializer
+        # unless Meta sets its own list_serializer_class. Meta of the serializer is left untouched,
+        # the serializer gets a derived one.
+        if not any(
+            isinstance(field, BatchMethodField) for field in serializer_cls._declared_fields.values()
+        ):
+            return
+        meta = getattr(serializer_cls, 'Meta', None)
+        if getattr(meta, 'list_serializer_class', None) is not None:
+            return
+        meta_bases = (meta,) if meta else ()
+        serializer_cls.Meta = type('Meta', meta_bases, {'list_serializer_class': ListSerializer})
 
     @classmethod
     def _extend_meta_fields(cls, deferred_fields: _DeferredMetaFields, bases: tuple) -> list[str]:
@@ -103,7 +140,20 @@ class ModelSerializerMetaclass(SerializerMetaclass):
 
 
 class Serializer(BaseSerializer, metaclass=SerializerMetaclass):
-    pass
+    def to_representation(self, instance: typing.Any) -> typing.Dict[str, typing.Any]:
+        profile = get_serializer_profile()
+        if profile is None:
+            return super().to_representation(instance)
+        return profile.to_representation(self, instance)
+
+    def resolve_batch_fields(
+        self, instances: typing.Sequence[typing.Any],
+    ) -> typing.Dict[str, typing.Any]:
+        return {
+            field.field_name: field.resolve(instances)
+            for field in self._readable_fields
+            if isinstance(field, BatchMethodField)
+        }
 
 
 class EmptySerializer(Serializer):
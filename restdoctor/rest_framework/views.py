@@ -1,28 +1,47 @@
 from __future__ import annotations
 
 import contextlib
+import logging
+import random
 import typing
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.http import Http404
 
+from restdoctor.rest_framework.caching import CacheControl, get_cache_control_from_map
 from restdoctor.rest_framework.generics import GenericAPIView
 from restdoctor.rest_framework.mixins import ListModelMixin, RetrieveModelMixin
+from restdoctor.rest_framework.prefetch import is_prefetch_request
+from restdoctor.rest_framework.profiling import profile_serializers
 from restdoctor.rest_framework.sensitive_data import clear_sensitive_data
 from restdoctor.rest_framework.signals import bind_extra_request_view_initial_metadata
+from restdoctor.utils.log_queue import get_queued_logger
+from restdoctor.utils.memory import track_memory
 from restdoctor.utils.permissions import get_permission_classes_from_map
+from restdoctor.utils.rate_limit import get_rate_limiter
 from restdoctor.utils.serializers import get_serializer_class_from_map
-from restdoctor.utils.structlog import bind_contextvars, get_logger
+from restdoctor.utils.structlog import bind_contextvars, get_logger, is_logger_enabled
+from restdoctor.utils.timing import stage_timer
+from restdoctor.utils.tracing import (
+    bind_trace_attributes,
+    is_tracing_enabled,
+    reset_trace_attributes,
+    trace_span,
+)
 
 if typing.TYPE_CHECKING:
+    import contextvars
+
     from django.core.handlers.wsgi import WSGIRequest
     from django.http import HttpRequest
     from rest_framework.permissions import BasePermission
+    from rest_framework.renderers import BaseRenderer
     from rest_framework.request import Request
     from rest_framework.response import Response
     from rest_framework.serializers import BaseSerializer
 
+    from restdoctor.rest_framework.profiling import SerializerProfile
     from restdoctor.rest_framework.sensitive_data import SerializerData
     from restdoctor.utils.serializers import SerializerType
 
@@ -34,11 +53,19 @@ class SerializerClassMapApiView(GenericAPIView):
     action_map: typing.Dict[str, str] = {}
     action: str = ''
     permission_classes_map: typing.Dict[str, typing.List[BasePermission]]
+    cache_control_map: typing.Dict[str, CacheControl] = {}
+    log_sample_rate_map: typing.Dict[str, float] = {}
+    serializer_profile_sample_rate: typing.Optional[float] = None
+    serializer_profile: typing.Optional[SerializerProfile] = None
+    memory_tracking_sample_rate: typing.Optional[float] = None
+    trace_attributes_token: typing.Optional[contextvars.Token] = None
 
     def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
         if 'permission_classes' in kwargs and getattr(self, 'permission_classes_map', None):
             raise ImproperlyConfigured('Use permission_classes_map')
         super().__init__(*args, **kwargs)
+        # Next page prefetch builds a new instance of the view in a worker thread.
+        self.view_initkwargs = kwargs
 
     @classmethod
     def as_view(cls, **initkwargs: typing.Any) -> SerializerClassMapApiView:
@@ -48,42 +75,189 @@ class SerializerClassMapApiView(GenericAPIView):
         return view
 
     def dispatch(self, request: WSGIRequest, *args: typing.Any, **kwargs: typing.Any) -> Response:
-        response = super().dispatch(request, *args, **kwargs)
+        if self.should_track_memory(request):
+            response = self.dispatch_with_memory_tracking(request, *args, **kwargs)
+        else:
+            response = super().dispatch(request, *args, **kwargs)
         response.serializer = self.get_response_serializer_class()
+        if self.serializer_profile is not None:
+            response.serializer_profile = self.serializer_profile
+        return response
+
+    def dispatch_with_memory_tracking(
+        self, request: WSGIRequest, *args: typing.Any, **kwargs: typing.Any
+    ) -> Response:
+        with track_memory(
+            frames=settings.API_MEMORY_TRACKING_FRAMES,
+            top_limit=settings.API_MEMORY_TRACKING_TOP_LIMIT,
+            detail_threshold=settings.API_MEMORY_TRACKING_DETAIL_THRESHOLD,
+            snapshot_dir=settings.API_MEMORY_SNAPSHOT_DIR,
+        ) as memory_usage:
+            response = super().dispatch(request, *args, **kwargs)
+        if memory_usage is not None:
+            response.memory_usage = memory_usage
+            get_queued_logger(logger).info(
+                'view_memory',
+                peak_bytes=memory_usage.peak_bytes,
+                allocated_bytes=memory_usage.allocated_bytes,
+                top_sites=memory_usage.top_sites,
+                top_tracebacks=memory_usage.top_tracebacks,
+                snapshot_path=memory_usage.snapshot_path,
+                **self.get_view_logging_context(),
+            )
         return response
 
+    def should_track_memory(self, request: HttpRequest) -> bool:
+        if is_prefetch_request(request):
+            return False
+        sample_rate = self.memory_tracking_sample_rate
+        if sample_rate is None:
+            sample_rate = settings.API_MEMORY_TRACKING_SAMPLE_RATE
+        return sample_rate > 0 and random.random() < sample_rate
+
+    def finalize_response(
+        self, request: Request, response: Response, *args: typing.Any, **kwargs: typing.Any
+    ) -> Response:
+        # Attributes bound in initial are not passed to spans of the following requests.
+        if self.trace_attributes_token is not None:
+            reset_trace_attributes(self.trace_attributes_token)
+            self.trace_attributes_token = None
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method in ('GET', 'HEAD') and response.status_code < 400:
+            cache_control = self.get_cache_control()
+            if cache_control is not None:
+                cache_control.patch_response(response)
+        return response
+
+    def get_cache_control(
+        self, action: str = None, api_format: str = None
+    ) -> typing.Optional[CacheControl]:
+        return get_cache_control_from_map(
+            action or self.get_action(),
+            self.cache_control_map,
+            api_format=api_format or self.get_api_format(),
+        )
+
+    def get_api_format(self) -> str:
+        api_format = settings.API_DEFAULT_FORMAT
+        with contextlib.suppress(AttributeError):
+            api_format = self.request.api_params.format or api_format
+        return api_format
+
+    def perform_content_negotiation(
+        self, request: Request, force: bool = False
+    ) -> typing.Tuple[BaseRenderer, str]:
+        with stage_timer('negotiation'):
+            return super().perform_content_negotiation(request, force=force)
+
+    def perform_authentication(self, request: Request) -> None:
+        with stage_timer('authentication'):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request: Request) -> None:
+        with stage_timer('permissions'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request: Request, obj: typing.Any) -> None:
+        with stage_timer('permissions'):
+            super().check_object_permissions(request, obj)
+
     def clear_request_data(self, request: Request) -> typing.Optional[SerializerData]:
         request_serializer = self.get_request_serializer_class()
         request_data = request.data
         if request_data and request_serializer:
-            return clear_sensitive_data(request_data, request_serializer)
+            return clear_sensitive_data(
+                request_data,
+                request_serializer,
+                max_items=settings.API_LOG_REQUEST_DATA_MAX_ITEMS,
+                max_bytes=settings.API_LOG_REQUEST_DATA_MAX_BYTES,
+            )
         return None
 
     def initial(self, request: Request, *args: typing.Any, **kwargs: typing.Any) -> None:
+        # Middlewares see only django request, e.g. MetricsMiddleware labels requests by view.
+        request._request.api_view = (self.__class__.__name__, self.get_action())
+        if is_tracing_enabled():
+            self.trace_attributes_token = bind_trace_attributes(
+                **{'api.view': self.__class__.__name__, 'api.action': self.get_action()}
+            )
         if settings.API_ENABLE_STRUCTLOG:
+            self.log_view_initial(request)
+        super().initial(request, *args, **kwargs)
+
+    def log_view_initial(self, request: Request) -> None:
+        if bind_extra_request_view_initial_metadata.has_listeners(self.__class__):
             bind_extra_request_view_initial_metadata.send(
                 sender=self.__class__, request=request, logger=logger, view_instance=self
             )
-            try:
-                request_data = self.clear_request_data(request)
-            except Exception:
-                request_data = None
-
-            api_view_loging_context = {
-                'api_view_app_name': self.__module__.split('.')[0],
-                'api_view_module': self.__module__,
-                'api_view_name': self.__class__.__name__,
-                'api_view_action': self.get_action(),
-            }
-            if settings.API_BIND_STRUCTLOG_CONTEXTVARS:
-                bind_contextvars(**api_view_loging_context)
-            logger.info(
-                'view_initial',
-                request_data=request_data,
-                request_query_params=dict(request.query_params),
-                **api_view_loging_context,
-            )
-        super().initial(request, *args, **kwargs)
+
+        api_view_loging_context = self.get_view_logging_context()
+        if settings.API_BIND_STRUCTLOG_CONTEXTVARS:
+            bind_contextvars(**api_view_loging_context)
+        if not self.should_log_view_initial():
+            return
+
+        # Request data is parsed and cleaned only for events, which are actually written.
+        try:
+            request_data = self.clear_request_data(request)
+        except Exception:
+            request_data = None
+        get_queued_logger(logger).info(
+            'view_initial',
+            request_data=request_data,
+            request_query_params=dict(request.query_params),
+            **api_view_loging_context,
+        )
+
+    def get_view_logging_context(self) -> typing.Dict[str, str]:
+        return {
+            'api_view_app_name': self.__module__.split('.')[0],
+            'api_view_module': self.__module__,
+            'api_view_name': self.__class__.__name__,
+            'api_view_action': self.get_action(),
+        }
+
+    def should_log_view_initial(self) -> bool:
+        if is_prefetch_request(self.request) or not is_logger_enabled(logger, logging.INFO):
+            return False
+        action = self.get_action()
+        sample_rate = self.get_log_sample_rate(action)
+        if sample_rate < 1 and random.random() >= sample_rate:
+            return False
+        rate_limit = settings.API_VIEW_INITIAL_LOG_RATE_LIMIT
+        return rate_limit is None or get_rate_limiter(rate_limit).acquire((self.__class__, action))
+
+    def get_log_sample_rate(self, action: str = None) -> float:
+        default_sample_rate = self.log_sample_rate_map.get(
+            'default', settings.API_VIEW_INITIAL_LOG_SAMPLE_RATE
+        )
+        return self.log_sample_rate_map.get(action or self.get_action(), default_sample_rate)
+
+    @contextlib.contextmanager
+    def profile_serialization(self) -> typing.Iterator[None]:
+        if not self.should_profile_serialization():
+            yield
+            return
+
+        with profile_serializers() as profile:
+            yield
+        self.serializer_profile = profile
+        get_queued_logger(logger).info(
+            'serializer_profile',
+            api_view_name=self.__class__.__name__,
+            api_view_action=self.get_action(),
+            instances=profile.instances,
+            queries=profile.queries,
+            fields=profile.get_fields(),
+        )
+
+    def should_profile_serialization(self) -> bool:
+        if is_prefetch_request(self.request):
+            return False
+        sample_rate = self.serializer_profile_sample_rate
+        if sample_rate is None:
+            sample_rate = settings.API_SERIALIZER_PROFILE_SAMPLE_RATE
+        return sample_rate > 0 and random.random() < sample_rate
 
     def get_action(self) -> str:
         action = getattr(self, 'action', None)
@@ -112,18 +286,21 @@ class SerializerClassMapApiView(GenericAPIView):
         serializer_class_map = getattr(self, 'serializer_class_map', {})
 
         if api_format is None:
-            api_format = settings.API_DEFAULT_FORMAT
-            with contextlib.suppress(AttributeError):
-                api_format = self.request.api_params.format or api_format
-
-        return get_serializer_class_from_map(
-            action,
-            stage,
-            serializer_class_map,
-            self.serializer_class,
-            use_default=use_default,
-            api_format=api_format,
-        )
+            api_format = self.get_api_format()
+
+        with trace_span(
+            'restdoctor.serializer_resolution', **{'api.action': action, 'api.stage': stage},
+        ) as span:
+            serializer_class = get_serializer_class_from_map(
+                action,
+                stage,
+                serializer_class_map,
+                self.serializer_class,
+                use_default=use_default,
+                api_format=api_format,
+            )
+            span.set_attribute('api.serializer', getattr(serializer_class, '__name__', None))
+        return serializer_class
 
     def get_serializer_context(self, stage: str = 'response') -> typing.Dict[str, typing.Any]:
         return super().get_serializer_context()
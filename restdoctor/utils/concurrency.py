@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+import typing
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as futures_wait
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+T = typing.TypeVar('T')
+
+_executor: typing.Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.API_CONCURRENT_QUERIES_MAX_WORKERS,
+                    thread_name_prefix='restdoctor-queries',
+                )
+    return _executor
+
+
+def in_atomic_block() -> bool:
+    return any(connection.in_atomic_block for connection in connections.all())
+
+
+def can_run_concurrently() -> bool:
+    return not getattr(_worker_state, 'active', False) and not in_atomic_block()
+
+
+def run_in_worker(func: typing.Callable[[], T]) -> T:
+    _worker_state.active = True
+    close_old_connections()
+    try:
+        return func()
+    finally:
+        close_old_connections()
+        _worker_state.active = False
+
+
+def submit_in_worker(executor: ThreadPoolExecutor, func: typing.Callable[[], T]) -> Future[T]:
+    context = contextvars.copy_context()
+    return executor.submit(lambda: context.run(run_in_worker, func))
+
+
+def run_concurrently(
+    *funcs: typing.Callable[[], typing.Any], enabled: bool = True,
+) -> typing.List[typing.Any]:
+    # Worker threads get their own DB connections, so inside atomic blocks they would not see
+    # uncommitted data: fall back to sequential execution there. The last function always runs
+    # in the calling thread, nested calls from worker threads run sequentially.
+    if not enabled or len(funcs) < 2 or not can_run_concurrently():
+        return [func() for func in funcs]
+
+    executor = get_executor()
+    *submitted, last = funcs
+    futures = [submit_in_worker(executor, func) for func in submitted]
+    try:
+        last_result = last()
+    except BaseException:
+        # Submitted functions must not outlive the request: not started ones are cancelled,
+        # running ones are awaited, so their connections are closed by run_in_worker.
+        for future in futures:
+            future.cancel()
+        futures_wait(futures)
+        raise
+    return [future.result() for future in futures] + [last_result]
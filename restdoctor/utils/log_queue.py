@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import atexit
+import collections
+import contextvars
+import datetime
+import decimal
+import logging
+import os
+import sys
+import threading
+import typing
+import uuid
+
+from django.conf import settings
+
+if typing.TYPE_CHECKING:
+    LogRecord = typing.Tuple[
+        typing.Any, str, typing.Tuple[typing.Any, ...], typing.Dict[str, typing.Any], contextvars.Context
+    ]
+
+_log_queue: typing.Optional[LogQueue] = None
+_lock = threading.Lock()
+
+STDLIB_LOG_KWARGS = frozenset(('exc_info', 'stack_info', 'stacklevel', 'extra'))
+IMMUTABLE_LOG_VALUE_TYPES = (
+    str, bytes, int, float, bool, type(None), uuid.UUID, decimal.Decimal,
+    datetime.date, datetime.time, datetime.timedelta,
+)
+
+
+def snapshot_log_value(value: typing.Any) -> typing.Any:
+    # Containers are copied and other mutable objects are replaced with repr, so a queued call
+    # does not reference request data or view state, which may change before it is written.
+    root: typing.List[typing.Any] = [None]
+    stack: typing.List[typing.Tuple[typing.Any, typing.Any, typing.Any]] = [(value, root, 0)]
+    while stack:
+        item, parent, key = stack.pop()
+        if isinstance(item, IMMUTABLE_LOG_VALUE_TYPES):
+            parent[key] = item
+        elif isinstance(item, dict):
+            parent[key] = dict.fromkeys(item)
+            stack.extend((child, parent[key], child_key) for child_key, child in item.items())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            parent[key] = [None] * len(item)
+            stack.extend((child, parent[key], index) for index, child in enumerate(item))
+        else:
+            parent[key] = repr(item)
+    return root[0]
+
+
+def get_log_call_kwargs(
+    logger: typing.Any, kwargs: typing.Dict[str, typing.Any],
+) -> typing.Dict[str, typing.Any]:
+    kwargs = {
+        key: value if key in STDLIB_LOG_KWARGS else snapshot_log_value(value)
+        for key, value in kwargs.items()
+    }
+    # The call is made by the writer thread, which has no exception being handled.
+    if kwargs.get('exc_info') is True:
+        kwargs['exc_info'] = sys.exc_info()
+    # Stdlib loggers accept event fields only as `extra`.
+    if isinstance(logger, (logging.Logger, logging.LoggerAdapter)):
+        extra = {key: kwargs.pop(key) for key in list(kwargs) if key not in STDLIB_LOG_KWARGS}
+        if extra:
+            kwargs['extra'] = {**kwargs.get('extra', {}), **extra}
+    return kwargs
+
+
+class LogQueue:
+    """Bounded queue of log calls written by a background thread, the oldest call is dropped on
+    overflow."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.records: typing.Deque[LogRecord] = collections.deque()
+        self.condition = threading.Condition()
+        self.stats = collections.Counter({'queued': 0, 'written': 0, 'dropped': 0, 'errors': 0})
+        self.writing = False
+        self.stopped = False
+        self.thread: typing.Optional[threading.Thread] = None
+        self.pid: typing.Optional[int] = None
+
+    def put(
+        self,
+        logger: typing.Any,
+        method_name: str,
+        args: typing.Tuple[typing.Any, ...],
+        kwargs: typing.Dict[str, typing.Any],
+    ) -> None:
+        # Log call is run in a copy of the request context, so structlog context vars are kept.
+        context = contextvars.copy_context()
+        with self.condition:
+            self._start_writer()
+            if len(self.records) >= self.max_size:
+                self.records.popleft()
+                self.stats['dropped'] += 1
+            self.records.append((logger, method_name, args, kwargs, context))
+            self.stats['queued'] += 1
+            self.condition.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.records and not self.writing, timeout)
+
+    def stop(self, timeout: float = 5) -> None:
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+            thread = self.thread if self.pid == os.getpid() else None
+        if thread is not None:
+            thread.join(timeout)
+
+    def get_stats(self) -> typing.Dict[str, int]:
+        with self.condition:
+            stats = dict(self.stats)
+            stats['size'] = len(self.records)
+        return stats
+
+    def _start_writer(self) -> None:
+        pid = os.getpid()
+        if self.pid == pid or self.stopped:
+            return
+        # Records and thread of the parent process are not usable after fork.
+        self.records.clear()
+        self.writing = False
+        self.pid = pid
+        self.thread = threading.Thread(target=self._write, name='restdoctor-log-queue', daemon=True)
+        self.thread.start()
+
+    def _write(self) -> None:
+        while True:
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+                self.condition.wait_for(lambda: self.records or self.stopped)
+                if not self.records:
+                    return
+                record = self.records.popleft()
+                self.writing = True
+            self._write_record(record)
+
+    def _write_record(self, record: LogRecord) -> None:
+        logger, method_name, args, kwargs, context = record
+        try:
+            context.run(getattr(logger, method_name), *args, **kwargs)
+        except Exception:
+            with self.condition:
+                self.stats['errors'] += 1
+        else:
+            with self.condition:
+                self.stats['written'] += 1
+
+
+class QueuedLogger:
+    def __init__(self, logger: typing.Any, log_queue: LogQueue) -> None:
+        self.logger = logger
+        self.log_queue = log_queue
+
+    def debug(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        self.put('debug', args, kwargs)
+
+    def info(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        self.put('info', args, kwargs)
+
+    def warning(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        self.put('warning', args, kwargs)
+
+    def error(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        self.put('error', args, kwargs)
+
+    def exception(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        kwargs.setdefault('exc_info', sys.exc_info())
+        self.put('exception', args, kwargs)
+
+    def put(
+        self, method_name: str, args: typing.Tuple[typing.Any, ...], kwargs: typing.Dict[str, typing.Any],
+    ) -> None:
+        self.log_queue.put(
+            self.logger,
+            method_name,
+            tuple(snapshot_log_value(list(args))),
+            get_log_call_kwargs(self.logger, kwargs),
+        )
+
+
+def get_log_queue() -> typing.Optional[LogQueue]:
+    global _log_queue
+
+    if not settings.API_LOG_QUEUE_SIZE:
+        return None
+    if _log_queue is None:
+        with _lock:
+            if _log_queue is None:
+                _log_queue = LogQueue(max_size=settings.API_LOG_QUEUE_SIZE)
+                atexit.register(_log_queue.stop)
+    return _log_queue
+
+
+def get_queued_logger(logger: typing.Any) -> typing.Any:
+    log_queue = get_log_queue()
+    return logger if log_queue is None else QueuedLogger(logger, log_queue)
+
+
+def get_log_queue_stats() -> typing.Dict[str, int]:
+    log_queue = get_log_queue()
+    return log_queue.get_stats() if log_queue is not None else {}
@@ -93,6 +93,21 @@ def get_api_header(params: APIParams) -> str:
     return f'{params.vendor}.{params.version_with_resource_discriminator}; format={params.format}'
 
 
+def get_media_type_header(vendor_string: str) -> str:
+    return f'X-{vendor_string}-Media-Type'
+
+
+def get_canonical_media_type(params: typing.Optional[APIParams]) -> str:
+    # Accept strings that select the same API version, resource and format collapse to one value,
+    # non-vendor media types keep the raw Accept since DRF negotiates the renderer by it.
+    if params is None:
+        return ''
+    api_header = get_api_header(params)
+    if params.accepted.startswith(f'application/vnd.{params.vendor}'):
+        return api_header
+    return f'{api_header}; accepted={params.accepted}'
+
+
 def get_media_type(params: APIParams) -> str:
     if params.accepted.startswith('application/json'):
         return params.accepted
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import os
+import threading
+import time
+import tracemalloc
+import typing
+import uuid
+
+_tracking_lock = threading.Lock()
+
+
+@dataclasses.dataclass
+class MemoryUsage:
+    peak_bytes: int = 0
+    allocated_bytes: int = 0
+    top_sites: typing.List[typing.Dict[str, typing.Any]] = dataclasses.field(default_factory=list)
+    top_tracebacks: typing.List[typing.Dict[str, typing.Any]] = dataclasses.field(default_factory=list)
+    snapshot_path: typing.Optional[str] = None
+
+
+def format_statistic(
+    statistic: tracemalloc.Statistic, with_traceback: bool = False,
+) -> typing.Dict[str, typing.Any]:
+    frame = statistic.traceback[0]
+    site: typing.Dict[str, typing.Any] = {
+        'site': f'{frame.filename}:{frame.lineno}',
+        'size_bytes': statistic.size,
+        'count': statistic.count,
+    }
+    if with_traceback:
+        site['traceback'] = [f'{frame.filename}:{frame.lineno}' for frame in statistic.traceback]
+    return site
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
+
+
+@contextlib.contextmanager
+def track_memory(
+    frames: int = 1, top_limit: int = 10, detail_threshold: int = None, snapshot_dir: str = None,
+) -> typing.Iterator[typing.Optional[MemoryUsage]]:
+    # tracemalloc is global for the process, so one block is tracked at a time and allocations
+    # of other threads made meanwhile are counted too. Nothing is tracked, if tracemalloc is
+    # already started by someone else.
+    if tracemalloc.is_tracing() or not _tracking_lock.acquire(blocking=False):
+        yield None
+        return
+
+    memory_usage = MemoryUsage()
+    try:
+        tracemalloc.start(frames)
+        yield memory_usage
+        memory_usage.allocated_bytes, memory_usage.peak_bytes = tracemalloc.get_traced_memory()
+        snapshot = take_snapshot()
+        memory_usage.top_sites = [
+            format_statistic(statistic) for statistic in snapshot.statistics('lineno')[:top_limit]
+        ]
+        if detail_threshold is not None and memory_usage.peak_bytes >= detail_threshold:
+            memory_usage.top_tracebacks = [
+                format_statistic(statistic, with_traceback=True)
+                for statistic in snapshot.statistics('traceback')[:top_limit]
+            ]
+            if snapshot_dir:
+                memory_usage.snapshot_path = dump_snapshot(snapshot, snapshot_dir)
+    finally:
+        tracemalloc.stop()
+        _tracking_lock.release()
+
+
+def dump_snapshot(snapshot: tracemalloc.Snapshot, snapshot_dir: str) -> str:
+    os.makedirs(snapshot_dir, exist_ok=True)
+    filename = f'{time.strftime("%Y%m%dT%H%M%S")}-{os.getpid()}-{uuid.uuid4().hex[:8]}.tracemalloc'
+    path = os.path.join(snapshot_dir, filename)
+    snapshot.dump(path)
+    return path
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import atexit
+import bisect
+import collections
+import dataclasses
+import glob
+import json
+import os
+import threading
+import time
+import typing
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+if typing.TYPE_CHECKING:
+    LabelValues = typing.Tuple[str, ...]
+    MetricValues = typing.Dict[str, typing.Dict[LabelValues, typing.Any]]
+
+OVERFLOW_LABEL_VALUE = '__overflow__'
+API_LABEL_NAMES = ('version', 'format', 'resource', 'view', 'action')
+
+_metrics_registry: typing.Optional[BaseMetricsRegistry] = None
+_lock = threading.Lock()
+
+
+@dataclasses.dataclass(frozen=True)
+class Metric:
+    name: str
+    kind: str
+    documentation: str
+    label_names: typing.Tuple[str, ...] = API_LABEL_NAMES
+    buckets: typing.Tuple[float, ...] = ()
+
+
+API_METRICS = (
+    Metric(
+        'restdoctor_requests_total',
+        'counter',
+        'API requests by response status class.',
+        label_names=(*API_LABEL_NAMES, 'status'),
+    ),
+    Metric('restdoctor_errors_total', 'counter', 'API requests finished with 5xx response.'),
+    Metric(
+        'restdoctor_request_duration_seconds',
+        'histogram',
+        'API request latency.',
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    ),
+    Metric(
+        'restdoctor_response_size_bytes',
+        'histogram',
+        'API response body size.',
+        buckets=(100, 1000, 10_000, 100_000, 1_000_000, 10_000_000),
+    ),
+    Metric(
+        'restdoctor_db_queries',
+        'histogram',
+        'DB queries per API request.',
+        buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+    ),
+)
+
+
+class BaseMetricsRegistry:
+    def register(self, metric: Metric) -> None:
+        raise NotImplementedError
+
+    def inc(self, name: str, labels: LabelValues, value: float = 1.0) -> None:
+        raise NotImplementedError
+
+    def observe(self, name: str, labels: LabelValues, value: float) -> None:
+        raise NotImplementedError
+
+    def generate_latest(self) -> str:
+        raise NotImplementedError
+
+
+class MetricsRegistry(BaseMetricsRegistry):
+    """In-process metrics: counters and histograms, label sets per metric are limited by
+    `max_label_sets`, extra label sets are merged into one overflow label set."""
+
+    def __init__(self, max_label_sets: int = None) -> None:
+        self.max_label_sets = (
+            max_label_sets if max_label_sets is not None else settings.API_METRICS_MAX_LABEL_SETS
+        )
+        self.metrics: typing.Dict[str, Metric] = {}
+        self.values: MetricValues = {}
+        self.lock = threading.Lock()
+
+    def register(self, metric: Metric) -> None:
+        with self.lock:
+            self.metrics[metric.name] = metric
+            self.values.setdefault(metric.name, {})
+
+    def inc(self, name: str, labels: LabelValues, value: float = 1.0) -> None:
+        with self.lock:
+            metric_values = self.values[name]
+            labels = self.get_bounded_labels(metric_values, labels)
+            metric_values[labels] = metric_values.get(labels, 0.0) + value
+
+    def observe(self, name: str, labels: LabelValues, value: float) -> None:
+        buckets = self.metrics[name].buckets
+        with self.lock:
+            metric_values = self.values[name]
+            labels = self.get_bounded_labels(metric_values, labels)
+            # Per-bucket counts with +Inf bucket at the end, then sum.
+            histogram: typing.Optional[typing.List[float]] = metric_values.get(labels)
+            if histogram is None:
+                histogram = metric_values[labels] = [0.0] * (len(buckets) + 2)
+            histogram[bisect.bisect_left(buckets, value)] += 1
+            histogram[-1] += value
+
+    def get_bounded_labels(
+        self, metric_values: typing.Dict[LabelValues, typing.Any], labels: LabelValues,
+    ) -> LabelValues:
+        if labels in metric_values or len(metric_values) < self.max_label_sets:
+            return labels
+        return (OVERFLOW_LABEL_VALUE,) * len(labels)
+
+    def collect(self) -> MetricValues:
+        with self.lock:
+            return {
+                name: {
+                    labels: list(value) if isinstance(value, list) else value
+                    for labels, value in metric_values.items()
+                }
+                for name, metric_values in self.values.items()
+            }
+
+    def generate_latest(self) -> str:
+        return generate_exposition(self.metrics, self.collect())
+
+
+class MultiprocessMetricsRegistry(MetricsRegistry):
+    """Each process dumps its metrics to own file in `API_METRICS_MULTIPROCESS_DIR`, exposition
+    sums files of all processes, so any worker can serve the metrics view."""
+
+    def __init__(
+        self, directory: str = None, flush_interval: float = 1.0, max_label_sets: int = None,
+    ) -> None:
+        super().__init__(max_label_sets=max_label_sets)
+        self.directory = directory or settings.API_METRICS_MULTIPROCESS_DIR
+        if not self.directory:
+            raise ImproperlyConfigured('API_METRICS_MULTIPROCESS_DIR is required for multiprocess metrics')
+        self.flush_interval = flush_interval
+        self.flushed_at = 0.0
+        self.flush_lock = threading.Lock()
+        self.pid = os.getpid()
+        atexit.register(self.flush)
+
+    def inc(self, name: str, labels: LabelValues, value: float = 1.0) -> None:
+        self.check_pid()
+        super().inc(name, labels, value)
+        self.flush_if_needed()
+
+    def observe(self, name: str, labels: LabelValues, value: float) -> None:
+        self.check_pid()
+        super().observe(name, labels, value)
+        self.flush_if_needed()
+
+    def check_pid(self) -> None:
+        # Values inherited from the parent process are already in the parent file.
+        pid = os.getpid()
+        if pid != self.pid:
+            with self.lock:
+                self.pid = pid
+                self.values = {name: {} for name in self.metrics}
+
+    def flush_if_needed(self) -> None:
+        if time.monotonic() - self.flushed_at >= self.flush_interval:
+            self.flush()
+
+    def get_process_file(self) -> str:
+        return os.path.join(self.directory, f'restdoctor_metrics_{self.pid}.json')
+
+    def flush(self) -> None:
+        self.check_pid()
+        self.flushed_at = time.monotonic()
+        dump = [
+            [name, list(labels), value]
+            for name, metric_values in super().collect().items()
+            for labels, value in metric_values.items()
+        ]
+        # Readers see either previous or new complete file.
+        with self.flush_lock:
+            process_file = self.get_process_file()
+            tmp_file = f'{process_file}.tmp'
+            with open(tmp_file, 'w') as metrics_file:
+                json.dump(dump, metrics_file)
+            os.replace(tmp_file, process_file)
+
+    def collect(self) -> MetricValues:
+        self.flush()
+        merged: MetricValues = collections.defaultdict(dict)
+        for process_file in glob.glob(os.path.join(self.directory, 'restdoctor_metrics_*.json')):
+            try:
+                with open(process_file) as metrics_file:
+                    dump = json.load(metrics_file)
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in dump:
+                merge_metric_value(merged[name], tuple(labels), value)
+        return merged
+
+
+def merge_metric_value(
+    metric_values: typing.Dict[LabelValues, typing.Any], labels: LabelValues, value: typing.Any,
+) -> None:
+    current = metric_values.get(labels)
+    if current is None:
+        metric_values[labels] = value
+    elif isinstance(value, list):
+        metric_values[labels] = [left + right for left, right in zip(current, value)]
+    else:
+        metric_values[labels] = current + value
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def format_labels(label_names: typing.Sequence[str], labels: typing.Sequence[str]) -> str:
+    pairs = ','.join(
+        f'{name}="{escape_label_value(str(value))}"' for name, value in zip(label_names, labels)
+    )
+    return f'{{{pairs}}}' if pairs else ''
+
+
+def format_value(value: float) -> str:
+    return repr(float(value))
+
+
+def generate_exposition(metrics: typing.Dict[str, Metric], values: MetricValues) -> str:
+    lines = []
+    for name, metric in metrics.items():
+        lines.append(f'# HELP {name} {metric.documentation}')
+        lines.append(f'# TYPE {name} {metric.kind}')
+        for labels, value in sorted(values.get(name, {}).items()):
+            if metric.kind != 'histogram':
+                lines.append(f'{name}{format_labels(metric.label_names, labels)} {format_value(value)}')
+                continue
+            cumulative = 0.0
+            bucket_names = (*metric.label_names, 'le')
+            bucket_label_values = (*(format_value(bucket) for bucket in metric.buckets), '+Inf')
+            for bucket_label, count in zip(bucket_label_values, value[:-1]):
+                cumulative += count
+                bucket_labels = format_labels(bucket_names, (*labels, bucket_label))
+                lines.append(f'{name}_bucket{bucket_labels} {format_value(cumulative)}')
+            metric_labels = format_labels(metric.label_names, labels)
+            lines.append(f'{name}_sum{metric_labels} {format_value(value[-1])}')
+            lines.append(f'{name}_count{metric_labels} {format_value(cumulative)}')
+    return '\n'.join(lines) + '\n'
+
+
+def get_metrics_registry() -> BaseMetricsRegistry:
+    global _metrics_registry
+
+    if _metrics_registry is None:
+        with _lock:
+            if _metrics_registry is None:
+                metrics_registry = import_string(settings.API_METRICS_REGISTRY)()
+                for metric in API_METRICS:
+                    metrics_registry.register(metric)
+                _metrics_registry = metrics_registry
+    return _metrics_registry
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import cProfile
+import hmac
+import os
+import re
+import time
+import typing
+import uuid
+
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import pyinstrument
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:
+    pyinstrument = None
+
+if typing.TYPE_CHECKING:
+    FunctionKey = typing.Tuple[str, int, str]
+
+PROFILE_SIGNING_SALT = 'restdoctor.profile'
+
+
+class BaseProfiler:
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+
+    def start(self) -> None:
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        raise NotImplementedError
+
+    def write(self, path: str) -> str:
+        # Writes profile to `path` with format specific extension, returns full file path.
+        raise NotImplementedError
+
+
+class CProfileProfiler(BaseProfiler):
+    """Profiles the calling thread with cProfile and writes collapsed stacks, which are read by
+    flamegraph.pl and speedscope. Every line is a caller;callee pair with its calls count.
+    Interval is not used, cProfile traces every call."""
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(interval)
+        self.profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profiler.enable()
+
+    def stop(self) -> None:
+        self.profiler.disable()
+
+    def write(self, path: str) -> str:
+        path = f'{path}.collapsed'
+        self.profiler.create_stats()
+        stacks = get_collapsed_call_pairs(self.profiler.stats)
+        with open(path, 'w') as profile_file:
+            for stack, count in sorted(stacks.items(), key=lambda item: item[1], reverse=True):
+                profile_file.write(f'{stack} {count}\n')
+        return path
+
+
+class PyinstrumentProfiler(BaseProfiler):
+    def __init__(self, interval: float) -> None:
+        if pyinstrument is None:
+            raise ImproperlyConfigured('pyinstrument is required for PyinstrumentProfiler')
+        super().__init__(interval)
+        self.profiler = pyinstrument.Profiler(interval=interval)
+
+    def start(self) -> None:
+        self.profiler.start()
+
+    def stop(self) -> None:
+        self.profiler.stop()
+
+    def write(self, path: str) -> str:
+        path = f'{path}.speedscope.json'
+        with open(path, 'w') as profile_file:
+            profile_file.write(self.profiler.output(SpeedscopeRenderer()))
+        return path
+
+
+def get_function_label(function: FunctionKey) -> str:
+    filename, lineno, name = function
+    return f'{name} ({filename}:{lineno})'.replace(';', ',')
+
+
+def get_collapsed_call_pairs(stats: typing.Mapping[FunctionKey, typing.Tuple]) -> typing.Dict[str, int]:
+    stacks: typing.Dict[str, int] = {}
+    for function, (_, calls_count, _, _, callers) in stats.items():
+        label = get_function_label(function)
+        if not callers:
+            stacks[label] = calls_count
+        for caller, (_, caller_calls_count, _, _) in callers.items():
+            stacks[f'{get_function_label(caller)};{label}'] = caller_calls_count
+    return stacks
+
+
+def get_profile_signing_value(method: str, path: str) -> str:
+    return f'{method.upper()}:{path}'
+
+
+def get_profile_signature(method: str, path: str) -> str:
+    signer = signing.TimestampSigner(salt=PROFILE_SIGNING_SALT)
+    return signer.sign(get_profile_signing_value(method, path))
+
+
+def check_profile_signature(signature: typing.Optional[str], method: str, path: str, max_age: int) -> bool:
+    if not signature:
+        return False
+    try:
+        value = signing.TimestampSigner(salt=PROFILE_SIGNING_SALT).unsign(signature, max_age=max_age)
+    except signing.BadSignature:
+        return False
+    return hmac.compare_digest(value.encode(), get_profile_signing_value(method, path).encode())
+
+
+def get_profile_filename(tags: typing.Sequence[str]) -> str:
+    tags = [re.sub(r'[^\w.-]', '_', tag) for tag in tags]
+    return '-'.join([time.strftime('%Y%m%dT%H%M%S'), *tags, str(os.getpid()), uuid.uuid4().hex[:8]])
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import functools
+import threading
+import time
+import typing
+
+
+class RateLimiter:
+    """Token bucket per key: `rate` events per second with bursts up to `burst` events."""
+
+    def __init__(self, rate: float, burst: float = None) -> None:
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self.buckets: typing.Dict[typing.Hashable, typing.Tuple[float, float]] = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, key: typing.Hashable = None) -> bool:
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated_at = self.buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            allowed = tokens >= 1
+            self.buckets[key] = (tokens - 1 if allowed else tokens, now)
+        return allowed
+
+
+@functools.lru_cache(maxsize=None)
+def get_rate_limiter(rate: float) -> RateLimiter:
+    return RateLimiter(rate)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import typing
+
 try:
     from structlog import get_logger
 except ImportError:
@@ -9,3 +11,15 @@ try:
     from structlog.contextvars import bind_contextvars  # noqa: F401
 except ImportError:
     bind_contextvars = None
+
+
+def is_logger_enabled(logger: typing.Any, level: int) -> bool:
+    # Level methods are looked up on the class, because some structlog loggers proxy any unknown
+    # attribute to the wrapped logger.
+    bind = getattr(logger, 'bind', None)
+    bound_logger = bind() if callable(bind) else logger
+    for method_name in ('is_enabled_for', 'isEnabledFor'):
+        method = getattr(type(bound_logger), method_name, None)
+        if method is not None:
+            return method(bound_logger, level)
+    return True
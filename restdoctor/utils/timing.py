@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import threading
+import time
+import typing
+
+from restdoctor.utils.tracing import is_tracing_enabled, trace_span
+
+if typing.TYPE_CHECKING:
+    from restdoctor.utils.tracing import Span
+
+T = typing.TypeVar('T')
+
+_request_timings: contextvars.ContextVar[typing.Optional[RequestTimings]] = contextvars.ContextVar(
+    'restdoctor_request_timings', default=None,
+)
+
+
+class RequestTimings:
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.durations: typing.Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def add(self, stage: str, duration: float) -> None:
+        with self.lock:
+            self.durations[stage] = self.durations.get(stage, 0.0) + duration
+
+    @contextlib.contextmanager
+    def timer(self, stage: str) -> typing.Iterator[Span]:
+        started_at = time.perf_counter()
+        try:
+            with trace_span(f'restdoctor.{stage}') as span:
+                yield span
+        finally:
+            self.add(stage, time.perf_counter() - started_at)
+
+    def get_durations_ms(self) -> typing.Dict[str, float]:
+        with self.lock:
+            durations = dict(self.durations)
+        durations['total'] = time.perf_counter() - self.started_at
+        return {stage: round(duration * 1000, 3) for stage, duration in durations.items()}
+
+
+def get_server_timing_header(durations_ms: typing.Dict[str, float]) -> str:
+    return ', '.join(f'{stage};dur={duration}' for stage, duration in durations_ms.items())
+
+
+def start_request_timing() -> typing.Tuple[RequestTimings, contextvars.Token]:
+    timings = RequestTimings()
+    return timings, _request_timings.set(timings)
+
+
+def stop_request_timing(token: contextvars.Token) -> None:
+    _request_timings.reset(token)
+
+
+def get_request_timings() -> typing.Optional[RequestTimings]:
+    return _request_timings.get()
+
+
+def stage_timer(stage: str) -> typing.ContextManager[Span]:
+    # Stage is measured for Server-Timing and traced as `restdoctor.<stage>` span, without request
+    # timing and tracer the shared no-op span is returned.
+    timings = _request_timings.get()
+    if timings is None:
+        return trace_span(f'restdoctor.{stage}')
+    return timings.timer(stage)
+
+
+def timed(stage: str, func: typing.Callable[..., T]) -> typing.Callable[..., T]:
+    if _request_timings.get() is None and not is_tracing_enabled():
+        return func
+
+    def timed_func(*args: typing.Any, **kwargs: typing.Any) -> T:
+        with stage_timer(stage):
+            return func(*args, **kwargs)
+
+    return timed_func
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import dataclasses
+import threading
+import time
+import typing
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+try:
+    import sentry_sdk
+except ImportError:
+    sentry_sdk = None
+
+T = typing.TypeVar('T')
+
+_trace_attributes: contextvars.ContextVar[typing.Dict[str, typing.Any]] = contextvars.ContextVar(
+    'restdoctor_trace_attributes', default={},
+)
+_tracers: typing.Dict[str, BaseTracer] = {}
+_tracers_lock = threading.Lock()
+
+
+class Span(typing.Protocol):
+    def set_attribute(self, key: str, value: typing.Any) -> None:
+        ...
+
+
+class NoopSpan:
+    def set_attribute(self, key: str, value: typing.Any) -> None:
+        pass
+
+    def __enter__(self) -> NoopSpan:
+        return self
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        return None
+
+
+noop_span = NoopSpan()
+
+
+class BaseTracer:
+    def start_span(
+        self, name: str, attributes: typing.Dict[str, typing.Any],
+    ) -> typing.ContextManager[Span]:
+        return noop_span
+
+
+@dataclasses.dataclass
+class RecordedSpan:
+    name: str
+    attributes: typing.Dict[str, typing.Any]
+    parent: typing.Optional[RecordedSpan] = None
+    started_at: float = 0.0
+    finished_at: typing.Optional[float] = None
+    error: typing.Optional[BaseException] = None
+
+    def set_attribute(self, key: str, value: typing.Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration(self) -> typing.Optional[float]:
+        if self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+class InMemoryTracer(BaseTracer):
+    """Keeps finished spans in memory, for tests and debugging."""
+
+    def __init__(self) -> None:
+        self.spans: typing.List[RecordedSpan] = []
+        self.lock = threading.Lock()
+        self.current_span: contextvars.ContextVar[typing.Optional[RecordedSpan]]
+        self.current_span = contextvars.ContextVar('restdoctor_in_memory_span', default=None)
+
+    @contextlib.contextmanager
+    def start_span(
+        self, name: str, attributes: typing.Dict[str, typing.Any],
+    ) -> typing.Iterator[RecordedSpan]:
+        span = RecordedSpan(
+            name, dict(attributes), parent=self.current_span.get(), started_at=time.perf_counter(),
+        )
+        token = self.current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.error = exc
+            raise
+        finally:
+            span.finished_at = time.perf_counter()
+            self.current_span.reset(token)
+            with self.lock:
+                self.spans.append(span)
+
+    def get_spans(self, name: str = None) -> typing.List[RecordedSpan]:
+        with self.lock:
+            return [span for span in self.spans if name is None or span.name == name]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.spans.clear()
+
+
+class OpenTelemetryTracer(BaseTracer):
+    def __init__(self, tracer: typing.Any = None) -> None:
+        if tracer is None:
+            if otel_trace is None:
+                raise ImproperlyConfigured('opentelemetry-api is required for OpenTelemetryTracer')
+            tracer = otel_trace.get_tracer('restdoctor')
+        self.tracer = tracer
+
+    def start_span(
+        self, name: str, attributes: typing.Dict[str, typing.Any],
+    ) -> typing.ContextManager[Span]:
+        return self.tracer.start_as_current_span(name, attributes=attributes)
+
+
+class SentrySpan:
+    def __init__(self, span: typing.Any) -> None:
+        self.span = span
+
+    def set_attribute(self, key: str, value: typing.Any) -> None:
+        self.span.set_data(key, value)
+
+
+class SentryTracer(BaseTracer):
+    def __init__(self) -> None:
+        if sentry_sdk is None:
+            raise ImproperlyConfigured('sentry-sdk is required for SentryTracer')
+
+    @contextlib.contextmanager
+    def start_span(
+        self, name: str, attributes: typing.Dict[str, typing.Any],
+    ) -> typing.Iterator[SentrySpan]:
+        with sentry_sdk.start_span(op=name, description=name) as span:
+            sentry_span = SentrySpan(span)
+            for key, value in attributes.items():
+                sentry_span.set_attribute(key, value)
+            yield sentry_span
+
+
+noop_tracer = BaseTracer()
+
+
+def get_tracer() -> BaseTracer:
+    tracer_path = settings.API_TRACER
+    if not tracer_path:
+        return noop_tracer
+    tracer = _tracers.get(tracer_path)
+    if tracer is None:
+        with _tracers_lock:
+            tracer = _tracers.get(tracer_path)
+            if tracer is None:
+                tracer = _tracers[tracer_path] = import_string(tracer_path)()
+    return tracer
+
+
+def is_tracing_enabled() -> bool:
+    return get_tracer() is not noop_tracer
+
+
+def get_trace_attributes() -> typing.Dict[str, typing.Any]:
+    return _trace_attributes.get()
+
+
+def bind_trace_attributes(**attributes: typing.Any) -> contextvars.Token:
+    # Attributes are added to every following span of the request.
+    return _trace_attributes.set({**_trace_attributes.get(), **attributes})
+
+
+def reset_trace_attributes(token: contextvars.Token) -> None:
+    _trace_attributes.reset(token)
+
+
+def trace_span(name: str, **attributes: typing.Any) -> typing.ContextManager[Span]:
+    tracer = get_tracer()
+    if tracer is noop_tracer:
+        return noop_span
+    span_attributes = {
+        key: value
+        for key, value in {**_trace_attributes.get(), **attributes}.items()
+        if value is not None
+    }
+    return tracer.start_span(name, span_attributes)
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import typing
-from typing import List, Optional
-
-from rest_framework.fields import CharField, ListField, MultipleChoiceField, SerializerMethodField
+from typing import Dict, List, Optional
+
+from rest_framework.fields import (
+    CharField,
+    IntegerField,
+    ListField,
+    MultipleChoiceField,
+    SerializerMethodField,
+)
 from rest_framework.serializers import BaseSerializer, ListSerializer, Serializer
 
+from restdoctor.rest_framework.fields import BatchMethodField
 from restdoctor.rest_framework.schema import SchemaWrapper
 from restdoctor.rest_framework.serializers import ModelSerializer
 from tests.stubs.models import MyModel
@@ -129,3 +136,20 @@ class WithMethodFieldSerializer(Serializer):
 
     def get_type_checking_field(self) -> String:
         return ''
+
+
+class MyModelWithBatchFieldSerializer(ModelSerializer):
+    position = SchemaWrapper(
+        BatchMethodField(help_text='Position in batch'), schema_type=IntegerField(allow_null=True)
+    )
+    uuid_hex = BatchMethodField(key=lambda instance: instance.uuid, default='')
+
+    class Meta:
+        model = MyModel
+        fields = ['id', 'position', 'uuid_hex']
+
+    def get_position(self, instances: List[MyModel]) -> Dict[int, Optional[int]]:
+        return {instance.pk: position for position, instance in enumerate(instances)}
+
+    def get_uuid_hex(self, instances: List[MyModel]) -> Dict[str, str]:
+        return {instance.uuid: instance.uuid.hex for instance in instances if instance.uuid}
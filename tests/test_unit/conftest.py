@@ -8,6 +8,7 @@ from django.db.models import TextChoices
 from pytest_factoryboy import register
 
 from restdoctor.rest_framework.pagination import (
+    CursorUUIDBudgetPagination,
     CursorUUIDPagination,
     CursorUUIDUncountedPagination,
     PageNumberPagination,
@@ -54,6 +55,11 @@ def cursor_uuid_uncounted_pagination():
     return CursorUUIDUncountedPagination()
 
 
+@pytest.fixture()
+def cursor_uuid_budget_pagination():
+    return CursorUUIDBudgetPagination()
+
+
 @pytest.fixture()
 def api_prefix() -> str:
     api_prefixes = get_api_path_prefixes()
@@ -6,12 +6,16 @@ from rest_framework.permissions import BasePermission
 from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer, Serializer
 
+from restdoctor.rest_framework.caching import CachePolicy
 from restdoctor.rest_framework.generics import GenericAPIView
+from restdoctor.rest_framework.pagination import CursorUUIDPagination
 from restdoctor.rest_framework.resources import ResourceViewSet
 from restdoctor.rest_framework.schema import SchemaWrapper
 from restdoctor.rest_framework.serializers import ModelSerializer, EmptySerializer
 from restdoctor.rest_framework.views import RetrieveAPIView
 from restdoctor.rest_framework.viewsets import ListModelViewSet, ModelViewSet, ReadOnlyModelViewSet
+from tests.stubs.models import MyModel
+from tests.stubs.serializers import MyModelSerializer
 
 
 class ModelWithoutSensitiveData(models.Model):
@@ -201,3 +205,27 @@ class RWViewSet(ModelViewSet):
 
 class ComplexResourceViewSet(ResourceViewSet):
     resource_views_map = {'read_only': ROViewSet, 'read_write': RWViewSet}
+
+
+class PrefetchCursorViewSet(ListModelViewSet):
+    serializer_class = MyModelSerializer
+    queryset = MyModel.objects.all()
+    pagination_class = CursorUUIDPagination
+    prefetch_next_page = True
+
+
+class CachedMyModelViewSet(ReadOnlyModelViewSet):
+    serializer_class = MyModelSerializer
+    queryset = MyModel.objects.all()
+    object_cache_timeout = 60
+
+
+class CachedListMyModelViewSet(ListModelViewSet):
+    serializer_class = MyModelSerializer
+    queryset = MyModel.objects.all()
+    cache_policy_map = {'list': CachePolicy(timeout=60)}
+
+
+class CachedUserListMyModelViewSet(CachedListMyModelViewSet):
+    def get_queryset(self):
+        return MyModel.objects.filter(pk=self.request.user.pk)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+from django.core.cache import cache
+
+from restdoctor.utils.media_type import get_canonical_media_type, parse_accept
+
+CACHE_MIDDLEWARE = [
+    'restdoctor.django.middleware.cache.UpdateCacheMiddleware',
+    'restdoctor.django.middleware.api_selector.ApiSelectorMiddleware',
+    'restdoctor.django.middleware.cache.FetchFromCacheMiddleware',
+]
+
+
+@pytest.mark.parametrize(
+    ('first_accept', 'second_accept', 'is_equal'),
+    [
+        ('application/vnd.vendor.v1', 'application/vnd.vendor.v1.full+json', True),
+        ('application/vnd.vendor.v1.full+json', 'application/vnd.vendor.v1.full+xml', True),
+        ('application/vnd.vendor.v1', 'application/vnd.vendor.v1-extended', False),
+        ('application/json', 'text/html', False),
+    ],
+)
+def test_get_canonical_media_type(settings, first_accept, second_accept, is_equal):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+
+    first = get_canonical_media_type(parse_accept(first_accept, vendor='vendor'))
+    second = get_canonical_media_type(parse_accept(second_accept, vendor='vendor'))
+
+    assert (first == second) is is_equal
+
+
+@pytest.mark.django_db()
+def test_cache_middleware_shares_entry_for_equal_accept(
+    settings, client, api_prefix, n_models, django_assert_num_queries
+):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    settings.MIDDLEWARE = CACHE_MIDDLEWARE
+    cache.clear()
+    n_models(2)
+    response = client.get(f'/{api_prefix}mymodel/', HTTP_ACCEPT='application/vnd.vendor.v1')
+
+    with django_assert_num_queries(0):
+        cached_response = client.get(
+            f'/{api_prefix}mymodel/', HTTP_ACCEPT='application/vnd.vendor.v1.full+json',
+        )
+
+    vary_headers = [header.strip() for header in response['Vary'].split(',')]
+    assert 'X-Vendor-Media-Type' in vary_headers
+    assert 'Accept' not in vary_headers
+    assert cached_response.content == response.content
+
+
+def test_api_selector_canonical_vary(settings, client, api_prefix):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    settings.API_CANONICAL_VARY = True
+
+    response = client.get(f'/{api_prefix}empty_v1', HTTP_ACCEPT='application/vnd.vendor.v1')
+
+    vary_headers = [header.strip() for header in response['Vary'].split(',')]
+    assert 'X-Vendor-Media-Type' in vary_headers
+    assert 'Accept' not in vary_headers
@@ -0,0 +1,182 @@
+import types
+
+import pytest
+from django.core.cache import cache
+from django.db.models.signals import post_delete
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from restdoctor.rest_framework.caching import (
+    CachePolicy,
+    get_object_cache_stats,
+    get_response_cache_stats,
+)
+from tests.stubs.models import MyModel
+from tests.test_unit.stubs import (
+    CachedListMyModelViewSet,
+    CachedMyModelViewSet,
+    CachedUserListMyModelViewSet,
+)
+
+
+@pytest.fixture()
+def retrieve_view():
+    cache.clear()
+    view = CachedMyModelViewSet.as_view({'get': 'retrieve'})
+
+    def retrieve(pk):
+        return view(APIRequestFactory().get(f'/{pk}/'), pk=pk)
+
+    return retrieve
+
+
+@pytest.mark.django_db()
+def test_object_cache_hit(retrieve_view, n_models, mocker, django_assert_num_queries):
+    my_model = n_models(1)[0]
+    check_object_permissions = mocker.spy(CachedMyModelViewSet, 'check_object_permissions')
+    retrieve_view(my_model.pk)
+    hits = get_object_cache_stats()['hits']
+
+    with django_assert_num_queries(0):
+        response = retrieve_view(my_model.pk)
+
+    assert response.data == {'uuid': str(my_model.uuid)}
+    assert get_object_cache_stats()['hits'] == hits + 1
+    assert check_object_permissions.call_count == 2
+
+
+@pytest.mark.django_db()
+def test_object_cache_invalidated_on_save(
+    retrieve_view, n_models, django_assert_num_queries, django_capture_on_commit_callbacks,
+):
+    my_model = n_models(1)[0]
+    retrieve_view(my_model.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        my_model.uuid = None
+        my_model.save()
+
+    with django_assert_num_queries(1):
+        response = retrieve_view(my_model.pk)
+
+    assert response.data == {'uuid': None}
+
+
+@pytest.mark.django_db()
+def test_object_cache_invalidated_on_delete(
+    retrieve_view, n_models, django_assert_num_queries, django_capture_on_commit_callbacks,
+):
+    my_model = n_models(1)[0]
+    retrieve_view(my_model.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post_delete.send(sender=MyModel, instance=my_model)
+
+    with django_assert_num_queries(1):
+        retrieve_view(my_model.pk)
+
+
+@pytest.mark.django_db()
+def test_object_cache_not_invalidated_before_commit(
+    retrieve_view, n_models, django_assert_num_queries, django_capture_on_commit_callbacks,
+):
+    my_model = n_models(1)[0]
+    retrieve_view(my_model.pk)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        my_model.save()
+        with django_assert_num_queries(0):
+            retrieve_view(my_model.pk)
+
+    assert len(callbacks) == 1
+
+
+@pytest.fixture()
+def list_view():
+    cache.clear()
+    view = CachedListMyModelViewSet.as_view({'get': 'list'})
+
+    def get_list(**query_params):
+        return view(APIRequestFactory().get('/', query_params))
+
+    return get_list
+
+
+@pytest.mark.django_db()
+def test_response_cache_hit(list_view, n_models, django_assert_num_queries):
+    n_models(3)
+    response = list_view()
+    hits = get_response_cache_stats()['hits']
+
+    with django_assert_num_queries(0):
+        cached_response = list_view()
+
+    assert cached_response.content == response.content
+    assert cached_response['Content-Type'] == response['Content-Type']
+    assert get_response_cache_stats()['hits'] == hits + 1
+
+
+@pytest.mark.django_db()
+def test_response_cache_varies_by_query(list_view, n_models, django_assert_num_queries):
+    n_models(3)
+    list_view(per_page=1)
+
+    with django_assert_num_queries(2):
+        response = list_view(per_page=2)
+
+    assert len(response.data) == 2
+
+
+@pytest.mark.django_db()
+def test_response_cache_invalidated_on_save(
+    list_view, n_models, django_assert_num_queries, django_capture_on_commit_callbacks,
+):
+    n_models(3)
+    list_view()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        n_models(1)
+
+    with django_assert_num_queries(2):
+        response = list_view()
+
+    assert response.meta['total'] == 4
+
+
+def test_cache_policy_unknown_vary_by():
+    with pytest.raises(ValueError, match='language'):
+        CachePolicy(timeout=1, vary_by=['query', 'language'])
+
+
+def test_cache_policy_without_audience():
+    with pytest.raises(ValueError, match='user, scope'):
+        CachePolicy(timeout=1, vary_by=['query'])
+
+
+@pytest.mark.django_db()
+def test_response_cache_varies_by_user(n_models):
+    cache.clear()
+    first_model, second_model = n_models(2)
+    view = CachedUserListMyModelViewSet.as_view({'get': 'list'})
+
+    def get_list(user_pk):
+        request = APIRequestFactory().get('/')
+        force_authenticate(request, user=types.SimpleNamespace(pk=user_pk, is_authenticated=True))
+        return view(request)
+
+    get_list(first_model.pk)
+    response = get_list(second_model.pk)
+
+    assert response.data == [{'uuid': str(second_model.uuid)}]
+
+
+@pytest.mark.django_db()
+def test_response_cache_finalizes_response_once(list_view, n_models, mocker):
+    n_models(1)
+    finalize_response = mocker.spy(CachedListMyModelViewSet, 'finalize_response')
+
+    response = list_view()
+    cached_response = list_view()
+
+    assert finalize_response.call_count == 2
+    assert cached_response.content == response.content
+    assert cached_response['Vary'] == response['Vary']
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+from django.db import transaction
+from rest_framework import serializers
+from rest_framework.request import Request
+
+from restdoctor.rest_framework.pagination import CursorUUIDPagination, PageNumberPagination
+from restdoctor.utils.concurrency import run_concurrently
+from tests.stubs.views import MyModelViewSet
+
+
+def _get_thread_name():
+    return threading.current_thread().name
+
+
+class ThreadNameMetaSerializer(serializers.Serializer):
+    meta_data_thread = serializers.CharField()
+    serializer_thread = serializers.SerializerMethodField()
+
+    def get_serializer_thread(self, instance):
+        return _get_thread_name()
+
+
+def test_run_concurrently_disabled():
+    results = run_concurrently(_get_thread_name, _get_thread_name, enabled=False)
+
+    assert results == [threading.current_thread().name] * 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_concurrently_uses_worker_threads():
+    submitted_thread_name, last_thread_name = run_concurrently(_get_thread_name, _get_thread_name)
+
+    assert submitted_thread_name.startswith('restdoctor-queries')
+    assert last_thread_name == threading.current_thread().name
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_concurrently_sequential_in_atomic_block():
+    with transaction.atomic():
+        results = run_concurrently(_get_thread_name, _get_thread_name)
+
+    assert results == [threading.current_thread().name] * 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_concurrently_sequential_in_worker_thread():
+    results = run_concurrently(lambda: run_concurrently(_get_thread_name, _get_thread_name), list)
+
+    assert len(set(results[0])) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_concurrently_waits_submitted_on_error():
+    started, finished = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.05)
+        finished.set()
+
+    def fail():
+        started.wait(1)
+        raise ValueError('failed')
+
+    with pytest.raises(ValueError):
+        run_concurrently(slow, fail)
+
+    assert finished.is_set()
+
+
+@pytest.mark.parametrize('pagination_class', (PageNumberPagination, CursorUUIDPagination))
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_pagination(mocker, rf, n_models, my_models_queryset, pagination_class):
+    n_models(15)
+    view = mocker.Mock(concurrent_queries=True)
+    request = Request(rf.get('/endpoint', data={'per_page': 10}))
+    pagination = pagination_class()
+
+    paginated = pagination.paginate_queryset(my_models_queryset, request, view=view)
+
+    assert len(paginated) == 10
+    assert pagination.total == 15
+    assert pagination.has_next
+
+
+@pytest.mark.django_db(transaction=True)
+def test_list_concurrent_queries(mocker, settings, client, api_prefix, n_models):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    mocker.patch.object(MyModelViewSet, 'concurrent_queries', True)
+    n_models(3)
+
+    response = client.get(f'/{api_prefix}mymodel/', HTTP_ACCEPT='application/vnd.vendor.v1')
+
+    assert response.status_code == 200
+    assert len(response.json()['data']) == 3
+    assert response.json()['meta']['total'] == 3
+
+
+@pytest.mark.django_db(transaction=True)
+def test_list_concurrent_meta_prepared_in_request_thread(mocker, settings, client, api_prefix, n_models):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    mocker.patch.object(MyModelViewSet, 'concurrent_queries', True)
+    mocker.patch.object(MyModelViewSet, 'get_meta_serializer_class', return_value=ThreadNameMetaSerializer)
+    mocker.patch.object(
+        MyModelViewSet, 'get_meta_data', side_effect=lambda: {'meta_data_thread': _get_thread_name()},
+    )
+    n_models(3)
+
+    response = client.get(f'/{api_prefix}mymodel/', HTTP_ACCEPT='application/vnd.vendor.v1')
+
+    meta = response.json()['meta']
+    assert meta['meta_data_thread'] == threading.current_thread().name
+    assert meta['serializer_thread'].startswith('restdoctor-queries')
@@ -3,8 +3,12 @@ import datetime
 import pytest
 import pytz
 from django.utils.timezone import make_aware
+from rest_framework.request import Request
 
-from restdoctor.rest_framework.fields import DateTimeField
+from restdoctor.rest_framework.fields import BatchMethodField, DateTimeField
+from restdoctor.rest_framework.serializers import ListSerializer, ModelSerializer
+from tests.stubs.models import MyModel
+from tests.stubs.serializers import MyModelWithBatchFieldSerializer
 
 
 @pytest.mark.parametrize(
@@ -21,3 +25,63 @@ def test_datetime_field_to_representation(
     datetime_obj, expected_string_representation,
 ):
     assert DateTimeField().to_representation(datetime_obj) == expected_string_representation
+
+
+@pytest.mark.django_db
+def test_batch_method_field_resolved_once_for_list(n_models, mocker):
+    my_models = n_models(3)
+    spy = mocker.spy(MyModelWithBatchFieldSerializer, 'get_position')
+
+    data = MyModelWithBatchFieldSerializer(my_models, many=True).data
+
+    assert spy.call_count == 1
+    assert [item['position'] for item in data] == [0, 1, 2]
+    assert [item['uuid_hex'] for item in data] == [my_model.uuid.hex for my_model in my_models]
+
+
+@pytest.mark.django_db
+def test_batch_method_field_single_instance_and_default(n_models):
+    my_model = n_models(1, uuid=None)[0]
+
+    data = MyModelWithBatchFieldSerializer(my_model).data
+
+    assert data['position'] == 0
+    assert data['uuid_hex'] == ''
+
+
+def test_batch_method_field_uses_restdoctor_list_serializer():
+    serializer = MyModelWithBatchFieldSerializer(many=True)
+
+    assert isinstance(serializer, ListSerializer)
+
+
+def test_batch_method_field_keeps_declared_meta():
+    class Meta:
+        model = MyModel
+        fields = ['id', 'position']
+
+    BatchSerializer = type(
+        'BatchSerializer', (ModelSerializer,), {'position': BatchMethodField(), 'Meta': Meta},
+    )
+
+    assert not hasattr(Meta, 'list_serializer_class')
+    assert BatchSerializer.Meta.list_serializer_class is ListSerializer
+    assert BatchSerializer.Meta.fields == ['id', 'position']
+
+
+@pytest.mark.django_db
+def test_batch_method_field_with_budget_pagination(
+    n_models, rf, mocker, cursor_uuid_budget_pagination, my_models_queryset,
+):
+    n_models(15)
+    cursor_uuid_budget_pagination.budget_chunk_size = 4
+    spy = mocker.spy(MyModelWithBatchFieldSerializer, 'get_uuid_hex')
+    request = Request(rf.get('/endpoint', data={'per_page': 10}))
+
+    paginated = cursor_uuid_budget_pagination.paginate_queryset(my_models_queryset, request)
+    data = cursor_uuid_budget_pagination.get_serializer_data(
+        MyModelWithBatchFieldSerializer(paginated, many=True)
+    )
+
+    assert spy.call_count == 3
+    assert [item['uuid_hex'] for item in data] == [my_model.uuid.hex for my_model in paginated]
@@ -0,0 +1,116 @@
+import contextvars
+import logging
+
+import pytest
+
+from restdoctor.utils import log_queue as log_queue_module
+from restdoctor.utils.log_queue import LogQueue, QueuedLogger, get_queued_logger, snapshot_log_value
+
+request_id = contextvars.ContextVar('request_id', default=None)
+
+
+@pytest.fixture()
+def log_queue():
+    log_queue = LogQueue(max_size=2)
+    yield log_queue
+    log_queue.stop()
+
+
+def test_log_queue_writes_in_background(log_queue, mocker):
+    logger = mocker.Mock()
+    queued_logger = QueuedLogger(logger, log_queue)
+
+    queued_logger.info('view_initial', request_data={'id': 1})
+
+    assert log_queue.flush(timeout=5)
+    logger.info.assert_called_once_with('view_initial', request_data={'id': 1})
+    assert log_queue.get_stats() == {'queued': 1, 'written': 1, 'dropped': 0, 'errors': 0, 'size': 0}
+
+
+def test_log_queue_keeps_context_vars(log_queue):
+    written_request_ids = []
+    request_id.set('abc')
+
+    log_queue.put(lambda: written_request_ids.append(request_id.get()), '__call__', (), {})
+
+    assert log_queue.flush(timeout=5)
+    assert written_request_ids == ['abc']
+
+
+def test_log_queue_drops_oldest_on_overflow(log_queue, mocker):
+    logger = mocker.Mock()
+    mocker.patch.object(log_queue, '_start_writer')
+
+    for number in range(3):
+        log_queue.put(logger, 'info', (f'event_{number}',), {})
+
+    assert [record[2] for record in log_queue.records] == [('event_1',), ('event_2',)]
+    assert log_queue.get_stats()['dropped'] == 1
+
+
+def test_log_queue_counts_errors(log_queue, mocker):
+    logger = mocker.Mock()
+    logger.info.side_effect = ValueError
+
+    log_queue.put(logger, 'info', ('event',), {})
+
+    assert log_queue.flush(timeout=5)
+    assert log_queue.get_stats()['errors'] == 1
+
+
+def test_log_queue_stop_flushes_records(mocker):
+    log_queue = LogQueue(max_size=10)
+    logger = mocker.Mock()
+    for number in range(5):
+        log_queue.put(logger, 'info', (f'event_{number}',), {})
+
+    log_queue.stop()
+
+    assert logger.info.call_count == 5
+    assert not log_queue.thread.is_alive()
+
+
+@pytest.mark.parametrize(('log_queue_size', 'expected_queued'), [(None, False), (10, True)])
+def test_get_queued_logger(settings, mocker, log_queue_size, expected_queued):
+    settings.API_LOG_QUEUE_SIZE = log_queue_size
+    mocker.patch.object(log_queue_module, '_log_queue', None)
+    logger = mocker.Mock()
+
+    queued_logger = get_queued_logger(logger)
+
+    assert isinstance(queued_logger, QueuedLogger) is expected_queued
+
+
+def test_log_queue_writes_stdlib_logger_fields_as_extra(log_queue, caplog):
+    caplog.set_level(logging.INFO, logger='restdoctor.tests')
+    queued_logger = QueuedLogger(logging.getLogger('restdoctor.tests'), log_queue)
+
+    queued_logger.info('view_initial', request_data={'id': 1}, api_view_name='MyView')
+
+    assert log_queue.flush(timeout=5)
+    assert log_queue.get_stats()['errors'] == 0
+    record = caplog.records[-1]
+    assert record.getMessage() == 'view_initial'
+    assert record.request_data == {'id': 1}
+    assert record.api_view_name == 'MyView'
+
+
+def test_queued_logger_snapshots_payload(log_queue, mocker):
+    mocker.patch.object(log_queue, '_start_writer')
+    request_data = {'items': [{'id': 1}]}
+    queued_logger = QueuedLogger(mocker.Mock(), log_queue)
+
+    queued_logger.info('view_initial', request_data=request_data)
+    request_data['items'][0]['id'] = 2
+
+    assert log_queue.records[0][3] == {'request_data': {'items': [{'id': 1}]}}
+
+
+def test_snapshot_log_value():
+    value = {'a': ({'b': 1},), 'c': object, 'd': None}
+
+    result = snapshot_log_value(value)
+
+    assert result == {'a': [{'b': 1}], 'c': repr(object), 'd': None}
+    assert list(result) == ['a', 'c', 'd']
+    assert result['a'][0] is not value['a'][0]
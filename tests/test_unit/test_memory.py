@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import tracemalloc
+
+import pytest
+
+from restdoctor.utils.memory import track_memory
+
+
+def allocate(size):
+    return bytearray(size)
+
+
+def test_track_memory_records_peak_and_sites():
+    with track_memory(top_limit=3) as memory_usage:
+        data = allocate(1024 * 1024)
+        del data
+
+    assert not tracemalloc.is_tracing()
+    assert memory_usage.peak_bytes >= 1024 * 1024
+    assert memory_usage.allocated_bytes < 1024 * 1024
+    assert len(memory_usage.top_sites) <= 3
+    assert memory_usage.top_tracebacks == []
+
+
+def test_track_memory_detailed_snapshot(tmp_path):
+    with track_memory(
+        frames=3, detail_threshold=1024 * 1024, snapshot_dir=str(tmp_path),
+    ) as memory_usage:
+        data = allocate(2 * 1024 * 1024)
+
+    assert memory_usage.top_tracebacks[0]['size_bytes'] >= len(data)
+    assert len(memory_usage.top_tracebacks[0]['traceback']) > 1
+    assert tracemalloc.Snapshot.load(memory_usage.snapshot_path).traces
+
+
+def test_track_memory_is_not_nested():
+    with track_memory() as memory_usage, track_memory() as nested_memory_usage:
+        pass
+
+    assert memory_usage is not None
+    assert nested_memory_usage is None
+
+
+@pytest.mark.django_db()
+def test_view_memory_event(settings, client, api_prefix, n_models, mocker):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    settings.API_MEMORY_TRACKING_SAMPLE_RATE = 1.0
+    logger = mocker.patch('restdoctor.rest_framework.views.logger')
+    n_models(3)
+
+    response = client.get(f'/{api_prefix}mymodel/', HTTP_ACCEPT='application/vnd.vendor.v1')
+
+    assert response.memory_usage.peak_bytes > 0
+    (event,), fields = logger.info.call_args
+    assert event == 'view_memory'
+    assert fields['api_view_name'] == 'MyModelViewSet'
+    assert fields['api_view_action'] == 'list'
+    assert fields['top_sites']
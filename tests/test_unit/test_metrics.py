@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import types
+
+import pytest
+
+from restdoctor.django.middleware.metrics import get_api_labels
+from restdoctor.utils.metrics import (
+    API_METRICS,
+    OVERFLOW_LABEL_VALUE,
+    Metric,
+    MetricsRegistry,
+    MultiprocessMetricsRegistry,
+)
+
+
+def make_registry(registry_class=MetricsRegistry, **kwargs):
+    registry = registry_class(**kwargs)
+    registry.register(Metric('requests_total', 'counter', 'Requests.', label_names=('view',)))
+    registry.register(
+        Metric('duration_seconds', 'histogram', 'Duration.', label_names=('view',), buckets=(0.1, 1.0))
+    )
+    return registry
+
+
+def test_registry_exposition():
+    registry = make_registry(max_label_sets=10)
+
+    registry.inc('requests_total', ('My"View',))
+    registry.observe('duration_seconds', ('MyView',), 0.05)
+    registry.observe('duration_seconds', ('MyView',), 0.5)
+    registry.observe('duration_seconds', ('MyView',), 5)
+
+    assert registry.generate_latest().splitlines() == [
+        '# HELP requests_total Requests.',
+        '# TYPE requests_total counter',
+        'requests_total{view="My\\"View"} 1.0',
+        '# HELP duration_seconds Duration.',
+        '# TYPE duration_seconds histogram',
+        'duration_seconds_bucket{view="MyView",le="0.1"} 1.0',
+        'duration_seconds_bucket{view="MyView",le="1.0"} 2.0',
+        'duration_seconds_bucket{view="MyView",le="+Inf"} 3.0',
+        'duration_seconds_sum{view="MyView"} 5.55',
+        'duration_seconds_count{view="MyView"} 3.0',
+    ]
+
+
+def test_registry_label_sets_limit():
+    registry = make_registry(max_label_sets=2)
+
+    for view_name in ('first', 'second', 'third', 'fourth', 'first'):
+        registry.inc('requests_total', (view_name,))
+
+    assert registry.collect()['requests_total'] == {
+        ('first',): 2.0,
+        ('second',): 1.0,
+        (OVERFLOW_LABEL_VALUE,): 2.0,
+    }
+
+
+def test_multiprocess_registry_merges_processes(tmp_path, mocker):
+    first = make_registry(MultiprocessMetricsRegistry, directory=str(tmp_path), max_label_sets=10)
+    first.inc('requests_total', ('MyView',))
+    first.observe('duration_seconds', ('MyView',), 0.5)
+    getpid = mocker.patch('os.getpid', return_value=first.pid + 1)
+    second = make_registry(MultiprocessMetricsRegistry, directory=str(tmp_path), max_label_sets=10)
+    second.inc('requests_total', ('MyView',), 2)
+    second.observe('duration_seconds', ('MyView',), 0.05)
+    second.flush()
+    mocker.stop(getpid)
+
+    values = first.collect()
+
+    assert values['requests_total'] == {('MyView',): 3.0}
+    assert values['duration_seconds'] == {('MyView',): [1, 1, 0, 0.55]}
+
+
+@pytest.mark.django_db()
+def test_metrics_middleware(settings, client, api_prefix, n_models, mocker):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    settings.MIDDLEWARE = [
+        *settings.MIDDLEWARE, 'restdoctor.django.middleware.metrics.MetricsMiddleware',
+    ]
+    registry = MetricsRegistry(max_label_sets=10)
+    for metric in API_METRICS:
+        registry.register(metric)
+    mocker.patch(
+        'restdoctor.django.middleware.metrics.get_metrics_registry', return_value=registry,
+    )
+    n_models(2)
+
+    client.get(f'/{api_prefix}mymodel/', HTTP_ACCEPT='application/vnd.vendor.v1-extended')
+
+    labels = ('v1', 'full', 'extended', 'MyModelExtendedViewSet', 'list')
+    values = registry.collect()
+    assert values['restdoctor_requests_total'] == {(*labels, '2xx'): 1.0}
+    assert values['restdoctor_errors_total'] == {}
+    assert labels in values['restdoctor_request_duration_seconds']
+    assert values['restdoctor_db_queries'][labels][-1] >= 1
+    assert values['restdoctor_response_size_bytes'][labels][-1] > 0
+
+
+@pytest.mark.parametrize(
+    ('api_format', 'expected_format'), [('full', 'full'), (None, 'full'), ('random', 'other')],
+)
+def test_get_api_labels_format(settings, rf, api_format, expected_format):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    request = rf.get('/')
+    request.api_params = types.SimpleNamespace(version='v2', format=api_format)
+
+    assert get_api_labels(request) == ('unknown', expected_format, '', 'unknown', 'unknown')
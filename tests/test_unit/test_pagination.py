@@ -1,8 +1,14 @@
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.exceptions import NotFound
 from rest_framework.request import Request
 
 from restdoctor.constants import DEFAULT_MAX_PAGE_SIZE, DEFAULT_PAGE_SIZE
+from restdoctor.rest_framework.pagination.page_number import get_queryset_seek_key
+from tests.stubs.models import MyModel
+from tests.stubs.serializers import MyModelSerializer
 
 
 @pytest.mark.parametrize(
@@ -353,3 +359,142 @@ def test_cursor_uuid_pagination_get_empty_response_success_case(
     assert 'before_url' in meta
     assert 'after' in meta['after_url']
     assert 'before' in meta['before_url']
+
+
+@pytest.mark.parametrize(
+    'ordering,expected_seek_key',
+    (
+        (('id',), ('id', False)),
+        (('-pk',), ('id', True)),
+        (('timestamp',), None),
+        (('uuid',), None),
+        (('id', 'timestamp'), None),
+        ((), None),
+    ),
+)
+def test_get_queryset_seek_key(ordering, expected_seek_key):
+    queryset = MyModel.objects.order_by(*ordering)
+
+    assert get_queryset_seek_key(queryset) == expected_seek_key
+
+
+@pytest.mark.django_db
+def test_page_number_pagination_max_offset_fail_case(
+    rf, n_models, page_number_pagination, my_models_queryset,
+):
+    n_models(15)
+    page_number_pagination.max_offset = 5
+    request = Request(rf.get('/endpoint', data={'page': 3, 'per_page': 5}))
+
+    with pytest.raises(NotFound):
+        page_number_pagination.paginate_queryset(my_models_queryset.order_by('id'), request)
+
+
+@pytest.mark.django_db
+def test_page_number_pagination_seek_from_page_boundary(
+    rf, n_models, page_number_pagination, my_models_queryset,
+):
+    cache.clear()
+    models = n_models(15)
+    page_number_pagination.max_offset = 0
+    page_number_pagination.seek_offset_threshold = 5
+    queryset = my_models_queryset.order_by('id')
+    page_number_pagination.paginate_queryset(queryset, Request(rf.get('/endpoint', data={'per_page': 5})))
+    request = Request(rf.get('/endpoint', data={'page': 2, 'per_page': 5}))
+
+    with CaptureQueriesContext(connection) as queries:
+        paginated = page_number_pagination.paginate_queryset(queryset, request)
+
+    assert paginated == models[5:10]
+    assert page_number_pagination.has_next
+    assert 'OFFSET' not in queries.captured_queries[-1]['sql']
+
+
+@pytest.mark.django_db
+def test_page_number_pagination_seek_fingerprints_queryset_once(
+    rf, n_models, page_number_pagination, my_models_queryset, mocker,
+):
+    cache.clear()
+    n_models(15)
+    page_number_pagination.seek_offset_threshold = 5
+    page_number_pagination.page_boundary_lookbehind = 10
+    get_queryset_fingerprint = mocker.patch(
+        'restdoctor.rest_framework.pagination.page_number.get_queryset_fingerprint',
+        return_value='fingerprint',
+    )
+    request = Request(rf.get('/endpoint', data={'page': 3, 'per_page': 5}))
+
+    page_number_pagination.paginate_queryset(my_models_queryset.order_by('id'), request)
+
+    assert get_queryset_fingerprint.call_count == 1
+
+
+@pytest.mark.django_db
+def test_page_number_pagination_seek_without_page_boundary_fail_case(
+    rf, n_models, page_number_pagination, my_models_queryset,
+):
+    cache.clear()
+    n_models(15)
+    page_number_pagination.max_offset = 5
+    page_number_pagination.seek_offset_threshold = 5
+    request = Request(rf.get('/endpoint', data={'page': 3, 'per_page': 5}))
+
+    with pytest.raises(NotFound):
+        page_number_pagination.paginate_queryset(my_models_queryset.order_by('id'), request)
+
+
+@pytest.mark.parametrize(
+    'max_page_bytes,expected_size,expected_has_next',
+    (
+        (100, 2, True),
+        (1, 1, True),
+        (10_000, 10, True),
+    ),
+)
+@pytest.mark.django_db
+def test_cursor_uuid_budget_pagination_get_serializer_data(
+    n_models, rf, cursor_uuid_budget_pagination, my_models_queryset,
+    max_page_bytes, expected_size, expected_has_next,
+):
+    messages = n_models(15)
+    cursor_uuid_budget_pagination.max_page_bytes = max_page_bytes
+    request = Request(rf.get('/endpoint', data={'per_page': 10}))
+
+    paginated = cursor_uuid_budget_pagination.paginate_queryset(my_models_queryset, request)
+    data = cursor_uuid_budget_pagination.get_serializer_data(MyModelSerializer(paginated, many=True))
+    meta = cursor_uuid_budget_pagination.get_paginated_response(data).meta
+
+    assert len(data) == expected_size
+    assert meta['has_next'] == expected_has_next
+    assert meta['total'] == 15
+    assert str(messages[-expected_size].uuid) in meta['before_url']
+
+
+@pytest.mark.django_db
+def test_cursor_uuid_budget_pagination_boundary_from_serialized_items(
+    n_models, rf, cursor_uuid_budget_pagination, my_models_queryset,
+):
+    n_models(15)
+    cursor_uuid_budget_pagination.max_page_bytes = 100
+    request = Request(rf.get('/endpoint', data={'per_page': 10}))
+
+    paginated = cursor_uuid_budget_pagination.paginate_queryset(my_models_queryset, request)
+    prepared = list(reversed(paginated))
+    data = cursor_uuid_budget_pagination.get_serializer_data(MyModelSerializer(prepared, many=True))
+
+    assert len(data) == 2
+    assert cursor_uuid_budget_pagination.page_boundaries[1] == prepared[1].uuid
+
+
+@pytest.mark.django_db
+def test_cursor_uuid_budget_pagination_fits_budget(
+    n_models, rf, cursor_uuid_budget_pagination, my_models_queryset,
+):
+    n_models(3)
+    request = Request(rf.get('/endpoint', data={'per_page': 10}))
+
+    paginated = cursor_uuid_budget_pagination.paginate_queryset(my_models_queryset, request)
+    data = cursor_uuid_budget_pagination.get_serializer_data(MyModelSerializer(paginated, many=True))
+
+    assert len(data) == 3
+    assert not cursor_uuid_budget_pagination.has_next
@@ -0,0 +1,45 @@
+import pytest
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from restdoctor.rest_framework.pagination.links import PageLinkTemplate
+
+
+@pytest.mark.parametrize(
+    'url',
+    (
+        'http://testserver/endpoint',
+        'http://testserver/endpoint?page=3&per_page=10',
+        'http://testserver/endpoint?z=1&a=2&a=3&view_type=extended',
+        'http://testserver/endpoint?q=%D1%82%D0%B5%D1%81%D1%82+x&empty=&flag#anchor',
+        '/relative/path?after=abc&before=def',
+    ),
+)
+@pytest.mark.parametrize('value', (1, 'a b/c', ''))
+def test_page_link_template_same_as_query_param_utils(url, value):
+    base_url = replace_query_param(url, 'per_page', 20)
+    expected_link = replace_query_param(remove_query_param(base_url, 'before'), 'after', value)
+    link_template = PageLinkTemplate(url, per_page=20)
+
+    assert link_template.url == base_url
+    assert link_template.get_link('page', value) == replace_query_param(base_url, 'page', value)
+    assert link_template.get_link('after', value, remove_params=['before']) == expected_link
+
+
+@pytest.mark.django_db
+def test_page_number_pagination_links_preserve_resource_params(
+    rf, n_models, page_number_pagination, my_models_queryset,
+):
+    n_models(15)
+    request = Request(rf.get('/endpoint', data={'page': 2, 'per_page': 5, 'view_type': 'extended'}))
+
+    page_number_pagination.paginate_queryset(my_models_queryset, request)
+    meta = page_number_pagination.get_paginated_response([]).meta
+
+    assert meta['url'] == 'http://testserver/endpoint?page=2&per_page=5&view_type=extended'
+    assert meta['next_url'] == 'http://testserver/endpoint?page=3&per_page=5&view_type=extended'
+    assert meta['prev_url'] == 'http://testserver/endpoint?page=1&per_page=5&view_type=extended'
+    assert meta['last_url'] == 'http://testserver/endpoint?page=3&per_page=5&view_type=extended'
+    assert page_number_pagination.get_page_link_tmpl() == replace_query_param(
+        request.build_absolute_uri(), 'per_page', 5,
+    )
@@ -0,0 +1,142 @@
+import threading
+import time
+
+import pytest
+from django.contrib.auth.models import User
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from restdoctor.rest_framework.prefetch import (
+    PrefetchCache,
+    PrefetchedResponse,
+    build_prefetch_request,
+    get_prefetch_executor,
+    get_prefetch_stats,
+)
+from tests.test_unit.stubs import PrefetchCursorViewSet
+
+
+def _make_entry(content, ttl=30):
+    return PrefetchedResponse(
+        content=content, status=200, headers=(), next_url=None, expires_at=time.monotonic() + ttl,
+    )
+
+
+@pytest.fixture()
+def prefetch_cache(mocker):
+    cache = PrefetchCache(max_bytes=1024 * 1024, ttl=30)
+    mocker.patch('restdoctor.rest_framework.prefetch.get_prefetch_cache', return_value=cache)
+    return cache
+
+
+def test_prefetch_cache_get_is_one_shot():
+    cache = PrefetchCache(max_bytes=100, ttl=30)
+    cache.set(('key',), _make_entry(b'content'))
+
+    assert cache.get(('key',)).content == b'content'
+    assert cache.get(('key',)) is None
+    assert cache.get_stats()['hit_rate'] == 0.5
+
+
+def test_prefetch_cache_expired_entry():
+    cache = PrefetchCache(max_bytes=100, ttl=30)
+    cache.set(('key',), _make_entry(b'content', ttl=-1))
+
+    assert cache.get(('key',)) is None
+    assert cache.get_stats()['misses'] == 1
+
+
+def test_prefetch_cache_memory_cap():
+    cache = PrefetchCache(max_bytes=10, ttl=30)
+
+    cache.set(('first',), _make_entry(b'x' * 6))
+    cache.set(('second',), _make_entry(b'x' * 6))
+    cache.set(('too_big',), _make_entry(b'x' * 11))
+
+    assert list(cache.entries) == [('second',)]
+    assert cache.size == 6
+    assert cache.get_stats()['evicted'] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_list_next_page_served_from_prefetch(mocker, n_models, prefetch_cache):
+    n_models(15)
+    submit_spy = mocker.spy(get_prefetch_executor(), 'submit')
+    view = PrefetchCursorViewSet.as_view({'get': 'list'})
+    factory = APIRequestFactory()
+
+    first_response = view(factory.get('/endpoint', {'per_page': 5}))
+    first_response.render()
+    submit_spy.spy_return.result()
+    next_url = first_response.meta['before_url']
+    prefetched_response = view(factory.get(next_url))
+    mocker.patch.object(PrefetchCursorViewSet, 'prefetch_next_page', False)
+    expected_response = view(factory.get(next_url))
+    expected_response.render()
+
+    assert prefetched_response.content == expected_response.content
+    assert prefetch_cache.get_stats()['hits'] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_prefetch_stores_only_safe_headers(mocker, n_models, prefetch_cache):
+    n_models(15)
+    submit_spy = mocker.spy(get_prefetch_executor(), 'submit')
+    view = PrefetchCursorViewSet.as_view({'get': 'list'})
+
+    first_response = view(APIRequestFactory().get('/endpoint', {'per_page': 5}))
+    first_response.render()
+    submit_spy.spy_return.result()
+    (entry,) = prefetch_cache.entries.values()
+
+    assert dict(entry.headers) == {'Content-Type': 'application/json'}
+
+
+@pytest.mark.django_db()
+def test_build_prefetch_request(rf):
+    user = User.objects.create(username='user')
+    django_request = rf.get('/endpoint', {'per_page': 5})
+    request = Request(django_request)
+    request.user = user
+
+    prefetch_request = build_prefetch_request(request, 'http://testserver/endpoint?per_page=5&after=x')
+
+    assert prefetch_request is not django_request
+    assert prefetch_request.GET.dict() == {'per_page': '5', 'after': 'x'}
+    assert 'wsgi.input' not in prefetch_request.META
+    assert prefetch_request.user == user
+    assert prefetch_request.user is not user
+    assert prefetch_request.is_prefetch is True
+
+
+@pytest.mark.django_db(transaction=True)
+def test_prefetch_skipped_without_pending_slots(mocker, n_models, prefetch_cache):
+    n_models(15)
+    mocker.patch(
+        'restdoctor.rest_framework.prefetch.get_prefetch_pending_slots',
+        return_value=threading.BoundedSemaphore(1),
+    ).return_value.acquire()
+    submit_spy = mocker.spy(get_prefetch_executor(), 'submit')
+    view = PrefetchCursorViewSet.as_view({'get': 'list'})
+
+    view(APIRequestFactory().get('/endpoint', {'per_page': 5})).render()
+
+    assert not submit_spy.called
+    assert get_prefetch_stats()['skipped'] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_prefetch_does_not_log_view_initial(settings, mocker, n_models, prefetch_cache):
+    settings.API_ENABLE_STRUCTLOG = True
+    settings.API_BIND_STRUCTLOG_CONTEXTVARS = False
+    mocker.patch('restdoctor.rest_framework.views.is_logger_enabled', return_value=True)
+    view_logger = mocker.patch('restdoctor.rest_framework.views.logger')
+    n_models(15)
+    submit_spy = mocker.spy(get_prefetch_executor(), 'submit')
+    view = PrefetchCursorViewSet.as_view({'get': 'list'})
+
+    view(APIRequestFactory().get('/endpoint', {'per_page': 5})).render()
+    submit_spy.spy_return.result()
+
+    assert [call.args[0] for call in view_logger.info.call_args_list] == ['view_initial']
+    assert prefetch_cache.get_stats()['stored'] == 1
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from restdoctor.utils.profiling import (
+    CProfileProfiler,
+    check_profile_signature,
+    get_profile_signature,
+)
+
+
+def busy_loop(duration):
+    finish_at = time.perf_counter() + duration
+    while time.perf_counter() < finish_at:
+        pass
+
+
+def test_cprofile_profiler(tmp_path):
+    profiler = CProfileProfiler(interval=0.001)
+
+    profiler.start()
+    busy_loop(0.01)
+    profiler.stop()
+    path = profiler.write(str(tmp_path / 'profile'))
+
+    assert path.endswith('.collapsed')
+    lines = (tmp_path / 'profile.collapsed').read_text().splitlines()
+    assert lines
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+    assert any(line.startswith('busy_loop (') and ';<built-in method time.perf_counter>' in line for line in lines)
+
+
+@pytest.mark.parametrize(
+    ('signature', 'expected_result'),
+    [(None, False), ('profile', False), ('profile:wrong:signature', False)],
+)
+def test_check_profile_signature_invalid(signature, expected_result):
+    assert check_profile_signature(signature, 'GET', '/api/', max_age=60) is expected_result
+
+
+@pytest.mark.parametrize(
+    ('method', 'path', 'expected_result'),
+    [('GET', '/api/', True), ('get', '/api/', True), ('POST', '/api/', False), ('GET', '/api/other/', False)],
+)
+def test_check_profile_signature_request(method, path, expected_result):
+    signature = get_profile_signature('GET', '/api/')
+
+    assert check_profile_signature(signature, method, path, max_age=60) is expected_result
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize(('signed', 'expected_files_count'), [(True, 1), (False, 0)])
+def test_profiling_middleware(settings, client, api_prefix, tmp_path, signed, expected_files_count):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    settings.API_PROFILE_DIR = str(tmp_path)
+    settings.MIDDLEWARE = [
+        *settings.MIDDLEWARE, 'restdoctor.django.middleware.profiling.ProfilingMiddleware',
+    ]
+    path = f'/{api_prefix}mymodel/'
+    headers = {'HTTP_X_PROFILE': get_profile_signature('GET', path)} if signed else {}
+
+    client.get(path, HTTP_ACCEPT='application/vnd.vendor.v1', **headers)
+
+    profile_files = list(tmp_path.iterdir())
+    assert len(profile_files) == expected_files_count
+    if profile_files:
+        assert '-v1-common-MyModelViewSet-list-' in profile_files[0].name
+        assert profile_files[0].suffix == '.collapsed'
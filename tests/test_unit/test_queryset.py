@@ -1,12 +1,10 @@
 from __future__ import annotations
 
-from unittest.mock import MagicMock
-
 import pytest
-from django.core.exceptions import ObjectDoesNotExist
 from django.http import Http404
 
 from restdoctor.rest_framework.generics import GenericAPIView
+from tests.stubs.models import MyModel
 
 
 @pytest.mark.parametrize(
@@ -44,73 +42,57 @@ def test_get_object_use_get_queryset_for_object_without_lookup_fields(mocker):
     assert check_object_permissions.called is True
 
 
+@pytest.mark.django_db()
 @pytest.mark.parametrize(
     ('lookup_fields', 'expected_db_queries'),
     [
-        ({'test': r'test_input_value'}, 1),
-        (
-            {
-                'test1': r'test_input_value',
-                'test2': r'test_input_value',
-                'test3': r'test_input_value',
-            },
-            3,
-        ),
-        ({'test1': r'invalid_regex', 'test2': r'test_input_value', 'test3': r'invalid_regex'}, 1),
+        ({'pk': r'^\d+$'}, 1),
+        ({'pk': r'^\d+$', 'id': r'^\d+$', 'id__exact': r'^\d+$'}, 1),
+        ({'uuid': r'^\d+$', 'pk': r'invalid_regex'}, 0),
     ],
 )
-def test_get_object_use_get_queryset_for_object_with_lookup_fields_not_found(
-    lookup_fields, expected_db_queries, mocker
+def test_get_object_with_lookup_fields_not_found(
+    lookup_fields, expected_db_queries, mocker, django_assert_num_queries
 ):
-    mocker.patch('restdoctor.rest_framework.generics.GenericAPIView._check_lookup_configuration')
-    queryset = MagicMock()
-    queryset.get.side_effect = ObjectDoesNotExist
-    get_queryset_for_object = mocker.patch(
-        'restdoctor.rest_framework.generics.GenericAPIView._get_queryset_for_object',
-        return_value=queryset,
-    )
     check_object_permissions = mocker.patch(
         'restdoctor.rest_framework.generics.GenericAPIView.check_object_permissions'
     )
-    view = GenericAPIView()
+    view = GenericAPIView(queryset=MyModel.objects.all())
     view.lookup_fields = lookup_fields
     view.lookup_url_kwarg = 'test_url_kwarg'
-    view.kwargs = {view.lookup_url_kwarg: 'test_input_value'}
+    view.kwargs = {view.lookup_url_kwarg: '100500'}
 
-    with pytest.raises(Http404):
+    with django_assert_num_queries(expected_db_queries), pytest.raises(Http404):
         view.get_object()
 
-    assert get_queryset_for_object.called is True
-    assert queryset.get.call_count == expected_db_queries
     assert check_object_permissions.called is False
 
 
+@pytest.mark.django_db()
 @pytest.mark.parametrize(
-    'lookup_fields',
+    ('lookup_fields', 'expected_idx'),
     [
-        {'test': r'test_input_value'},
-        {'test1': r'test_input_value', 'test2': r'test_input_value', 'test3': r'test_input_value'},
-        {'test1': r'invalid_regex', 'test2': r'test_input_value', 'test3': r'invalid_regex'},
+        ({'pk': r'^\d+$'}, 0),
+        ({'uuid': r'^[0-9a-f-]+$', 'pk': r'^\d+$', 'id__gt': r'^\d+$'}, 0),
+        ({'id__gt': r'^\d+$', 'pk': r'^\d+$'}, 1),
     ],
 )
-def test_get_object_use_get_queryset_for_object_with_lookup_fields(lookup_fields, mocker):
-    mocker.patch('restdoctor.rest_framework.generics.GenericAPIView._check_lookup_configuration')
-    queryset = MagicMock()
-    get_queryset_for_object = mocker.patch(
-        'restdoctor.rest_framework.generics.GenericAPIView._get_queryset_for_object',
-        return_value=queryset,
-    )
+def test_get_object_with_lookup_fields(
+    lookup_fields, expected_idx, mocker, n_models, django_assert_num_queries
+):
     check_object_permissions = mocker.patch(
         'restdoctor.rest_framework.generics.GenericAPIView.check_object_permissions'
     )
-    view = GenericAPIView()
+    my_models = n_models(2)
+    view = GenericAPIView(queryset=MyModel.objects.order_by('pk'))
     view.lookup_fields = lookup_fields
     view.lookup_url_kwarg = 'test_url_kwarg'
-    view.kwargs = {view.lookup_url_kwarg: 'test_input_value'}
+    view.kwargs = {view.lookup_url_kwarg: str(my_models[0].pk)}
     view.request = None
 
-    view.get_object()
+    with django_assert_num_queries(1):
+        obj = view.get_object()
+        view.get_object()
 
-    assert get_queryset_for_object.called is True
-    assert queryset.get.call_count == 1
-    assert check_object_permissions.called is True
+    assert obj == my_models[expected_idx]
+    assert check_object_permissions.call_count == 2
@@ -1,17 +1,29 @@
 from __future__ import annotations
 
+import gc
+
 import pytest
 from django.core.exceptions import ImproperlyConfigured
 from django.http import Http404
 from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_404_NOT_FOUND, HTTP_405_METHOD_NOT_ALLOWED
 
 from restdoctor.rest_framework.resources import (
+    ErrorResponseCache,
+    ResourceRegistry,
     ResourceView,
     ResourceViewSet,
     get_queryset_model_map,
+    merge_related_lookups,
+)
+from tests.stubs.models import MyModel
+from tests.stubs.views import (
+    MyModelExtendedViewSet,
+    WithActionsMapResourceView,
+    WithoutActionsMapResourceView,
 )
-from tests.stubs.views import WithActionsMapResourceView, WithoutActionsMapResourceView
 from tests.test_unit.stubs import (
     ComplexResourceViewSet,
     ModelA,
@@ -230,3 +242,252 @@ def test__resource_view__get_resource_actions(view_class):
     result = view_class.get_resource_actions()
 
     assert result == {'common': {'list', 'create'}, 'extended': {'list', 'create'}}
+
+
+def test_resource_viewset_dispatch_table():
+    view_func = ComplexResourceViewSet.as_view(actions={'get': 'retrieve', 'post': 'update'})
+    handlers_map = view_func.initkwargs['resource_handlers_map']
+
+    dispatch_table = ComplexResourceViewSet.get_dispatch_table(
+        view_func.actions, handlers_map
+    )
+
+    assert dispatch_table == {
+        ('read_only', 'get'): handlers_map['read_only'],
+        ('read_only', 'head'): handlers_map['read_only'],
+        ('read_write', 'get'): handlers_map['read_write'],
+        ('read_write', 'head'): handlers_map['read_write'],
+        ('read_write', 'post'): handlers_map['read_write'],
+    }
+
+
+def test_resource_view_dispatch_skips_resource_viewset_init(mocker):
+    mocked_get_discriminant = mocker.patch.object(ComplexResourceViewSet, 'get_discriminant')
+    mocked_get_discriminant.return_value = 'read_write'
+    view_func = ComplexResourceViewSet.as_view(actions={'get': 'retrieve', 'post': 'update'})
+    init_spy = mocker.spy(ComplexResourceViewSet, '__init__')
+
+    response = view_func(RequestFactory().post('/'))
+
+    assert response.status_code == HTTP_200_OK
+    init_spy.assert_not_called()
+
+
+def test_resource_view_dispatch_discriminates_on_request_instance(mocker):
+    discriminators = []
+
+    def get_discriminant(self, request):
+        discriminators.append(self)
+        return 'read_write'
+
+    mocker.patch.object(ComplexResourceViewSet, 'get_discriminant', get_discriminant)
+    view_func = ComplexResourceViewSet.as_view(actions={'get': 'retrieve'})
+
+    view_func(RequestFactory().get('/'))
+    view_func(RequestFactory().get('/'))
+
+    assert len(discriminators) == 2
+    assert discriminators[0] is not discriminators[1]
+    assert all(isinstance(view, ComplexResourceViewSet) for view in discriminators)
+
+
+def test_resource_registry_entry_is_immutable():
+    actions_map = ComplexResourceViewSet.get_resource_actions_map()
+
+    assert actions_map is ComplexResourceViewSet.get_resource_actions_map()
+    assert actions_map['read_only'] == {'list', 'retrieve'}
+    with pytest.raises(TypeError):
+        actions_map['read_only'] = {'update'}
+    with pytest.raises(AttributeError):
+        actions_map['read_write'].add('destroy')
+
+
+def test_resource_registry_preload_builds_entries_once(mocker):
+    # Misconfigured resource classes built by other tests must not be found among subclasses.
+    gc.collect()
+    registry = ResourceRegistry()
+    build_spy = mocker.spy(ComplexResourceViewSet, 'build_registry_entry')
+
+    registry.preload(['tests.stubs.api.v1_urls'])
+    entry = registry.get(ComplexResourceViewSet)
+
+    assert build_spy.call_count == 1
+    assert entry.action_methods == (
+        'create', 'destroy', 'list', 'partial_update', 'retrieve', 'update',
+    )
+    assert registry.get(ComplexResourceViewSet) is entry
+
+
+def test_resource_registry_check_queryset_models_error():
+    class WrongModelsViewSet(ResourceViewSet):
+        resource_views_map = {'a': ModelAViewSet, 'b': ModelBViewSet}
+
+    registry = ResourceRegistry()
+
+    with pytest.raises(ImproperlyConfigured):
+        registry.get(WrongModelsViewSet)
+    assert WrongModelsViewSet not in registry.entries
+
+
+@pytest.mark.parametrize(
+    ('discriminator', 'method', 'expected_status_code'),
+    [('unknown', 'get', HTTP_404_NOT_FOUND), ('read_only', 'post', HTTP_405_METHOD_NOT_ALLOWED)],
+)
+def test_resource_view_error_response_is_cached(mocker, discriminator, method, expected_status_code):
+    mocked_get_discriminant = mocker.patch.object(ComplexResourceViewSet, 'get_discriminant')
+    mocked_get_discriminant.return_value = discriminator
+    view_func = ComplexResourceViewSet.as_view(actions={'get': 'retrieve', 'post': 'update'})
+    exception_response_spy = mocker.spy(ComplexResourceViewSet, 'exception_response')
+
+    first_response = view_func(getattr(RequestFactory(), method)('/'))
+    second_response = view_func(getattr(RequestFactory(), method)('/'))
+
+    assert exception_response_spy.call_count == 1
+    assert second_response.status_code == first_response.status_code == expected_status_code
+    assert second_response.content == first_response.content
+    assert dict(second_response.items()) == dict(first_response.items())
+
+
+def test_resource_view_error_response_cache_key_depends_on_accept(mocker):
+    mocked_get_discriminant = mocker.patch.object(ComplexResourceViewSet, 'get_discriminant')
+    mocked_get_discriminant.return_value = 'unknown'
+    view_func = ComplexResourceViewSet.as_view(actions={'get': 'retrieve'})
+    exception_response_spy = mocker.spy(ComplexResourceViewSet, 'exception_response')
+
+    view_func(RequestFactory().get('/', HTTP_ACCEPT='application/json'))
+    view_func(RequestFactory().get('/', HTTP_ACCEPT='text/html'))
+
+    assert exception_response_spy.call_count == 2
+
+
+def test_resource_view_error_response_cache_key_depends_on_format_suffix(mocker):
+    mocked_get_discriminant = mocker.patch.object(ComplexResourceViewSet, 'get_discriminant')
+    mocked_get_discriminant.return_value = 'unknown'
+    view_func = ComplexResourceViewSet.as_view(actions={'get': 'retrieve'})
+    exception_response_spy = mocker.spy(ComplexResourceViewSet, 'exception_response')
+
+    view_func(RequestFactory().get('/'), format='json')
+    view_func(RequestFactory().get('/'), format='api')
+
+    assert exception_response_spy.call_count == 2
+
+
+def get_not_found_response():
+    response = Response(status=HTTP_404_NOT_FOUND)
+    response.accepted_renderer = JSONRenderer()
+    response.accepted_media_type = 'application/json'
+    response.renderer_context = {}
+    return response
+
+
+def test_error_response_cache_evicts_least_recently_used():
+    cache = ErrorResponseCache(max_size=2)
+
+    for key in [(HTTP_404_NOT_FOUND, 'a'), (HTTP_404_NOT_FOUND, 'b'), (HTTP_404_NOT_FOUND, 'a')]:
+        cache.get_response(key, get_not_found_response)
+    cache.get_response((HTTP_404_NOT_FOUND, 'c'), get_not_found_response)
+
+    assert list(cache.responses) == [(HTTP_404_NOT_FOUND, 'a'), (HTTP_404_NOT_FOUND, 'c')]
+
+
+def test_error_response_cache_replays_only_negotiation_headers():
+    cache = ErrorResponseCache()
+
+    def get_response():
+        response = get_not_found_response()
+        response.data = {'detail': 'Not found.'}
+        response['Vary'] = 'Accept'
+        response['X-Request-Id'] = 'first'
+        return response
+
+    cache.get_response((HTTP_404_NOT_FOUND, 'a'), get_response)
+    response = cache.get_response((HTTP_404_NOT_FOUND, 'a'), get_response)
+
+    assert dict(response.items()) == {'Content-Type': 'application/json', 'Vary': 'Accept'}
+
+
+def test_resource_view_error_response_authenticated(mocker):
+    mocker.patch.object(ComplexResourceViewSet, 'authenticate_error_responses', True)
+    mocked_get_discriminant = mocker.patch.object(ComplexResourceViewSet, 'get_discriminant')
+    mocked_get_discriminant.return_value = 'unknown'
+    view_func = ComplexResourceViewSet.as_view(actions={'get': 'retrieve'})
+    authentication_spy = mocker.spy(ComplexResourceViewSet, 'perform_authentication')
+
+    view_func(RequestFactory().get('/'))
+    response = view_func(RequestFactory().get('/'))
+
+    assert response.status_code == HTTP_404_NOT_FOUND
+    assert authentication_spy.call_count == 2
+
+
+@pytest.mark.django_db()
+def test_resource_viewset_multi_resource_list(settings, client, api_prefix, n_models, django_assert_num_queries):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    n_models(3)
+
+    with django_assert_num_queries(2):
+        response = client.get(
+            f'/{api_prefix}mymodel/', {'view_type': 'common,extended'},
+            HTTP_ACCEPT='application/vnd.vendor.v1',
+        )
+
+    data = response.json()['data']
+    assert response.status_code == HTTP_200_OK
+    assert response.json()['meta']['total'] == 3
+    assert [set(item) for item in data['common']] == [{'uuid'}] * 3
+    assert [set(item) for item in data['extended']] == [{'uuid', 'id'}] * 3
+
+
+@pytest.mark.django_db()
+def test_resource_viewset_multi_resource_retrieve(settings, client, api_prefix, n_models):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    my_model = n_models(1)[0]
+
+    response = client.get(
+        f'/{api_prefix}mymodel/{my_model.pk}/', {'view_type': 'extended,common'},
+        HTTP_ACCEPT='application/vnd.vendor.v1',
+    )
+
+    assert response.status_code == HTTP_200_OK
+    assert response.json()['data'] == {
+        'extended': {'uuid': str(my_model.uuid), 'id': my_model.pk},
+        'common': {'uuid': str(my_model.uuid)},
+    }
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize('view_type', ['common,unknown', 'common,'])
+def test_resource_viewset_multi_resource_unknown(settings, client, api_prefix, view_type):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+
+    response = client.get(
+        f'/{api_prefix}mymodel/', {'view_type': view_type}, HTTP_ACCEPT='application/vnd.vendor.v1',
+    )
+
+    assert response.status_code == HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db()
+def test_resource_viewset_multi_resource_different_filters(settings, client, api_prefix, n_models, mocker):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    my_models = n_models(3)
+    mocker.patch.object(
+        MyModelExtendedViewSet, 'get_queryset', lambda view: MyModel.objects.filter(pk=my_models[0].pk),
+    )
+
+    response = client.get(
+        f'/{api_prefix}mymodel/', {'view_type': 'common,extended'},
+        HTTP_ACCEPT='application/vnd.vendor.v1',
+    )
+
+    assert response.status_code == HTTP_404_NOT_FOUND
+
+
+def test_merge_related_lookups():
+    queryset = merge_related_lookups(
+        MyModel.objects.prefetch_related('a'),
+        [MyModel.objects.prefetch_related('a', 'b').select_related('c__d', 'e')],
+    )
+
+    assert queryset._prefetch_related_lookups == ('a', 'b')
+    assert queryset.query.select_related == {'c': {'d': {}}, 'e': {}}
@@ -7,6 +7,7 @@ from rest_framework.decorators import action as drf_action
 from rest_framework.fields import CharField, UUIDField
 from rest_framework.serializers import Serializer
 
+from restdoctor.rest_framework.caching import CacheControl
 from restdoctor.rest_framework.resources import ResourceViewSet
 from restdoctor.rest_framework.views import SerializerClassMapApiView
 from restdoctor.rest_framework.viewsets import ListModelViewSet, ModelViewSet, ReadOnlyModelViewSet
@@ -64,6 +65,14 @@ class DefaultViewSet(ModelViewSet):
     serializer_class = DefaultSerializer
 
 
+class CacheControlViewSet(ModelViewSet):
+    serializer_class = DefaultSerializer
+    cache_control_map = {
+        'default': CacheControl(no_cache=True),
+        'list': CacheControl(public=True, max_age=60, stale_while_revalidate=30, vary=['Accept-Language']),
+    }
+
+
 class AnotherViewSet(ModelViewSet):
     serializer_class = AnotherSerializer
 
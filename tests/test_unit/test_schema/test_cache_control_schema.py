@@ -0,0 +1,21 @@
+from tests.test_unit.test_schema.stubs import CacheControlViewSet
+
+
+def test_cache_control_response_headers(get_create_view_func):
+    create_view = get_create_view_func('test', CacheControlViewSet, 'test')
+
+    view = create_view('/test/', 'GET')
+    operation = view.schema.get_operation('/test/', 'GET')
+
+    headers = operation['responses']['200']['headers']
+    assert headers['Cache-Control']['example'] == 'max-age=60, stale-while-revalidate=30, public'
+    assert set(headers) == {'Cache-Control', 'Expires', 'Vary'}
+
+
+def test_cache_control_not_published_for_unsafe_methods(get_create_view_func):
+    create_view = get_create_view_func('test', CacheControlViewSet, 'test')
+
+    view = create_view('/test/', 'POST')
+    operation = view.schema.get_operation('/test/', 'POST')
+
+    assert 'headers' not in operation['responses']['201']
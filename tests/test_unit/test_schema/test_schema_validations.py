@@ -7,7 +7,11 @@ from rest_framework.routers import SimpleRouter
 
 from restdoctor.rest_framework.schema import RestDoctorSchema
 from restdoctor.rest_framework.schema.generators import RefsSchemaGenerator30
-from tests.stubs.serializers import MyModelWithoutHelpTextsSerializer, WithMethodFieldSerializer
+from tests.stubs.serializers import (
+    MyModelWithBatchFieldSerializer,
+    MyModelWithoutHelpTextsSerializer,
+    WithMethodFieldSerializer,
+)
 from tests.test_unit.test_schema.conftest import UrlConf
 from tests.test_unit.test_schema.stubs import DefaultViewSet, DefaultViewSetWithOperationId
 
@@ -124,3 +128,13 @@ def test_duplicate_operation_ids_success_case(make_urlconf):
 
     schema = generator.get_schema()
     pass
+
+
+def test_check_batch_method_field_annotations_success_case(settings):
+    settings.API_STRICT_SCHEMA_VALIDATION = True
+    schema = RestDoctorSchema()
+    serializer = MyModelWithBatchFieldSerializer()
+
+    result = schema.map_field(serializer.fields['position'])
+
+    assert result == {'type': 'integer'}
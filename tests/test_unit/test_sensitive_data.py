@@ -1,11 +1,14 @@
 import pytest
 
+from restdoctor.rest_framework import sensitive_data
 
 from django.core.files.uploadedfile import TemporaryUploadedFile, InMemoryUploadedFile
+from django.http import QueryDict
 from restdoctor.django.sensitive_data import get_model_sensitive_fields, is_model_field_sensitive
 from restdoctor.rest_framework.sensitive_data import (
     get_serializer_sensitive_fields, get_serializer_instance, get_serializer_sensitive_data_config,
-    get_field_serializer, clear_sensitive_data, smart_copy,
+    get_field_serializer, clear_sensitive_data, clear_sensitive_field, get_sensitive_data_plan,
+    sensitive_data_plans, mask_sensitive_data, smart_copy,
 )
 from tests.test_unit.stubs import (
     ParentSensitiveDataModel, ModelWithoutSensitiveData,
@@ -120,6 +123,135 @@ def test_clear_sensitive_data(data, expected_data):
     assert result == expected_data
 
 
+def test_get_sensitive_data_plan():
+    result = get_sensitive_data_plan(ModelSerializerWithSensitiveData)
+
+    assert result == (
+        ('first_name', True),
+        ('last_name', True),
+        ('title', True),
+        ('field1', (('field1', True), ('field2', True))),
+        ('field2', (('field1', True), ('field2', True))),
+        ('field3', (('field1', True), ('field2', True))),
+    )
+
+
+def test_sensitive_data_plan_compiled_once_per_class(mocker):
+    sensitive_data_plans.clear()
+    spy = mocker.spy(sensitive_data, 'get_serializer_sensitive_data_config')
+
+    clear_sensitive_data({'first_name': 'Иван'}, ModelSerializerWithSensitiveData)
+    compile_call_count = spy.call_count
+    result = clear_sensitive_data({'first_name': 'Петр'}, ModelSerializerWithSensitiveData)
+
+    assert result == {'first_name': '[Cleaned]'}
+    assert compile_call_count > 0
+    assert spy.call_count == compile_call_count
+
+
+def test_sensitive_data_plan_redefined_class():
+    class RedefinedSerializer(SerializerWithSensitiveData):
+        pass
+
+    first_plan = get_sensitive_data_plan(RedefinedSerializer)
+
+    class RedefinedSerializer(SerializerWithSensitiveData):  # noqa: F811
+        class SensitiveData:
+            include = ['field1']
+
+    assert first_plan == (('field1', True), ('field2', True))
+    assert get_sensitive_data_plan(RedefinedSerializer) == (('field1', True),)
+
+
+def test_clear_sensitive_data_copy_on_write():
+    data = {
+        'first_name': 'Иван',
+        'field1': {'field1': 'Иван', 'id': 1},
+        'field_fk': {'title': 'Иван'},
+        'items': [{'id': 1}],
+    }
+
+    result = clear_sensitive_data(data, ModelSerializerWithSensitiveData)
+
+    assert result == {
+        'first_name': '[Cleaned]',
+        'field1': {'field1': '[Cleaned]', 'id': 1},
+        'field_fk': {'title': 'Иван'},
+        'items': [{'id': 1}],
+    }
+    assert data['first_name'] == 'Иван'
+    assert data['field1']['field1'] == 'Иван'
+    assert result['field_fk'] is data['field_fk']
+    assert result['items'] is data['items']
+
+
+def test_clear_sensitive_data_without_sensitive_fields_returns_same_data():
+    data = {'field1': [{'id': 1}]}
+
+    assert clear_sensitive_data(data, SerializerWithoutSensitiveData) is data
+
+
+@pytest.mark.parametrize(
+    'data, expected_data',
+    (
+        ([1, 2, 3], [1, 2, '[Truncated 1 items]']),
+        ({'a': 1, 'b': 2, 'c': 3}, {'a': 1, 'b': 2, '[Truncated]': 1}),
+        ({'a': [1, 2, 3]}, {'a': [1, 2, '[Truncated 1 items]']}),
+        ('a' * 10, 'aaaa[Truncated]'),
+        (b'a' * 10, b'aaaa[Truncated]'),
+        ('жжж', 'жж[Truncated]'),
+        ({'a': 'abc'}, {'a': 'abc'}),
+    ),
+)
+def test_mask_sensitive_data_limits(data, expected_data):
+    result = mask_sensitive_data(data, max_items=2, max_bytes=4)
+
+    assert result == expected_data
+
+
+def test_mask_sensitive_data_deep_data():
+    data = {'first_name': 'Иван'}
+    for _ in range(5000):
+        data = [data]
+
+    result = mask_sensitive_data(data, (('first_name', True),))
+
+    for _ in range(5000):
+        result = result[0]
+    assert result == {'first_name': '[Cleaned]'}
+
+
+def test_mask_sensitive_data_query_dict():
+    data = QueryDict('first_name=Иван&id=1')
+
+    result = mask_sensitive_data(data)
+
+    assert result == {'first_name': 'Иван', 'id': '1'}
+    assert type(result) is dict
+
+
+@pytest.mark.parametrize(
+    'data, expected_data',
+    (
+        ({'a': 'abc', 'b': 'abcdef'}, {'a': 'abc', 'b': 'abc[Truncated]'}),
+        ({'a': 'abcdefg', 'b': 'abc'}, {'a': 'abcdefg', '[Truncated]': 1}),
+        (['abc', ['abc', 'abc'], 'abc'], ['abc', ['abc', 'ab[Truncated]'], '[Truncated 1 items]']),
+    ),
+)
+def test_mask_sensitive_data_total_bytes(data, expected_data):
+    result = mask_sensitive_data(data, max_bytes=8)
+
+    assert result == expected_data
+
+
+def test_clear_sensitive_field():
+    data = [{'field1': {'field1': 'Иван', 'id': 1}}]
+
+    clear_sensitive_field('field1', {'field1': True}, data)
+
+    assert data == [{'field1': {'field1': '[Cleaned]', 'id': 1}}]
+
+
 @pytest.mark.parametrize(
     'data, deepcopy_used',
     (
@@ -136,8 +268,10 @@ def test_clear_sensitive_data(data, expected_data):
         ({'field': {'first_name': 'Иван', 'id': 1}}, True),
     ),
 )
-def test_clear_sensitive_data(data, deepcopy_used, mocker):
+def test_smart_copy_deprecated(data, deepcopy_used, mocker):
     mock = mocker.patch('copy.deepcopy')
-    smart_copy(data, [TemporaryUploadedFile])
+
+    with pytest.deprecated_call():
+        smart_copy(data, [TemporaryUploadedFile])
 
     assert mock.called is deepcopy_used
@@ -1,5 +1,12 @@
 import pytest
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
 
+from restdoctor.rest_framework.caching import CacheControl
+from restdoctor.rest_framework.views import ListAPIView
+from restdoctor.utils.media_type import parse_accept
+from restdoctor.utils.rate_limit import RateLimiter
 from restdoctor.rest_framework.serializers import EmptySerializer
 from tests.test_unit.stubs import (
     ListViewSetWithRequestSerializer, SerializerB, ListViewSetWithoutRequestSerializer,
@@ -55,3 +62,108 @@ def test_get_request_serializer(viewset, use_default, expected):
     request_serializer = list_view.get_request_serializer(use_default=use_default)
 
     assert isinstance(request_serializer, expected)
+
+
+@pytest.mark.parametrize(
+    ('cache_control_map', 'api_format', 'expected_cache_control'),
+    [
+        ({}, 'full', None),
+        ({'default': CacheControl(max_age=10)}, 'full', 'max-age=10'),
+        (
+            {'default': CacheControl(max_age=10), 'default.compact': CacheControl(no_store=True)},
+            'compact',
+            'no-store',
+        ),
+        (
+            {'default': CacheControl(max_age=10), 'list': CacheControl(public=True, max_age=5)},
+            'full',
+            'max-age=5, public',
+        ),
+    ],
+)
+def test_cache_control_map_response_headers(
+    settings, cache_control_map, api_format, expected_cache_control
+):
+    settings.API_FORMATS = ('full', 'compact')
+
+    class CacheControlView(ListAPIView):
+        pass
+
+    CacheControlView.cache_control_map = cache_control_map
+    view = CacheControlView()
+    view.action = 'list'
+    view.headers = {}
+    request = APIRequestFactory().get('/')
+    request.api_params = parse_accept(f'application/vnd.vendor.v1.{api_format}', vendor='vendor')
+    view.request = Request(request)
+    response = view.finalize_response(view.request, Response({}))
+
+    assert response.get('Cache-Control') == expected_cache_control
+
+
+@pytest.fixture()
+def view_initial_logger(settings, mocker):
+    settings.API_ENABLE_STRUCTLOG = True
+    settings.API_BIND_STRUCTLOG_CONTEXTVARS = False
+    return mocker.patch('restdoctor.rest_framework.views.logger')
+
+
+def make_list_view(viewset, log_sample_rate_map=None):
+    view = viewset(format_kwarg=None, headers={})
+    view.log_sample_rate_map = log_sample_rate_map or {}
+    view.request = view.initialize_request(APIRequestFactory().post('/', {'a': 1}, format='json'))
+    view.action = 'list'
+    return view
+
+
+@pytest.mark.parametrize(
+    ('log_sample_rate_map', 'logger_enabled', 'expected_logged'),
+    [
+        ({}, True, True),
+        ({}, False, False),
+        ({'default': 0}, True, False),
+        ({'default': 0, 'list': 1}, True, True),
+        ({'list': 0}, True, False),
+    ],
+)
+def test_view_initial_logging(
+    view_initial_logger, mocker, log_sample_rate_map, logger_enabled, expected_logged,
+):
+    mocker.patch('restdoctor.rest_framework.views.is_logger_enabled', return_value=logger_enabled)
+    view = make_list_view(ListViewSetWithRequestSerializer, log_sample_rate_map)
+    clear_request_data = mocker.spy(view, 'clear_request_data')
+
+    view.log_view_initial(view.request)
+
+    assert view_initial_logger.info.called is expected_logged
+    assert clear_request_data.called is expected_logged
+
+
+def test_view_initial_logging_rate_limit(view_initial_logger, settings):
+    settings.API_VIEW_INITIAL_LOG_RATE_LIMIT = 0.001
+    view = make_list_view(ListViewSetWithoutRequestSerializer)
+
+    view.log_view_initial(view.request)
+    view.log_view_initial(view.request)
+
+    assert view_initial_logger.info.call_count == 1
+
+
+def test_view_initial_signal_skipped_without_receivers(view_initial_logger, mocker):
+    send = mocker.patch('restdoctor.rest_framework.views.bind_extra_request_view_initial_metadata.send')
+    view = make_list_view(ListViewSetWithRequestSerializer)
+
+    view.log_view_initial(view.request)
+
+    assert not send.called
+
+
+def test_rate_limiter(mocker):
+    monotonic = mocker.patch('restdoctor.utils.rate_limit.time.monotonic', return_value=100.0)
+    rate_limiter = RateLimiter(rate=1)
+
+    assert rate_limiter.acquire('key') is True
+    assert rate_limiter.acquire('key') is False
+    assert rate_limiter.acquire('another_key') is True
+    monotonic.return_value = 101.0
+    assert rate_limiter.acquire('key') is True
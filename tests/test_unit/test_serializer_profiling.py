@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from rest_framework.fields import CharField, SerializerMethodField
+
+from restdoctor.rest_framework.profiling import profile_serializers
+from restdoctor.rest_framework.serializers import Serializer
+from tests.stubs.models import MyModel
+
+
+class ChildSerializer(Serializer):
+    name = CharField()
+
+
+class ParentSerializer(Serializer):
+    name = CharField()
+    children = ChildSerializer(many=True)
+    models_count = SerializerMethodField()
+
+    def get_models_count(self, instance):
+        return MyModel.objects.count()
+
+
+@pytest.mark.django_db()
+def test_profile_serializers_aggregates_fields():
+    instances = [
+        SimpleNamespace(name='first', children=[SimpleNamespace(name='a'), SimpleNamespace(name='b')]),
+        SimpleNamespace(name='second', children=[SimpleNamespace(name='c')]),
+    ]
+
+    with profile_serializers() as profile:
+        data = ParentSerializer(instances, many=True).data
+
+    fields = {field['field']: field for field in profile.get_fields()}
+    assert data == ParentSerializer(instances, many=True).data
+    assert profile.instances == 2
+    assert profile.queries == 2
+    assert {path: field['calls'] for path, field in fields.items()} == {
+        'name': 2, 'children': 2, 'children.name': 3, 'models_count': 2,
+    }
+    assert fields['models_count']['queries'] == 2
+    assert fields['children']['queries'] == 0
+
+
+@pytest.mark.django_db()
+def test_serializer_profile_view(settings, client, api_prefix, n_models, mocker):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    settings.API_SERIALIZER_PROFILE_SAMPLE_RATE = 1.0
+    logger = mocker.patch('restdoctor.rest_framework.views.logger')
+    n_models(3)
+
+    response = client.get(f'/{api_prefix}mymodel/', HTTP_ACCEPT='application/vnd.vendor.v1')
+
+    assert response.serializer_profile.instances == 3
+    (event,), fields = logger.info.call_args
+    assert event == 'serializer_profile'
+    assert fields['api_view_action'] == 'list'
+    assert [field['field'] for field in fields['fields']] == ['uuid']
+
+
+@pytest.mark.django_db()
+def test_serializer_profile_is_sampled(settings, client, api_prefix):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+
+    response = client.get(f'/{api_prefix}mymodel/', HTTP_ACCEPT='application/vnd.vendor.v1')
+
+    assert not hasattr(response, 'serializer_profile')
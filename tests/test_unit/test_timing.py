@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pytest
+
+from restdoctor.utils.timing import start_request_timing, stage_timer, stop_request_timing, timed
+
+
+def get_server_timing_stages(response):
+    return {metric.split(';')[0] for metric in response['Server-Timing'].split(', ')}
+
+
+@pytest.mark.django_db()
+def test_server_timing_header(settings, client, api_prefix, n_models):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    settings.API_SERVER_TIMING = True
+    n_models(2)
+
+    response = client.get(f'/{api_prefix}mymodel/', HTTP_ACCEPT='application/vnd.vendor.v1')
+
+    assert get_server_timing_stages(response) >= {
+        'accept',
+        'negotiation',
+        'authentication',
+        'permissions',
+        'collection',
+        'pagination_count',
+        'pagination_page',
+        'serialization',
+        'render',
+        'total',
+    }
+
+
+@pytest.mark.parametrize(
+    ('server_timing_header', 'expected_header'), [(None, False), ('wrong', False), ('secret', True)],
+)
+def test_server_timing_token(settings, client, api_prefix, server_timing_header, expected_header):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    settings.API_SERVER_TIMING_TOKEN = 'secret'
+    headers = {'HTTP_X_SERVER_TIMING': server_timing_header} if server_timing_header else {}
+
+    response = client.get(
+        f'/{api_prefix}empty_v1', HTTP_ACCEPT='application/vnd.vendor.v1', **headers,
+    )
+
+    assert response.has_header('Server-Timing') is expected_header
+
+
+def test_view_finalize_event(settings, client, api_prefix, mocker):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    settings.API_SERVER_TIMING = True
+    settings.API_ENABLE_STRUCTLOG = True
+    settings.API_BIND_STRUCTLOG_CONTEXTVARS = False
+    mocker.patch('restdoctor.rest_framework.views.logger')
+    logger = mocker.patch('restdoctor.django.middleware.api_selector.logger')
+
+    response = client.get(f'/{api_prefix}empty_v1', HTTP_ACCEPT='application/vnd.vendor.v1')
+
+    (event,), fields = logger.info.call_args
+    assert event == 'view_finalize'
+    assert fields['status_code'] == response.status_code
+    assert 'timing_total_ms' in fields
+    assert 'timing_accept_ms' in fields
+
+
+def test_timing_disabled_without_request_timing():
+    func = lambda: None  # noqa: E731
+
+    assert timed('stage', func) is func
+    assert stage_timer('stage') is stage_timer('another_stage')
+
+
+def test_request_timing_accumulates_stages():
+    timings, token = start_request_timing()
+    try:
+        with stage_timer('permissions'):
+            pass
+        timed('permissions', lambda: None)()
+    finally:
+        stop_request_timing(token)
+
+    assert set(timings.get_durations_ms()) == {'permissions', 'total'}
+    assert stage_timer('permissions') is stage_timer('query')
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.test import APIRequestFactory
+
+from restdoctor.rest_framework.schema.generators import RefsSchemaGenerator
+from restdoctor.utils import tracing
+from restdoctor.utils.tracing import (
+    InMemoryTracer,
+    OpenTelemetryTracer,
+    SentryTracer,
+    get_trace_attributes,
+    get_tracer,
+    noop_span,
+    trace_span,
+)
+from tests.stubs.views import MyModelViewSet
+
+
+@pytest.fixture()
+def in_memory_tracer(settings, mocker):
+    mocker.patch.object(tracing, '_tracers', {})
+    settings.API_TRACER = 'restdoctor.utils.tracing.InMemoryTracer'
+    return get_tracer()
+
+
+def get_span(tracer, name):
+    spans = tracer.get_spans(name)
+    assert spans, f'{name} span expected'
+    return spans[-1]
+
+
+@pytest.mark.django_db()
+def test_request_spans(in_memory_tracer, settings, client, api_prefix, n_models):
+    settings.API_VERSIONS = {'v1': 'tests.stubs.api.v1_urls'}
+    n_models(2)
+
+    client.get(f'/{api_prefix}mymodel/', HTTP_ACCEPT='application/vnd.vendor.v1')
+
+    dispatch_span = get_span(in_memory_tracer, 'restdoctor.resource_dispatch')
+    serialization_span = get_span(in_memory_tracer, 'restdoctor.serialization')
+    assert get_span(in_memory_tracer, 'restdoctor.accept')
+    assert get_span(in_memory_tracer, 'restdoctor.pagination_count')
+    assert get_span(in_memory_tracer, 'restdoctor.pagination_page')
+    assert get_span(in_memory_tracer, 'restdoctor.render')
+    serializer_span = get_span(in_memory_tracer, 'restdoctor.serializer_resolution')
+    assert serializer_span.attributes['api.serializer']
+    assert dispatch_span.attributes == {
+        'api.version': 'v1', 'api.format': 'full', 'api.resource': 'common',
+    }
+    assert serialization_span.attributes['api.items'] == 2
+    assert serialization_span.attributes['api.action'] == 'list'
+    assert serialization_span.attributes['api.version'] == 'v1'
+    parent = serialization_span.parent
+    while parent is not None and parent is not dispatch_span:
+        parent = parent.parent
+    assert parent is dispatch_span
+
+
+@pytest.mark.django_db()
+def test_view_trace_attributes_reset(in_memory_tracer):
+    view = MyModelViewSet.as_view({'get': 'list'})
+
+    view(APIRequestFactory().get('/'))
+
+    assert get_span(in_memory_tracer, 'restdoctor.serialization').attributes['api.view'] == 'MyModelViewSet'
+    assert get_trace_attributes() == {}
+
+
+def test_schema_generation_span(in_memory_tracer):
+    generator = RefsSchemaGenerator(
+        urlconf='tests.stubs.api.v1_schema_urls', accept='application/vnd.vendor.v1-common'
+    )
+
+    generator.get_schema()
+
+    span = get_span(in_memory_tracer, 'restdoctor.schema_generation')
+    assert span.attributes['openapi.version'] == '3.0.2'
+    assert span.attributes['api.paths'] > 0
+
+
+def test_in_memory_tracer_records_errors():
+    tracer = InMemoryTracer()
+
+    with pytest.raises(ValueError):
+        with tracer.start_span('outer', {}):
+            with tracer.start_span('inner', {'key': 'value'}):
+                raise ValueError
+
+    inner, outer = tracer.get_spans()
+    assert inner.parent is outer
+    assert isinstance(inner.error, ValueError)
+    assert inner.duration is not None
+
+
+def test_trace_span_without_tracer():
+    assert trace_span('restdoctor.render', key='value') is noop_span
+
+
+def test_open_telemetry_tracer(mocker):
+    otel_tracer = mocker.Mock()
+    tracer = OpenTelemetryTracer(tracer=otel_tracer)
+
+    tracer.start_span('restdoctor.render', {'api.version': 'v1'})
+
+    otel_tracer.start_as_current_span.assert_called_once_with(
+        'restdoctor.render', attributes={'api.version': 'v1'}
+    )
+
+
+def test_sentry_tracer(mocker):
+    sentry_sdk = mocker.patch.object(tracing, 'sentry_sdk')
+    sentry_span = sentry_sdk.start_span.return_value.__enter__.return_value
+
+    with SentryTracer().start_span('restdoctor.render', {'api.version': 'v1'}) as span:
+        span.set_attribute('api.items', 2)
+
+    sentry_sdk.start_span.assert_called_once_with(
+        op='restdoctor.render', description='restdoctor.render'
+    )
+    sentry_span.set_data.assert_has_calls(
+        [mocker.call('api.version', 'v1'), mocker.call('api.items', 2)]
+    )
+
+
+@pytest.mark.parametrize(('tracer_class', 'module_name'), [
+    (SentryTracer, 'sentry_sdk'), (OpenTelemetryTracer, 'otel_trace'),
+])
+def test_tracer_without_dependency(mocker, tracer_class, module_name):
+    mocker.patch.object(tracing, module_name, None)
+
+    with pytest.raises(ImproperlyConfigured):
+        tracer_class()